@@ -3,27 +3,51 @@
 Enhanced composite action generation for GitHub Actions with proper secrets handling
 """
 
-import re
-import yaml
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+from utils import sanitize_name, generate_limitations_comment, compact_snippet, LazyAnalysis
+from pipeline_ir import Stage
+from groovy_lexer import SourceView, Source
+from instrumentation import span, traced
+from action_store import ActionStore, action_ref
+from output_writer import OutputWriter, dump_yaml
+
+if TYPE_CHECKING:
+    from conversion_cache import StageCache
+from patterns import (
+    PARAMS_REF, PARAMS_REF_ANY, ENV_REF, CREDENTIALS_HELPER, LINE_CONTINUATION, WHITESPACE_RUN
+)
+
+
+# Composite action inputs named differently from the Jenkins parameter they
+# carry: ${params.APP_NAME} in a stage reads ${{ inputs.app-name }} in its action
+ACTION_INPUT_RENAMES: Dict[str, str] = {
+    "APP_NAME": "app-name",
+    "DEPLOY_ENV": "deploy-env",
+    "KCONFIG": "kubeconfig",
+}
 
-from utils import sanitize_name, generate_limitations_comment
 
+def convert_jenkins_variables_to_gha(text: str, input_renames: Optional[Dict[str, str]] = None) -> str:
+    """Convert Jenkins variable syntax to GitHub Actions syntax
 
-def convert_jenkins_variables_to_gha(text: str) -> str:
-    """Convert Jenkins variable syntax to GitHub Actions syntax"""
+    input_renames maps parameter names to the input names they are read from
+    (ACTION_INPUT_RENAMES inside composite actions).
+    """
     if not text:
         return text
     
     # Convert Jenkins parameter references: ${params.PARAM_NAME} -> ${{ inputs.PARAM_NAME }}
-    text = re.sub(r'\$\{params\.([A-Za-z_][A-Za-z0-9_]*)\}', r'${{ inputs.\1 }}', text)
+    renames = input_renames or {}
+    text = PARAMS_REF.sub(lambda m: f"${{{{ inputs.{renames.get(m.group(1), m.group(1))} }}}}", text)
     
     # Convert Jenkins environment references: ${env.VAR_NAME} -> ${{ env.VAR_NAME }}
-    text = re.sub(r'\$\{env\.([A-Za-z_][A-Za-z0-9_]*)\}', r'${{ env.\1 }}', text)
+    text = ENV_REF.sub(r'${{ env.\1 }}', text)
     
     # Convert Jenkins credentials() functions to GitHub secrets
-    text = re.sub(r"credentials\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", r'${{ secrets.\1 }}', text)
+    text = CREDENTIALS_HELPER.sub(r'${{ secrets.\1 }}', text)
     
     # Convert common Jenkins variables to GitHub Actions equivalents
     jenkins_to_gha_vars = {
@@ -49,10 +73,10 @@ def convert_jenkins_variables_to_gha(text: str) -> str:
     return text
 
 
-def extract_jenkins_parameters_from_text(text: str) -> set:
+def extract_jenkins_parameters_from_text(text: Source) -> set:
     """Extract all Jenkins parameter names from text"""
     params = set()
-    matches = re.findall(r'\$\{params\.([A-Za-z_][A-Za-z0-9_]*)\}', text)
+    matches = SourceView.of(text).findall(PARAMS_REF)
     params.update(matches)
     return params
 
@@ -60,7 +84,7 @@ def extract_jenkins_parameters_from_text(text: str) -> set:
 def extract_jenkins_env_vars_from_text(text: str) -> set:
     """Extract all Jenkins environment variable names from text"""
     env_vars = set()
-    matches = re.findall(r'\$\{env\.([A-Za-z_][A-Za-z0-9_]*)\}', text)
+    matches = ENV_REF.findall(text)
     env_vars.update(matches)
     return env_vars
 
@@ -73,6 +97,112 @@ from jenkins_extractors import (
 )
 
 
+# Extractor call counters across all StageAnalysis instances
+EXTRACTION_STATS = {"computed": 0, "reused": 0}
+
+
+def get_extraction_stats() -> Dict[str, int]:
+    """Return how many extractor calls were computed and how many were saved"""
+    return dict(EXTRACTION_STATS)
+
+
+def reset_extraction_stats():
+    EXTRACTION_STATS["computed"] = 0
+    EXTRACTION_STATS["reused"] = 0
+
+
+# Extractor results by stage body, shared by every conversion in this process
+# once enabled (main.py --watch), so re-converting an edited Jenkinsfile only
+# re-extracts the stages that changed. Least recently used bodies go first.
+STAGE_ANALYSIS_CACHE_SIZE = 4096
+_stage_analysis_cache: Optional["OrderedDict[str, Dict[str, Any]]"] = None
+
+
+def enable_stage_analysis_cache(size: int = STAGE_ANALYSIS_CACHE_SIZE):
+    """Reuse extractor results across conversions for up to size stage bodies"""
+    global _stage_analysis_cache, STAGE_ANALYSIS_CACHE_SIZE
+    STAGE_ANALYSIS_CACHE_SIZE = size
+    _stage_analysis_cache = OrderedDict()
+
+
+def _shared_results(body: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """The cached result dict for body (merged with results), or results itself"""
+    cache = _stage_analysis_cache
+    if cache is None:
+        return results
+    shared = cache.get(body)
+    if shared is None:
+        cache[body] = results
+        if len(cache) > STAGE_ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return results
+    cache.move_to_end(body)
+    for name, value in results.items():
+        shared.setdefault(name, value)
+    return shared
+
+
+class StageAnalysis(LazyAnalysis):
+    """Lazily computed extractor results for one stage body.
+
+    Each extractor runs at most once per stage; the action body, the metadata
+    block and the complexity score all read from the same instance. Results
+    already produced by the parser can be seeded through keyword arguments.
+    Extractors run on source, a view into the parsed pipeline text when the
+    stage comes from the IR, so its block lookups reuse the pipeline's tree.
+    With the stage analysis cache enabled, stages with the same body share
+    one result dict across conversions.
+    """
+
+    ANALYZERS = {
+        "tools": extract_tools,
+        "git_steps": extract_git_steps,
+        "sonar_steps": extract_sonarqube_steps,
+        "docker_steps": extract_docker_steps,
+        "kubectl_commands": extract_kubectl_steps,
+        "input_steps": extract_input_steps,
+        "commands": extract_steps_commands,
+        "cred_blocks": extract_withCredentials_blocks,
+        "script_blocks": extract_script_blocks,
+        "plugin_steps": extract_plugin_steps,
+        "credentials": extract_credentials_usage,
+        "post_info": extract_stage_post,
+        "jenkins_params": extract_jenkins_parameters_from_text,
+    }
+    # Derived results that are themselves computed from other extractions
+    DERIVED = ("required_secrets",)
+    STATS = EXTRACTION_STATS
+
+    __slots__ = ("body", "source")
+
+    def __init__(self, body: str, source: Optional[SourceView] = None, **precomputed):
+        self.body = body
+        self.source = source if source is not None else SourceView(body)
+        self._results: Dict[str, Any] = _shared_results(
+            body, {k: v for k, v in precomputed.items() if v is not None})
+
+    @classmethod
+    def for_stage(cls, stage: Stage) -> "StageAnalysis":
+        """Build an analysis seeded with the extractions already held by the IR"""
+        if stage.error is not None:
+            return cls(stage.body, stage.source)
+        return cls(
+            stage.body,
+            stage.source,
+            plugin_steps=stage.plugin_steps,
+            script_blocks=stage.script_blocks,
+            cred_blocks=stage.cred_blocks,
+            credentials=[cred.id for cred in stage.credentials],
+            commands=[step.command for step in stage.steps],
+            post_info=stage.post_dict() if stage.post is not None else None,
+        )
+
+    def _compute(self, name: str) -> Any:
+        if name == "required_secrets":
+            return extract_required_secrets_from_stage(self.body, self)
+        return self.ANALYZERS[name](self.source)
+
+
 def generate_tool_setup_steps(tools: Dict[str, str]) -> List[Dict[str, Any]]:
     """Generate setup steps for tools"""
     setup_steps = []
@@ -167,9 +297,10 @@ def convert_git_steps_to_actions(git_steps: List[Dict[str, Any]]) -> List[Dict[s
                 branch = git_step["branch"]
                 # Handle parameter references
                 if "${params." in branch:
-                    param_name = re.search(r"\$\{params\.([^}]+)\}", branch)
+                    param_name = PARAMS_REF_ANY.search(branch)
                     if param_name:
-                        with_params["ref"] = f"${{{{ inputs.{param_name.group(1)} }}}}"
+                        input_name = ACTION_INPUT_RENAMES.get(param_name.group(1), param_name.group(1))
+                        with_params["ref"] = f"${{{{ inputs.{input_name} }}}}"
                 else:
                     with_params["ref"] = branch
         
@@ -209,7 +340,7 @@ def convert_sonarqube_steps(sonar_steps: List[Dict[str, Any]]) -> List[Dict[str,
     for sonar_step in sonar_steps:
         # Add original commands with proper variable substitution
         for cmd in sonar_step["commands"]:
-            processed_cmd = convert_jenkins_variables_to_gha(cmd)
+            processed_cmd = convert_jenkins_variables_to_gha(cmd, ACTION_INPUT_RENAMES)
             
             sonar_actions.append({
                 "name": "Run SonarQube analysis",
@@ -251,7 +382,7 @@ def convert_docker_steps(docker_steps: List[Dict[str, Any]]) -> List[Dict[str, A
         if docker_step["type"] == "build":
             # Convert Jenkins variables in tag references
             tag = docker_step.get("tag", "${{ inputs.image-name }}:${{ inputs.build-tag }}")
-            tag = convert_jenkins_variables_to_gha(tag)
+            tag = convert_jenkins_variables_to_gha(tag, ACTION_INPUT_RENAMES)
             
             build_cmd = f"docker build -t {tag} ."
             if docker_step.get("dockerfile"):
@@ -264,7 +395,7 @@ def convert_docker_steps(docker_steps: List[Dict[str, Any]]) -> List[Dict[str, A
             })
         elif docker_step["type"] == "push":
             tag = docker_step.get("tag", "${{ inputs.image-name }}:${{ inputs.build-tag }}")
-            tag = convert_jenkins_variables_to_gha(tag)
+            tag = convert_jenkins_variables_to_gha(tag, ACTION_INPUT_RENAMES)
             
             docker_actions.append({
                 "name": "Push Docker image",
@@ -404,7 +535,7 @@ def convert_post_actions_to_steps(post_info: Dict[str, Any], stage_name: str) ->
             post_steps.append({
                 "name": f"Post {condition} script (MANUAL CONVERSION REQUIRED)",
                 "if": gha_condition,
-                "run": generate_limitations_comment("Script block", actions["script_block"][:100] + "..."),
+                "run": generate_limitations_comment("Script block", compact_snippet(actions["script_block"])[:100] + "..."),
                 "shell": "bash"
             })
     
@@ -450,12 +581,14 @@ def convert_credentials_to_env_setup(cred_blocks: List[Dict[str, Any]]) -> List[
     return env_steps
 
 
-def extract_required_secrets_from_stage(stage_body: str) -> Dict[str, Dict[str, str]]:
+def extract_required_secrets_from_stage(stage_body: str, analysis: Optional[StageAnalysis] = None) -> Dict[str, Dict[str, str]]:
     """Extract and categorize secrets needed for the stage"""
+    if analysis is None:
+        analysis = StageAnalysis(stage_body)
     secrets = {}
     
     # Docker credentials
-    docker_steps = extract_docker_steps(stage_body)
+    docker_steps = analysis.docker_steps
     if any(step["type"] in ["push", "login"] for step in docker_steps):
         secrets["docker-username"] = {
             "description": "Docker registry username",
@@ -478,7 +611,7 @@ def extract_required_secrets_from_stage(stage_body: str) -> Dict[str, Dict[str,
         }
     
     # SonarQube credentials
-    sonar_steps = extract_sonarqube_steps(stage_body)
+    sonar_steps = analysis.sonar_steps
     if sonar_steps:
         secrets["sonar-token"] = {
             "description": "SonarQube authentication token",
@@ -512,7 +645,7 @@ def extract_required_secrets_from_stage(stage_body: str) -> Dict[str, Dict[str,
         }
     
     # Extract credentials from withCredentials blocks
-    cred_blocks = extract_withCredentials_blocks(stage_body)
+    cred_blocks = analysis.cred_blocks
     for cred_block in cred_blocks:
         for cred in cred_block["credentials"]:
             cred_name = sanitize_credential_name(cred["credentialsId"]).lower().replace('_', '-')
@@ -533,7 +666,7 @@ def extract_required_secrets_from_stage(stage_body: str) -> Dict[str, Dict[str,
                 }
     
     # Direct credentials usage
-    credentials = extract_credentials_usage(stage_body)
+    credentials = analysis.credentials
     for cred_id in credentials:
         cred_name = sanitize_credential_name(cred_id).lower().replace('_', '-')
         if cred_name not in secrets:
@@ -546,20 +679,22 @@ def extract_required_secrets_from_stage(stage_body: str) -> Dict[str, Dict[str,
 
 
 def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_env: Dict[str, str], 
-                                     stage_agent: Dict[str, Any], post_info: Dict[str, Any]) -> Dict[str, Any]:
+                                     stage_agent: Dict[str, Any], post_info: Dict[str, Any],
+                                     analysis: Optional[StageAnalysis] = None) -> Dict[str, Any]:
     """Generate enhanced composite action with proper secrets handling"""
-    
-    # Extract all Jenkins features
-    tools = extract_tools(stage_body)
-    git_steps = extract_git_steps(stage_body)
-    sonar_steps = extract_sonarqube_steps(stage_body)
-    docker_steps = extract_docker_steps(stage_body)
-    kubectl_commands = extract_kubectl_steps(stage_body)
-    input_steps = extract_input_steps(stage_body)
-    basic_commands = extract_steps_commands(stage_body)
-    cred_blocks = extract_withCredentials_blocks(stage_body)
-    script_blocks = extract_script_blocks(stage_body)
-    plugin_steps = extract_plugin_steps(stage_body)
+    if analysis is None:
+        analysis = StageAnalysis(stage_body)
+    
+    # Extract all Jenkins features (each extractor runs at most once per stage)
+    tools = analysis.tools
+    git_steps = analysis.git_steps
+    sonar_steps = analysis.sonar_steps
+    docker_steps = analysis.docker_steps
+    kubectl_commands = analysis.kubectl_commands
+    basic_commands = analysis.commands
+    cred_blocks = analysis.cred_blocks
+    script_blocks = analysis.script_blocks
+    plugin_steps = analysis.plugin_steps
     
     action_def = {
         "name": f"{stage_name} Action",
@@ -572,7 +707,7 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
     }
     
     # Extract required secrets and add as inputs
-    required_secrets = extract_required_secrets_from_stage(stage_body)
+    required_secrets = analysis.required_secrets
     for secret_name, secret_info in required_secrets.items():
         action_def["inputs"][secret_name] = secret_info
     
@@ -607,8 +742,8 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
             }
     
     # Add inputs for any Jenkins parameters found in the stage
-    jenkins_params = extract_jenkins_parameters_from_text(stage_body)
-    for param in jenkins_params:
+    jenkins_params = analysis.jenkins_params
+    for param in sorted(jenkins_params):
         input_key = param.lower().replace('_', '-')
         if input_key not in action_def["inputs"]:
             action_def["inputs"][input_key] = {
@@ -655,10 +790,10 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
             cmd.startswith("docker push") and docker_steps,
             "mvn sonar:sonar" in cmd and sonar_steps
         ]):
-            processed_cmd = convert_jenkins_variables_to_gha(cmd)
+            processed_cmd = convert_jenkins_variables_to_gha(cmd, ACTION_INPUT_RENAMES)
             # Remove line continuations and normalize
-            processed_cmd = re.sub(r'\\\s*\n\s*', ' ', processed_cmd)
-            processed_cmd = re.sub(r'\s+', ' ', processed_cmd).strip()
+            processed_cmd = LINE_CONTINUATION.sub(' ', processed_cmd)
+            processed_cmd = WHITESPACE_RUN.sub(' ', processed_cmd).strip()
             
             # Deduplicate commands
             if processed_cmd and processed_cmd not in seen_commands:
@@ -684,9 +819,9 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
     kubectl_seen = set()
     kubectl_count = 0
     for kubectl_cmd in kubectl_commands:
-        processed_cmd = convert_jenkins_variables_to_gha(kubectl_cmd)
-        processed_cmd = re.sub(r'\\\s*\n\s*', ' ', processed_cmd)
-        processed_cmd = re.sub(r'\s+', ' ', processed_cmd).strip()
+        processed_cmd = convert_jenkins_variables_to_gha(kubectl_cmd, ACTION_INPUT_RENAMES)
+        processed_cmd = LINE_CONTINUATION.sub(' ', processed_cmd)
+        processed_cmd = WHITESPACE_RUN.sub(' ', processed_cmd).strip()
         
         if processed_cmd and processed_cmd not in kubectl_seen:
             kubectl_count += 1
@@ -703,7 +838,7 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
             if script_block["complexity"]["requires_manual_conversion"]:
                 steps.append({
                     "name": f"Script block {i+1} (REQUIRES MANUAL CONVERSION)",
-                    "run": generate_limitations_comment("Complex script block", script_block["content"][:200]),
+                    "run": generate_limitations_comment("Complex script block", compact_snippet(script_block["content"])[:200]),
                     "shell": "bash"
                 })
     
@@ -712,7 +847,7 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
         for plugin_step in plugin_steps:
             steps.append({
                 "name": f"{plugin_step['plugin']} (REQUIRES MANUAL CONVERSION)",
-                "run": generate_limitations_comment(plugin_step['plugin'], plugin_step['full_match'][:100]),
+                "run": generate_limitations_comment(plugin_step['plugin'], compact_snippet(plugin_step['full_match'])[:100]),
                 "shell": "bash"
             })
     
@@ -725,99 +860,154 @@ def generate_enhanced_composite_action(stage_name: str, stage_body: str, stage_e
     return action_def
 
 
-def save_enhanced_composite_actions(stages_info: List[Dict[str, Any]], output_dir: Path) -> List[Dict[str, Any]]:
-    """Save enhanced composite actions with proper secrets handling"""
-    actions_dir = output_dir / ".github" / "actions"
-    actions_dir.mkdir(parents=True, exist_ok=True)
+@traced("render_action")
+def render_composite_action(action_def: Dict[str, Any]) -> str:
+    """action.yml text for a composite action definition"""
+    return dump_yaml(action_def)
+
+
+def write_composite_action(action_file: Path, action_def: Dict[str, Any],
+                           writer: Optional[OutputWriter] = None, rendered: Optional[str] = None) -> str:
+    """Write a composite action definition to action.yml if it changed
+
+    rendered is the definition's action.yml text when it is already known.
+    Returns the OutputWriter status (new, updated or unchanged).
+    """
+    if rendered is None:
+        rendered = render_composite_action(action_def)
+    with span("write_action"):
+        return (writer or OutputWriter()).write_text(action_file, rendered)
+
+
+def convert_stage_to_action(stage: Stage) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Composite action definition and metadata entry for one stage.
+
+    The metadata "path" is left as None; it depends on the directory the
+    ActionStore assigns in this run.
+    """
+    stage_name = stage.name
+    stage_body = stage.body
     
-    action_paths = []
+    # One memoized analysis per stage, seeded with what the parser already extracted
+    analysis = StageAnalysis.for_stage(stage)
+    post_info = analysis.post_info
     
-    for stage_info in stages_info:
-        stage_name = stage_info["name"]
-        stage_body = stage_info.get("body", "")
-        action_name = sanitize_name(stage_name.lower())
-        action_dir = actions_dir / action_name
-        action_dir.mkdir(exist_ok=True)
-        
-        # Extract post information
-        post_info = extract_stage_post(stage_body)
-        
-        # Generate the enhanced composite action
+    # Generate the enhanced composite action
+    with span("composite_action", stage=stage_name):
         action_def = generate_enhanced_composite_action(
             stage_name,
             stage_body,
-            stage_info.get("env", {}),
-            stage_info.get("agent", {}),
-            post_info
+            stage.env,
+            stage.agent_dict(),
+            post_info,
+            analysis
         )
+    
+    # Extract comprehensive metadata
+    approval_env = convert_input_steps_to_environment(analysis.input_steps, stage_name)
+    plugin_steps = analysis.plugin_steps
+    script_blocks = analysis.script_blocks
+    
+    # Analyze manual conversion requirements
+    manual_conversion_needed = []
+    if plugin_steps:
+        manual_conversion_needed.extend([f"Jenkins plugin: {p['plugin']}" for p in plugin_steps])
+    if any(s["complexity"]["requires_manual_conversion"] for s in script_blocks):
+        manual_conversion_needed.append("Complex script blocks")
+    if post_info and any("script_block" in actions for actions in post_info.values()):
+        manual_conversion_needed.append("Post-action script blocks")
+    
+    # Required secrets for job-level passing
+    required_secrets = analysis.required_secrets
+    
+    action_metadata = {
+        "name": stage_name,
+        "path": None,
+        "env": stage.env,
+        "approval_environment": approval_env,
+        "credentials": list(analysis.credentials),
+        "required_secrets": list(required_secrets.keys()),
+        "has_docker": bool(analysis.docker_steps),
+        "has_kubectl": bool(analysis.kubectl_commands),
+        "has_sonarqube": bool(analysis.sonar_steps),
+        "has_post_actions": bool(post_info),
+        "post_action_types": list(post_info.keys()) if post_info else [],
+        "manual_conversion_needed": manual_conversion_needed,
+        "complexity_score": calculate_complexity_score(stage_body, analysis),
+        "plugin_dependencies": [p['plugin'] for p in plugin_steps]
+    }
+    return action_def, action_metadata
+
+
+@traced("composite_actions")
+def save_enhanced_composite_actions(stages: List[Stage], output_dir: Path,
+                                    deferred_writes: Optional[List[Tuple[Path, Dict[str, Any], Optional[str]]]] = None,
+                                    store: Optional[ActionStore] = None,
+                                    stage_cache: Optional["StageCache"] = None) -> List[Dict[str, Any]]:
+    """Save enhanced composite actions with proper secrets handling
+
+    When deferred_writes is given, (action_file, action_def, rendered) entries
+    are appended to it instead of being written, so a parent process can
+    write them in a deterministic order; rendered is the action.yml text, or
+    None if it still has to be rendered. Action directories are named
+    through store (a fresh ActionStore by default): identical actions are
+    saved once and shared. With stage_cache, stages converted before (same
+    stage text, pipeline environment and agent, and converter version; see
+    Stage.cache_key) are neither converted nor rendered again.
+    """
+    actions_dir = output_dir / ".github" / "actions"
+    if store is None:
+        store = ActionStore()
+    
+    action_paths = []
+    
+    for stage in stages:
+        key = stage.cache_key if stage_cache else None
+        cached = stage_cache.get(key) if key else None
+        if cached is not None:
+            action_def, action_metadata, rendered = cached
+        else:
+            action_def, action_metadata = convert_stage_to_action(stage)
+            rendered = None
+            if key:
+                rendered = render_composite_action(action_def)
+                stage_cache.put(key, action_def, action_metadata, rendered)
         
-        # Save action definition
-        action_file = action_dir / "action.yml"
-        with action_file.open("w", encoding="utf-8") as f:
-            yaml.dump(action_def, f, sort_keys=False, width=1000, default_flow_style=False)
-        
-        relative_path = f"./.github/actions/{action_name}"
-        
-        # Extract comprehensive metadata
-        input_steps = extract_input_steps(stage_body)
-        approval_env = convert_input_steps_to_environment(input_steps, stage_name)
-        credentials = extract_credentials_usage(stage_body)
-        plugin_steps = extract_plugin_steps(stage_body)
-        script_blocks = extract_script_blocks(stage_body)
-        
-        # Analyze manual conversion requirements
-        manual_conversion_needed = []
-        if plugin_steps:
-            manual_conversion_needed.extend([f"Jenkins plugin: {p['plugin']}" for p in plugin_steps])
-        if any(s["complexity"]["requires_manual_conversion"] for s in script_blocks):
-            manual_conversion_needed.append("Complex script blocks")
-        if post_info and any("script_block" in actions for actions in post_info.values()):
-            manual_conversion_needed.append("Post-action script blocks")
-        
-        # Extract required secrets for job-level passing
-        required_secrets = extract_required_secrets_from_stage(stage_body)
-        
-        action_metadata = {
-            "name": stage_name,
-            "path": relative_path,
-            "env": stage_info.get("env", {}),
-            "approval_environment": approval_env,
-            "credentials": list(credentials),
-            "required_secrets": list(required_secrets.keys()),
-            "has_docker": bool(extract_docker_steps(stage_body)),
-            "has_kubectl": bool(extract_kubectl_steps(stage_body)),
-            "has_sonarqube": bool(extract_sonarqube_steps(stage_body)),
-            "has_post_actions": bool(post_info),
-            "post_action_types": list(post_info.keys()) if post_info else [],
-            "manual_conversion_needed": manual_conversion_needed,
-            "complexity_score": calculate_complexity_score(stage_body),
-            "plugin_dependencies": [p['plugin'] for p in plugin_steps]
-        }
+        # Save action definition, once per distinct definition
+        action_name, is_new = store.put(sanitize_name(stage.name.lower()), action_def)
+        action_file = actions_dir / action_name / "action.yml"
+        if is_new and deferred_writes is not None:
+            deferred_writes.append((action_file, action_def, rendered))
+        elif is_new:
+            write_composite_action(action_file, action_def, rendered=rendered)
         
+        action_metadata["path"] = action_ref(action_name)
         action_paths.append(action_metadata)
 
     return action_paths
 
 
-def calculate_complexity_score(stage_body: str) -> int:
+def calculate_complexity_score(stage_body: str, analysis: Optional[StageAnalysis] = None) -> int:
     """Calculate complexity score for a stage"""
+    if analysis is None:
+        analysis = StageAnalysis(stage_body)
     score = 0
     
     # Basic features
-    score += len(extract_steps_commands(stage_body))
-    score += len(extract_credentials_usage(stage_body)) * 2
-    score += len(extract_docker_steps(stage_body)) * 3
-    score += len(extract_kubectl_steps(stage_body)) * 3
-    score += len(extract_sonarqube_steps(stage_body)) * 4
+    score += len(analysis.commands)
+    score += len(analysis.credentials) * 2
+    score += len(analysis.docker_steps) * 3
+    score += len(analysis.kubectl_commands) * 3
+    score += len(analysis.sonar_steps) * 4
     
     # Complex features
-    script_blocks = extract_script_blocks(stage_body)
+    script_blocks = analysis.script_blocks
     score += sum(5 if s["complexity"]["requires_manual_conversion"] else 2 for s in script_blocks)
     
-    plugin_steps = extract_plugin_steps(stage_body)
+    plugin_steps = analysis.plugin_steps
     score += len(plugin_steps) * 4
     
-    post_info = extract_stage_post(stage_body)
+    post_info = analysis.post_info
     score += len(post_info) * 2
     
     return score
@@ -0,0 +1,95 @@
+"""
+Content-addressed naming for generated composite actions
+
+Actions are keyed by a hash of their normalized definition (sorted keys
+and sets, so the same stage hashes the same in every process). Identical
+definitions share one .github/actions/<name> directory and are written once;
+a name already taken by a different definition gets <name>-<hash> instead
+of overwriting it.
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List, Tuple
+
+
+# Hex digits of the definition hash appended to colliding action names
+DIGEST_CHARS = 8
+
+
+def _canonical(value: Any) -> Any:
+    """JSON stand-in for values json cannot encode; sets are sorted so their
+    hash does not depend on PYTHONHASHSEED"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def action_digest(action_def: Dict[str, Any]) -> str:
+    """Hash of an action definition, independent of key and set order"""
+    normalized = json.dumps(action_def, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                            default=_canonical)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def action_ref(name: str) -> str:
+    """Workflow `uses:` reference of a local composite action"""
+    return f"./.github/actions/{name}"
+
+
+class ActionStore:
+    """Assigns action directory names for one output tree.
+
+    put() returns the directory an action lives in and whether it still has
+    to be written; the caller does the writing. The counters describe the
+    run: stored definitions, shared ones (writes avoided) and renames
+    caused by name collisions.
+    """
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}   # digest -> directory name
+        self.owners: Dict[str, str] = {}  # directory name -> digest
+        self.stored = 0
+        self.shared = 0
+        self.renamed = 0
+
+    def put(self, name: str, action_def: Dict[str, Any]) -> Tuple[str, bool]:
+        """Directory name for action_def, preferring name; True if it is new.
+
+        A name carrying the definition's own hash suffix (as assigned by
+        another store) is treated as its base name, so results of per-file
+        stores can be merged into a run-wide one.
+        """
+        digest = action_digest(action_def)
+        existing = self.names.get(digest)
+        if existing is not None:
+            self.shared += 1
+            return existing, False
+
+        suffix = f"-{digest[:DIGEST_CHARS]}"
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+        if self.owners.get(name, digest) != digest:
+            name += suffix
+            self.renamed += 1
+        self.names[digest] = name
+        self.owners[name] = digest
+        self.stored += 1
+        return name, True
+
+    def stats(self) -> Dict[str, int]:
+        return {"stored": self.stored, "shared": self.shared, "renamed": self.renamed}
+
+
+def remap_action_refs(workflow: Dict[str, Any], action_paths: List[Dict[str, Any]], renames: Dict[str, str]):
+    """Point workflow steps and action metadata at renamed action directories"""
+    refs = {action_ref(old): action_ref(new) for old, new in renames.items() if old != new}
+    if not refs:
+        return
+    for action in action_paths:
+        if action.get("path") in refs:
+            action["path"] = refs[action["path"]]
+    for job in workflow.get("jobs", {}).values():
+        for step in job.get("steps", []):
+            if step.get("uses") in refs:
+                step["uses"] = refs[step["uses"]]
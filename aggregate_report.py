@@ -0,0 +1,309 @@
+
+"""
+Aggregate conversion report across every Jenkinsfile of a batch run
+
+Per-file summaries are collected as each conversion finishes (from the
+analysis and text already in memory) and rendered once at the end as an
+org-wide dashboard: totals, rankings of the slowest and most complex
+pipelines, and a per-file drilldown.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator, TextIO
+
+from utils import PipelineAnalysis
+from report_generator import get_css_styles
+
+
+RANKING_SIZE = 10
+COMPLEXITY_LEVELS = ("Low", "Medium", "High", "Very High")
+CONFIDENCE_LEVELS = ("High", "Medium", "Low")
+
+_TABLE_CELL = 'style="padding: 8px 10px; text-align: left; border: 1px solid #dee2e6;"'
+
+
+def summarize_pipeline(name: str, analysis: PipelineAnalysis, action_paths: List[Dict[str, Any]],
+                       seconds: Optional[float] = None, cached: bool = False) -> Dict[str, Any]:
+    """Compact per-file record for the aggregate report (the pipeline text is not kept)"""
+    complexity = analysis.complexity
+    feasibility = analysis.feasibility
+    stages = [
+        {
+            "name": action["name"],
+            "path": action["path"],
+            "complexity_score": action.get("complexity_score", 0),
+            "manual_items": len(action.get("manual_conversion_needed", [])),
+        }
+        for action in action_paths
+    ]
+    return {
+        "file": name,
+        "status": "cached" if cached else "converted",
+        "seconds": seconds,
+        "stages": stages,
+        "manual_items": sum(stage["manual_items"] for stage in stages),
+        "complexity_score": complexity["complexity_score"],
+        "complexity_level": complexity["complexity_level"],
+        "confidence": feasibility["confidence"],
+        "blockers": list(feasibility["blockers"]),
+        "warnings": list(feasibility["warnings"]),
+        "unsupported_features": [feature["feature"] for feature in analysis.unsupported_features],
+        "languages": list(analysis.languages),
+        "tools": list(analysis.tools),
+        "credentials": sorted(analysis.credentials),
+    }
+
+
+class AggregateReport:
+    """Summaries of all pipelines in a batch, rendered as HTML or markdown"""
+
+    def __init__(self):
+        self.pipelines: List[Dict[str, Any]] = []
+        self.failures: List[Dict[str, str]] = []
+
+    def add(self, name: str, analysis: PipelineAnalysis, action_paths: List[Dict[str, Any]],
+            seconds: Optional[float] = None, cached: bool = False):
+        self.pipelines.append(summarize_pipeline(name, analysis, action_paths, seconds, cached))
+
+    def add_failure(self, name: str, error: str):
+        self.failures.append({"file": name, "error": error})
+
+    def totals(self) -> Dict[str, Any]:
+        """Batch-wide counts"""
+        pipelines = self.pipelines
+        credentials = set()
+        for pipeline in pipelines:
+            credentials.update(pipeline["credentials"])
+        timed = [p["seconds"] for p in pipelines if p["seconds"] is not None]
+        return {
+            "files": len(pipelines) + len(self.failures),
+            "converted": sum(1 for p in pipelines if p["status"] == "converted"),
+            "cached": sum(1 for p in pipelines if p["status"] == "cached"),
+            "failed": len(self.failures),
+            "stages": sum(len(p["stages"]) for p in pipelines),
+            "manual_items": sum(p["manual_items"] for p in pipelines),
+            "credentials": len(credentials),
+            "blocked": sum(1 for p in pipelines if p["blockers"]),
+            "convert_seconds": sum(timed),
+            "complexity_levels": Counter(p["complexity_level"] for p in pipelines),
+            "confidence_levels": Counter(p["confidence"] for p in pipelines),
+            "languages": Counter(lang for p in pipelines for lang in p["languages"]),
+            "tools": Counter(tool for p in pipelines for tool in p["tools"]),
+            "unsupported_features": Counter(f for p in pipelines for f in p["unsupported_features"]),
+        }
+
+    def slowest(self, limit: int = RANKING_SIZE) -> List[Dict[str, Any]]:
+        """Pipelines that took longest to convert (cache hits have no timing)"""
+        timed = [p for p in self.pipelines if p["seconds"] is not None]
+        return sorted(timed, key=lambda p: p["seconds"], reverse=True)[:limit]
+
+    def most_complex(self, limit: int = RANKING_SIZE) -> List[Dict[str, Any]]:
+        """Pipelines with the highest complexity score"""
+        return sorted(self.pipelines, key=lambda p: p["complexity_score"], reverse=True)[:limit]
+
+    def write_html(self, out: TextIO):
+        """Stream the HTML dashboard to an open text file"""
+        out.writelines(self.iter_html())
+
+    def iter_html(self) -> Iterator[str]:
+        """Yield the HTML dashboard section by section"""
+        totals = self.totals()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Jenkins to GitHub Actions Conversion Summary</title>
+    <style>
+        {get_css_styles()}
+        details.pipeline {{ border: 1px solid #e2e8f0; border-radius: 8px; margin-bottom: 10px; padding: 10px 15px; }}
+        details.pipeline summary {{ cursor: pointer; font-weight: bold; }}
+        table.summary-table {{ width: 100%; border-collapse: collapse; margin: 10px 0; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header class="header">
+            <h1>🚀 Jenkins to GitHub Actions Conversion Summary</h1>
+            <div class="header-info">
+                <span><strong>Generated:</strong> {timestamp}</span>
+                <span><strong>Pipelines:</strong> {totals['files']}</span>
+                <span><strong>Stages:</strong> {totals['stages']}</span>
+            </div>
+        </header>
+"""
+        yield from _iter_totals_html(totals)
+        yield from _iter_ranking_html(
+            "⏱️ Slowest Pipelines", ("Conversion Time", "Stages", "Complexity"),
+            [(p["file"], f"{p['seconds']:.3f}s", len(p["stages"]), p["complexity_score"]) for p in self.slowest()],
+            "No timed conversions (all files were served from the cache)"
+        )
+        yield from _iter_ranking_html(
+            "📊 Most Complex Pipelines", ("Complexity", "Level", "Feasibility"),
+            [(p["file"], p["complexity_score"], p["complexity_level"], p["confidence"]) for p in self.most_complex()],
+            "No pipelines converted"
+        )
+        yield """
+        <div class="section">
+            <h2>📁 Per-File Drilldown</h2>
+"""
+        for pipeline in self.pipelines:
+            yield _pipeline_drilldown_html(pipeline)
+        for failure in self.failures:
+            yield f"""
+            <details class="pipeline">
+                <summary>❌ {failure['file']} — conversion failed</summary>
+                <p style="color: #c53030;">{failure['error']}</p>
+            </details>
+"""
+        yield """
+        </div>
+    </div>
+</body>
+</html>"""
+
+    def markdown(self) -> str:
+        """Markdown version of the dashboard"""
+        totals = self.totals()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        report = [
+            "# Jenkins to GitHub Actions Conversion Summary",
+            "",
+            f"**Generated:** {timestamp}",
+            "",
+            "## Totals",
+            f"- **Pipelines**: {totals['files']} ({totals['converted']} converted, {totals['cached']} cached, {totals['failed']} failed)",
+            f"- **Stages converted**: {totals['stages']}",
+            f"- **Manual items**: {totals['manual_items']}",
+            f"- **Secrets to configure**: {totals['credentials']}",
+            f"- **Pipelines with blockers**: {totals['blocked']}",
+            f"- **Conversion time**: {totals['convert_seconds']:.3f}s",
+            f"- **Complexity**: " + ", ".join(f"{level} {totals['complexity_levels'][level]}" for level in COMPLEXITY_LEVELS),
+            f"- **Feasibility**: " + ", ".join(f"{level} {totals['confidence_levels'][level]}" for level in CONFIDENCE_LEVELS),
+            "",
+            "## Slowest Pipelines",
+        ]
+        for rank, pipeline in enumerate(self.slowest(), 1):
+            report.append(f"{rank}. `{pipeline['file']}` — {pipeline['seconds']:.3f}s, {len(pipeline['stages'])} stages")
+        if not self.slowest():
+            report.append("No timed conversions (all files were served from the cache)")
+
+        report.extend(["", "## Most Complex Pipelines"])
+        for rank, pipeline in enumerate(self.most_complex(), 1):
+            report.append(f"{rank}. `{pipeline['file']}` — {pipeline['complexity_level']} ({pipeline['complexity_score']} points), feasibility {pipeline['confidence']}")
+
+        report.extend(["", "## Pipelines", "",
+                       "| File | Status | Stages | Complexity | Feasibility | Manual Items |",
+                       "|------|--------|--------|------------|-------------|--------------|"])
+        for p in self.pipelines:
+            report.append(f"| {p['file']} | {p['status']} | {len(p['stages'])} | {p['complexity_level']} ({p['complexity_score']}) | {p['confidence']} | {p['manual_items']} |")
+        for failure in self.failures:
+            report.append(f"| {failure['file']} | failed | - | - | - | - |")
+
+        if self.failures:
+            report.extend(["", "## Failed Conversions"])
+            for failure in self.failures:
+                report.append(f"- `{failure['file']}`: {failure['error']}")
+
+        return "\n".join(report) + "\n"
+
+
+def _counter_tags_html(counts: Counter) -> str:
+    if not counts:
+        return "<p>None detected</p>"
+    tags = "".join(f"<span class='tech-tag'>{name} ({count})</span>" for name, count in counts.most_common())
+    return f"<div class='tech-tags'>{tags}</div>"
+
+
+def _iter_totals_html(totals: Dict[str, Any]) -> Iterator[str]:
+    cards = [
+        (totals["files"], "Pipelines", f"{totals['converted']} converted, {totals['cached']} cached, {totals['failed']} failed"),
+        (totals["stages"], "Stages", "Composite actions generated"),
+        (totals["manual_items"], "Manual Items", "Items needing manual attention"),
+        (totals["credentials"], "Secrets", "Distinct credentials to configure"),
+        (totals["blocked"], "Blocked Pipelines", "Pipelines with conversion blockers"),
+        (f"{totals['convert_seconds']:.2f}s", "Conversion Time", "Summed over converted files"),
+    ]
+    yield """
+        <div class="section stats-section">
+            <h2>📈 Totals</h2>
+            <div class="stats-grid">
+"""
+    for value, label, description in cards:
+        yield f"""
+                <div class="stat-card">
+                    <div class="stat-value">{value}</div>
+                    <div class="stat-label">{label}</div>
+                    <div class="stat-description">{description}</div>
+                </div>
+"""
+    levels = " ".join(f"<span class='tech-tag'>{level}: {totals['complexity_levels'][level]}</span>" for level in COMPLEXITY_LEVELS)
+    confidence = " ".join(f"<span class='tech-tag'>{level}: {totals['confidence_levels'][level]}</span>" for level in CONFIDENCE_LEVELS)
+    yield f"""
+            </div>
+            <h4>Complexity Distribution</h4>
+            <div class='tech-tags'>{levels}</div>
+            <h4>Feasibility Distribution</h4>
+            <div class='tech-tags'>{confidence}</div>
+            <h4>Languages/Frameworks</h4>
+            {_counter_tags_html(totals['languages'])}
+            <h4>Tools & Technologies</h4>
+            {_counter_tags_html(totals['tools'])}
+            <h4>Unsupported Features</h4>
+            {_counter_tags_html(totals['unsupported_features'])}
+        </div>
+"""
+
+
+def _iter_ranking_html(title: str, columns: tuple, rows: List[tuple], empty_message: str) -> Iterator[str]:
+    yield f"""
+        <div class="section">
+            <h2>{title}</h2>
+"""
+    if not rows:
+        yield f"            <p>{empty_message}</p>\n        </div>\n"
+        return
+    headers = "".join(f"<th {_TABLE_CELL}>{column}</th>" for column in ("#", "File") + columns)
+    yield f"""            <table class="summary-table">
+                <thead><tr style="background: #f8f9fa;">{headers}</tr></thead>
+                <tbody>
+"""
+    for rank, row in enumerate(rows, 1):
+        cells = "".join(f"<td {_TABLE_CELL}>{value}</td>" for value in (rank,) + tuple(row))
+        yield f"                    <tr>{cells}</tr>\n"
+    yield """                </tbody>
+            </table>
+        </div>
+"""
+
+
+def _pipeline_drilldown_html(pipeline: Dict[str, Any]) -> str:
+    status_icon = "⚠️" if pipeline["manual_items"] or pipeline["blockers"] else "✅"
+    timing = "cached" if pipeline["seconds"] is None else f"{pipeline['seconds']:.3f}s"
+
+    rows = "".join(
+        f"<tr><td {_TABLE_CELL}>{stage['name']}</td><td {_TABLE_CELL}><code>{stage['path']}</code></td>"
+        f"<td {_TABLE_CELL}>{stage['complexity_score']}</td><td {_TABLE_CELL}>{stage['manual_items']}</td></tr>"
+        for stage in pipeline["stages"]
+    )
+    notes = ""
+    for label, items in (("Blockers", pipeline["blockers"]), ("Warnings", pipeline["warnings"]),
+                         ("Unsupported features", pipeline["unsupported_features"])):
+        if items:
+            notes += f"<h5>{label}</h5><ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+
+    return f"""
+            <details class="pipeline">
+                <summary>{status_icon} {pipeline['file']} — {len(pipeline['stages'])} stages, {pipeline['complexity_level']} complexity ({pipeline['complexity_score']}), feasibility {pipeline['confidence']}, {timing}</summary>
+                <p><strong>Languages:</strong> {", ".join(pipeline['languages']) or "none"} | <strong>Tools:</strong> {", ".join(pipeline['tools']) or "none"} | <strong>Credentials:</strong> {len(pipeline['credentials'])}</p>
+                <table class="summary-table">
+                    <thead><tr style="background: #f8f9fa;"><th {_TABLE_CELL}>Stage</th><th {_TABLE_CELL}>Action Path</th><th {_TABLE_CELL}>Complexity</th><th {_TABLE_CELL}>Manual Items</th></tr></thead>
+                    <tbody>{rows}</tbody>
+                </table>
+                {notes}
+            </details>
+"""
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Conversion benchmark on synthetic Jenkinsfiles of configurable size
+
+Generates declarative pipelines scaled by stage count, parallel fan-out,
+step nesting depth, script-block size and credential count, then times
+parsing, convert_jenkins_to_gha, save_enhanced_composite_actions and
+generate_conversion_report separately. Results are printed as a table and
+can be written as JSON and compared against a previous run:
+
+    python benchmark.py --stages 10,100,1000 --parallel 0,4 --json bench.json
+    python benchmark.py --stages 10,100,1000 --parallel 0,4 --baseline bench.json
+    python benchmark.py --compare-parsers test-jenkinsfiles
+    python benchmark.py --yaml-check test-outputs
+    python benchmark.py --startup --startup-budget 40
+    python benchmark.py --incremental --stages 10,150,1000
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional, Tuple, TextIO
+
+import yaml
+
+import groovy_lexer
+import output_writer
+from converter import convert_jenkins_to_gha, CONVERTER_VERSION, PARSER_BACKENDS
+from pipeline_ir import parse_pipeline
+from action_generator import save_enhanced_composite_actions
+from report_generator import generate_conversion_report
+from utils import scan_pipeline_features, strip_comments
+from discovery import iter_inputs
+from conversion_cache import StageCache
+from output_writer import dump_yaml, load_yaml
+
+
+PHASES = ("parse", "convert", "save_actions", "report")
+# Every PARALLEL_EVERY-th stage becomes a parallel group when fan-out is enabled
+PARALLEL_EVERY = 5
+CREDENTIAL_KINDS = ("usernamePassword", "string", "file")
+# Regressions smaller than this are treated as timer noise
+NOISE_FLOOR_SECONDS = 0.001
+
+
+def _credential_binding(cred_id: str, index: int) -> str:
+    kind = CREDENTIAL_KINDS[index % len(CREDENTIAL_KINDS)]
+    var = cred_id.upper().replace("-", "_")
+    if kind == "usernamePassword":
+        return f"usernamePassword(credentialsId: '{cred_id}', usernameVariable: '{var}_USER', passwordVariable: '{var}_PASS')"
+    if kind == "string":
+        return f"string(credentialsId: '{cred_id}', variable: '{var}')"
+    return f"file(credentialsId: '{cred_id}', variable: '{var}_FILE')"
+
+
+def _steps(lines: List[str], indent: int, index: int, depth: int, script_lines: int, credentials: int):
+    """Append the steps of stage `index`, wrapped in `depth` nested blocks"""
+    pad = "    " * indent
+    wrappers = [
+        "dir('module-{k}') {{",
+        "timeout(time: 10, unit: 'MINUTES') {{",
+        "withEnv(['LEVEL={k}']) {{",
+    ]
+    for level in range(depth):
+        lines.append(pad + "    " * level + wrappers[level % len(wrappers)].format(k=level))
+    inner = pad + "    " * depth
+
+    lines.append(f"{inner}echo 'Running stage {index}'")
+    lines.append(f"{inner}sh 'make build-{index} -j4'")
+    if credentials:
+        cred_index = index % credentials
+        lines.append(f"{inner}withCredentials([{_credential_binding(f'cred-{cred_index}', cred_index)}]) {{")
+        lines.append(f"{inner}    sh './deploy.sh --target stage-{index}'")
+        lines.append(f"{inner}}}")
+    if script_lines:
+        lines.append(f"{inner}script {{")
+        for n in range(script_lines):
+            if n % 2 == 0:
+                lines.append(f"{inner}    def out{n} = sh(script: 'echo step {n}', returnStdout: true).trim()")
+            else:
+                lines.append(f"{inner}    if (out{n - 1}) {{ echo \"step {n}: ${{out{n - 1}}}\" }}")
+        lines.append(f"{inner}}}")
+
+    for level in reversed(range(depth)):
+        lines.append(pad + "    " * level + "}")
+
+
+def _stage(lines: List[str], indent: int, name: str, index: int, depth: int,
+           script_lines: int, credentials: int):
+    pad = "    " * indent
+    lines.append(f"{pad}stage('{name}') {{")
+    if index % 3 == 2:
+        lines.append(f"{pad}    when {{ branch 'main' }}")
+    if index % 2 == 1:
+        lines.append(f"{pad}    environment {{")
+        lines.append(f"{pad}        STAGE_ID = 'stage-{index}'")
+        lines.append(f"{pad}    }}")
+    lines.append(f"{pad}    steps {{")
+    _steps(lines, indent + 2, index, depth, script_lines, credentials)
+    lines.append(f"{pad}    }}")
+    if index % 4 == 3:
+        lines.append(f"{pad}    post {{")
+        lines.append(f"{pad}        always {{")
+        lines.append(f"{pad}            junit 'reports/stage-{index}/*.xml'")
+        lines.append(f"{pad}        }}")
+        lines.append(f"{pad}    }}")
+    lines.append(f"{pad}}}")
+
+
+def generate_pipeline(stages: int = 10, parallel: int = 0, depth: int = 1,
+                      script_lines: int = 4, credentials: int = 2) -> str:
+    """Synthetic declarative Jenkinsfile.
+
+    stages: top-level stages; parallel: children per parallel group (0 = no
+    parallel groups); depth: nested blocks around each stage's steps;
+    script_lines: lines per script { } block; credentials: distinct
+    credential IDs, bound in the environment and via withCredentials.
+    """
+    lines = [
+        "pipeline {",
+        "    agent { label 'linux' }",
+        "    parameters {",
+        "        string(name: 'VERSION', defaultValue: '1.0.0', description: 'Version')",
+        "        booleanParam(name: 'SKIP_TESTS', defaultValue: false, description: 'Skip tests')",
+        "    }",
+        "    environment {",
+        "        APP_NAME = 'synthetic-app'",
+        "        BUILD_VERSION = \"${params.VERSION}-${env.BUILD_NUMBER}\"",
+    ]
+    for i in range(credentials):
+        lines.append(f"        CRED_{i}_TOKEN = credentials('cred-{i}')")
+    lines.extend(["    }", "    stages {"])
+
+    for i in range(stages):
+        if parallel and i % PARALLEL_EVERY == PARALLEL_EVERY - 1:
+            lines.append(f"        stage('Group {i}') {{")
+            lines.append("            parallel {")
+            for j in range(parallel):
+                _stage(lines, 4, f"Group {i} Shard {j}", i, depth, script_lines, credentials)
+            lines.append("            }")
+            lines.append("        }")
+        else:
+            _stage(lines, 2, f"Stage {i}", i, depth, script_lines, credentials)
+
+    lines.extend([
+        "    }",
+        "    post {",
+        "        always { cleanWs() }",
+        "        failure { echo 'Build failed' }",
+        "    }",
+        "}",
+    ])
+    return "\n".join(lines) + "\n"
+
+
+# Comment-heavy Groovy mixed into the strip_comments inputs: URLs, comment
+# markers inside strings, block comments and triple-quoted strings
+COMMENT_SAMPLE = '''
+// Build settings for the synthetic app
+def repo = "https://git.example.com/org/app.git"  // upstream mirror
+/* Multi-line block comment
+   describing the deploy step */
+sh 'curl -s http://artifacts.example.com/latest // not a comment'
+sh """
+    echo "// still inside a string" /* and this too */
+"""
+'''
+
+
+def _legacy_strip_comments(text: str) -> str:
+    """strip_comments as it was before the single-pass scanner, for comparison"""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+    result_lines = []
+    for line in text.split('\n'):
+        if 'http://' in line or 'https://' in line:
+            result_lines.append(line)
+        else:
+            comment_pos = line.find('//')
+            if comment_pos != -1:
+                line = line[:comment_pos]
+            result_lines.append(line)
+    return '\n'.join(result_lines)
+
+
+def benchmark_strip_comments(sizes_mb: List[float], repeat: int = 3) -> List[Dict[str, Any]]:
+    """Time the current and the legacy strip_comments on multi-megabyte inputs"""
+    unit = generate_pipeline(stages=20) + COMMENT_SAMPLE
+    rows = []
+    for size_mb in sizes_mb:
+        text = unit * max(1, int(size_mb * 1024 * 1024 / len(unit)))
+        timings = {}
+        for name, func in (("legacy", _legacy_strip_comments), ("current", strip_comments)):
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(text)
+                samples.append(time.perf_counter() - start)
+            timings[name] = _stats(samples)
+        rows.append({
+            "megabytes": len(text) / (1024 * 1024),
+            "timings": timings,
+            "speedup": timings["legacy"]["median"] / timings["current"]["median"],
+        })
+        print(f"  strip_comments {rows[-1]['megabytes']:.1f} MiB: {rows[-1]['speedup']:.2f}x", file=sys.stderr)
+    return rows
+
+
+def benchmark_parsers(paths: List[Path], repeat: int = 3) -> List[Dict[str, Any]]:
+    """Time every parser backend on each Jenkinsfile and compare the IR they build"""
+    rows = []
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        row: Dict[str, Any] = {"file": str(path), "bytes": len(text.encode("utf-8")), "timings": {}, "stages": {}}
+        irs = {}
+        for name, parse in PARSER_BACKENDS.items():
+            samples = []
+            for _ in range(repeat):
+                try:
+                    seconds, pipeline = _time(lambda: parse(text))
+                except ValueError as e:
+                    pipeline, irs[name] = None, f"error: {e}"
+                    break
+                samples.append(seconds)
+            if pipeline is not None:
+                irs[name] = pipeline.to_dict()
+                row["timings"][name] = _stats(samples)
+                row["stages"][name] = len(list(pipeline.iter_stages()))
+        row["same_ir"] = len({json.dumps(ir, sort_keys=True) for ir in irs.values()}) == 1
+        rows.append(row)
+    return rows
+
+
+def print_parser_table(rows: List[Dict[str, Any]], out: TextIO = sys.stdout):
+    names = list(PARSER_BACKENDS)
+    header = f"{'file':<48} {'KiB':>7}" + "".join(f" {name + ' ms':>12} {'stages':>6}" for name in names) + "  same IR"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    totals = {name: 0.0 for name in names}
+    parsed_bytes = 0
+    for row in rows:
+        line = f"{Path(row['file']).name:<48} {row['bytes'] / 1024:>7.1f}"
+        for name in names:
+            if name in row["timings"]:
+                line += f" {row['timings'][name]['median'] * 1000:>12.2f} {row['stages'][name]:>6}"
+            else:
+                line += f" {'error':>12} {'-':>6}"
+        print(line + f"  {'yes' if row['same_ir'] else 'no'}", file=out)
+        if all(name in row["timings"] for name in names):
+            parsed_bytes += row["bytes"]
+            for name in names:
+                totals[name] += row["timings"][name]["median"]
+    for name in names:
+        if totals[name]:
+            print(f"{name}: {parsed_bytes / 1024 / totals[name]:.0f} KiB/s over files both backends parse", file=out)
+
+
+def check_yaml_backends(root: Path, repeat: int = 3) -> Dict[str, Any]:
+    """Re-emit every YAML file under root with the selected and the pure-Python
+    dumper; the text must be byte-identical. Also times both dumpers."""
+    paths = sorted(root.rglob("*.yml")) + sorted(root.rglob("*.yaml"))
+    documents = [load_yaml(path.read_text(encoding="utf-8")) for path in paths]
+    mismatches = []
+    for path, data in zip(paths, documents):
+        for allow_unicode in (False, True):
+            fast = dump_yaml(data, allow_unicode)
+            pure = dump_yaml(data, allow_unicode, dumper=yaml.SafeDumper)
+            if fast != pure or pure != yaml.dump(data, sort_keys=False, width=1000, default_flow_style=False,
+                                                 allow_unicode=allow_unicode):
+                mismatches.append(f"{path} (allow_unicode={allow_unicode})")
+
+    timings = {}
+    backend, dumper, _ = output_writer.yaml_classes()
+    for name, dumper in ((backend, dumper), ("pure-python", yaml.SafeDumper)):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for data in documents:
+                dump_yaml(data, dumper=dumper)
+            samples.append(time.perf_counter() - start)
+        timings[name] = _stats(samples)
+    return {"files": len(paths), "mismatches": mismatches, "timings": timings}
+
+
+# Modules `import main` must not load: they are imported when a conversion,
+# a report or a worker pool actually needs them
+LAZY_MODULES = ("converter", "yaml", "report_generator", "aggregate_report",
+                "concurrent.futures", "pipeline_grammar", "groovy_parser")
+# Modules a regex-backend conversion of one file must not load
+CONVERSION_LAZY_MODULES = ("concurrent.futures", "pipeline_grammar", "groovy_parser")
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def _importtime(code: str) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Imports made by `python -X importtime -c code`: ({module: (self us,
+    cumulative us)}, total us of top-level imports)"""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure with bytecode caches, as installed
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_DIR, env=env,
+                          capture_output=True, text=True)
+    modules: Dict[str, Tuple[int, int]] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+        if not name[1:].startswith(" "):
+            total += int(cumulative_us)
+    return modules, total
+
+
+def benchmark_startup(repeat: int = 5) -> Dict[str, Any]:
+    """Import cost of the CLI and of a one-file conversion, over the bare interpreter"""
+    with tempfile.TemporaryDirectory(prefix="gha-startup-") as tmp:
+        minimal = REPO_DIR / "test-jenkinsfiles" / "minimal-pipeline.Jenkinsfile"
+        cases = {
+            "interpreter": "pass",
+            "import main": "import main",
+            "convert one file": ("import contextlib, io, sys, main\n"
+                                 f"sys.argv = ['main.py', '-o', {tmp!r}, {str(minimal)!r}]\n"
+                                 "with contextlib.redirect_stdout(io.StringIO()):\n"
+                                 "    main.main()"),
+        }
+        _importtime(cases["convert one file"])  # write bytecode caches first
+        runs: Dict[str, List[int]] = {name: [] for name in cases}
+        imported: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        for _ in range(repeat):
+            for name, code in cases.items():
+                modules, total = _importtime(code)
+                runs[name].append(total)
+                imported[name] = modules
+
+    baseline = min(runs["interpreter"])
+    heaviest = sorted(imported["convert one file"].items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        "import_ms": {name: (min(totals) - baseline) / 1000 for name, totals in runs.items() if name != "interpreter"},
+        "eager_modules": {
+            "import main": [m for m in LAZY_MODULES if m in imported["import main"]],
+            "convert one file": [m for m in CONVERSION_LAZY_MODULES if m in imported["convert one file"]],
+        },
+        "heaviest_modules_ms": {name: self_us / 1000 for name, (self_us, _) in heaviest},
+    }
+
+
+def _edit_stage(text: str, stage: int, mark: int) -> str:
+    """text with one step added to top-level stage `stage`"""
+    start = text.index("steps {", text.index(f"stage('Stage {stage}')")) + len("steps {")
+    return f"{text[:start]}\n                sh 'echo edit {mark}'{text[start:]}"
+
+
+def benchmark_incremental(stage_counts: List[int], repeat: int = 3) -> List[Dict[str, Any]]:
+    """Conversion time after editing one stage: cold, with a warm stage cache, and without one"""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="gha-incremental-") as tmp:
+        for stages in stage_counts:
+            text = generate_pipeline(stages=stages)
+            cache = StageCache(Path(tmp) / f"stages-{stages}")
+            cold, _ = _time(lambda: convert_jenkins_to_gha(text, Path(tmp), stage_cache=cache))
+            samples: Dict[str, List[float]] = {"warm": [], "uncached": []}
+            for mark in range(repeat):
+                edited = _edit_stage(text, stages // 2, mark)
+                seconds, _ = _time(lambda: convert_jenkins_to_gha(edited, Path(tmp), stage_cache=cache))
+                samples["warm"].append(seconds)
+                seconds, _ = _time(lambda: convert_jenkins_to_gha(edited, Path(tmp)))
+                samples["uncached"].append(seconds)
+            timings = {name: _stats(values) for name, values in samples.items()}
+            rows.append({
+                "stages": stages,
+                "cold": cold,
+                "timings": timings,
+                "speedup": timings["uncached"]["median"] / timings["warm"]["median"],
+            })
+            print(f"  incremental {stages} stages: {rows[-1]['speedup']:.1f}x", file=sys.stderr)
+    return rows
+
+
+def _clear_caches():
+    """Drop per-text caches so every repetition measures a cold conversion"""
+    scan_pipeline_features.cache_clear()
+    groovy_lexer.clear_cache()
+
+
+def _time(func: Callable[[], Any]) -> Tuple[float, Any]:
+    _clear_caches()
+    with contextlib.redirect_stdout(io.StringIO()):  # converter warnings
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    return elapsed, result
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+    }
+
+
+def benchmark_pipeline(text: str, repeat: int, workdir: Path) -> Dict[str, Any]:
+    """Time each conversion phase `repeat` times on one Jenkinsfile text"""
+    samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    leaf_stages = 0
+    for _ in range(repeat):
+        seconds, pipeline = _time(lambda: parse_pipeline(text))
+        samples["parse"].append(seconds)
+        stages = list(pipeline.iter_stages())
+        leaf_stages = len(stages)
+
+        seconds, (_, action_paths) = _time(lambda: convert_jenkins_to_gha(text, workdir / "convert"))
+        samples["convert"].append(seconds)
+
+        seconds, _ = _time(lambda: save_enhanced_composite_actions(stages, workdir / "save"))
+        samples["save_actions"].append(seconds)
+
+        seconds, _ = _time(lambda: generate_conversion_report(action_paths, text))
+        samples["report"].append(seconds)
+
+    return {
+        "size": {"bytes": len(text.encode("utf-8")), "lines": text.count("\n"), "leaf_stages": leaf_stages},
+        "timings": {phase: _stats(values) for phase, values in samples.items()},
+    }
+
+
+def case_name(params: Dict[str, int]) -> str:
+    return ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def run_benchmarks(grid: Dict[str, List[int]], repeat: int = 3) -> Dict[str, Any]:
+    """Benchmark every combination of generator parameters in grid"""
+    cases = []
+    with tempfile.TemporaryDirectory(prefix="gha-bench-") as tmp:
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid, values))
+            result = benchmark_pipeline(generate_pipeline(**params), repeat, Path(tmp))
+            cases.append({"name": case_name(params), "params": params, **result})
+            print(f"  {case_name(params)}: convert {result['timings']['convert']['median']:.3f}s", file=sys.stderr)
+    return {"meta": _meta(repeat), "cases": cases}
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Phases whose median got slower than baseline by more than tolerance"""
+    previous = {case["name"]: case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in current.get("cases", []):
+        old = previous.get(case["name"])
+        if old is None:
+            continue
+        for phase in PHASES:
+            new_s = case["timings"][phase]["median"]
+            old_s = old["timings"].get(phase, {}).get("median")
+            if old_s is None:
+                continue
+            if new_s > old_s * (1 + tolerance) and new_s - old_s > NOISE_FLOOR_SECONDS:
+                regressions.append(f"{case['name']} {phase}: {old_s * 1000:.1f}ms -> {new_s * 1000:.1f}ms")
+    return regressions
+
+
+def print_table(results: Dict[str, Any], out: TextIO = sys.stdout):
+    header = f"{'case':<56} {'stages':>7} {'KiB':>8}" + "".join(f" {phase + ' ms':>16}" for phase in PHASES)
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for case in results["cases"]:
+        size = case["size"]
+        row = f"{case['name']:<56} {size['leaf_stages']:>7} {size['bytes'] / 1024:>8.1f}"
+        row += "".join(f" {case['timings'][phase]['median'] * 1000:>16.2f}" for phase in PHASES)
+        print(row, file=out)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def _meta(repeat: int) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "libyaml": bool(getattr(yaml, "__with_libyaml__", False)),
+        "yaml_backend": output_writer.yaml_backend(),
+        "converter_version": CONVERTER_VERSION,
+        "repeat": repeat,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark conversion phases on synthetic Jenkinsfiles")
+    parser.add_argument("--stages", type=_int_list, default=[10, 100, 1000], help="top-level stage counts (comma list)")
+    parser.add_argument("--parallel", type=_int_list, default=[0], help="children per parallel group, 0 = none")
+    parser.add_argument("--depth", type=_int_list, default=[1], help="nested blocks around stage steps")
+    parser.add_argument("--script-lines", type=_int_list, default=[4], help="lines per script block")
+    parser.add_argument("--credentials", type=_int_list, default=[2], help="distinct credential IDs")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per case (median is reported)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="previous --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--emit", metavar="PATH", help="write the generated Jenkinsfile for the first case and exit")
+    parser.add_argument("--strip-comments", metavar="MB", type=_float_list,
+                        help="only compare strip_comments against the legacy version on inputs of these sizes (MiB)")
+    parser.add_argument("--compare-parsers", metavar="DIR", nargs="?", const="test-jenkinsfiles",
+                        help="only time the parser backends on the Jenkinsfiles in DIR (default: test-jenkinsfiles)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only time re-converting each --stages pipeline after a one-stage edit, with the stage cache")
+    parser.add_argument("--startup", action="store_true",
+                        help="only measure CLI import time with python -X importtime and check lazy imports")
+    parser.add_argument("--startup-budget", metavar="MS", type=float, default=40.0,
+                        help="largest allowed `import main` time over the bare interpreter (default: 40 ms)")
+    parser.add_argument("--yaml-check", metavar="DIR", nargs="?", const="test-outputs",
+                        help="only check that the YAML backend re-emits every YAML file under DIR byte-identically "
+                             "to the pure-Python dumper (default: test-outputs); exits 1 on a mismatch")
+    args = parser.parse_args(argv)
+
+    grid = {
+        "stages": args.stages,
+        "parallel": args.parallel,
+        "depth": args.depth,
+        "script_lines": args.script_lines,
+        "credentials": args.credentials,
+    }
+    if args.emit:
+        Path(args.emit).write_text(generate_pipeline(**{key: values[0] for key, values in grid.items()}), encoding="utf-8")
+        return 0
+
+    # Keep stdout clean for JSON when it is the requested output
+    report_out = sys.stderr if args.json == "-" else sys.stdout
+    if args.startup:
+        results = {"meta": _meta(args.repeat), "startup": benchmark_startup(max(args.repeat, 5))}
+        startup = results["startup"]
+        for name, ms in startup["import_ms"].items():
+            print(f"{name:>18}: {ms:7.1f} ms of imports", file=report_out)
+        print("heaviest modules in a one-file conversion (self time):", file=report_out)
+        for name, ms in startup["heaviest_modules_ms"].items():
+            print(f"  {name:<32} {ms:6.1f} ms", file=report_out)
+        for name, modules in startup["eager_modules"].items():
+            if modules:
+                print(f"  {name} loads modules that should be lazy: {', '.join(modules)}", file=report_out)
+        print(f"startup budget for `import main`: {args.startup_budget:g} ms", file=report_out)
+    elif args.incremental:
+        results = {"meta": _meta(args.repeat), "incremental": benchmark_incremental(args.stages, args.repeat)}
+        print(f"{'stages':>8} {'cold ms':>10} {'edit ms':>10} {'no cache ms':>12} {'speedup':>8}", file=report_out)
+        for row in results["incremental"]:
+            print(f"{row['stages']:>8} {row['cold'] * 1000:>10.1f} {row['timings']['warm']['median'] * 1000:>10.1f} "
+                  f"{row['timings']['uncached']['median'] * 1000:>12.1f} {row['speedup']:>7.1f}x", file=report_out)
+    elif args.yaml_check:
+        results = {"meta": _meta(args.repeat), "yaml": check_yaml_backends(Path(args.yaml_check), args.repeat)}
+        check = results["yaml"]
+        for name, timing in check["timings"].items():
+            print(f"{name:>12}: {timing['median'] * 1000:8.2f} ms to dump {check['files']} file(s)", file=report_out)
+        for line in check["mismatches"]:
+            print(f"  mismatch: {line}", file=report_out)
+        print(f"{len(check['mismatches'])} mismatch(es) across {check['files']} file(s)", file=report_out)
+    elif args.compare_parsers:
+        paths = list(iter_inputs([Path(args.compare_parsers)]))
+        results = {"meta": _meta(args.repeat), "parsers": benchmark_parsers(paths, args.repeat)}
+        print_parser_table(results["parsers"], report_out)
+    elif args.strip_comments:
+        results = {"meta": _meta(args.repeat), "strip_comments": benchmark_strip_comments(args.strip_comments, args.repeat)}
+        print(f"{'MiB':>8} {'legacy ms':>12} {'current ms':>12} {'speedup':>8}", file=report_out)
+        for row in results["strip_comments"]:
+            print(f"{row['megabytes']:>8.1f} {row['timings']['legacy']['median'] * 1000:>12.1f} "
+                  f"{row['timings']['current']['median'] * 1000:>12.1f} {row['speedup']:>7.2f}x", file=report_out)
+    else:
+        results = run_benchmarks(grid, args.repeat)
+        print_table(results, report_out)
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.yaml_check and results["yaml"]["mismatches"]:
+        return 1
+    if args.startup and (results["startup"]["import_ms"]["import main"] > args.startup_budget
+                         or any(results["startup"]["eager_modules"].values())):
+        print("startup budget exceeded", file=report_out)
+        return 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_results(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:", file=report_out)
+            for line in regressions:
+                print(f"  {line}", file=report_out)
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}", file=report_out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+
+"""
+Content-hash cache for incremental Jenkinsfile conversion
+
+Whole files are cached by their text; when a file did change, its stages
+are looked up one by one, so only the edited stages are converted again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from converter import CONVERTER_VERSION
+
+
+DEFAULT_CACHE_DIRNAME = ".conversion-cache"
+# Per-stage entries live in this subdirectory of the cache
+STAGE_CACHE_DIRNAME = "stages"
+
+
+def _write_entry(path: Path, entry: Dict[str, Any]):
+    """Write a JSON cache entry via a temp file and rename, so concurrent
+    readers never see partial entries"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _read_entry(path: Path, version: str) -> Optional[Dict[str, Any]]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("version") == version else None
+
+
+class ConversionCache:
+    """On-disk cache of conversion results keyed by Jenkinsfile content.
+
+    Each entry stores the generated workflow dict, the action metadata and the
+    composite action definitions (keyed by path relative to the output dir).
+    """
+
+    def __init__(self, cache_dir: Path, version: str = CONVERTER_VERSION):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, jenkins_text: str) -> str:
+        """Hash of the Jenkinsfile text plus the converter version"""
+        digest = hashlib.sha256()
+        digest.update(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(jenkins_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = _read_entry(self._entry_path(key), self.version)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, workflow: Dict[str, Any], action_paths: List[Dict[str, Any]],
+            actions: Dict[str, Dict[str, Any]]):
+        entry = {
+            "version": self.version,
+            "workflow": workflow,
+            "action_paths": action_paths,
+            "actions": actions,
+        }
+        _write_entry(self._entry_path(key), entry)
+
+
+class StageCache:
+    """On-disk cache of per-stage parse and conversion results keyed by stage text.
+
+    The key is computed from the parser's inputs right after the stages are
+    split: stage name and raw text, the pipeline-level environment and agent
+    and the converter version (which includes the parser backend). Per key
+    there are two entries: the stage IR, so an unchanged stage is not run
+    through the extractors, and the composite action definition with its
+    rendered action.yml text and metadata. Action directory names are not
+    cached; the run's ActionStore assigns them.
+    """
+
+    def __init__(self, cache_dir: Path, version: str = CONVERTER_VERSION):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name: str, body: str, environment: Dict[str, str], agent: Dict[str, Any],
+            is_parallel_child: bool = False) -> str:
+        """Hash of a stage's raw text and the pipeline environment and agent"""
+        content = json.dumps([name, body, is_parallel_child, environment, agent], sort_keys=True, default=str)
+        digest = hashlib.sha256()
+        digest.update(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str, kind: str = "") -> Path:
+        return self.cache_dir / key[:2] / f"{key}{kind}.json"
+
+    def get_stage(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stage IR (see Stage.to_state) of a stage parsed before, or None"""
+        entry = _read_entry(self._entry_path(key, ".stage"), self.version)
+        return entry["stage"] if entry is not None else None
+
+    def put_stage(self, key: str, state: Dict[str, Any]):
+        _write_entry(self._entry_path(key, ".stage"), {"version": self.version, "stage": state})
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """(action definition, metadata, action.yml text) of a stage converted before, or None"""
+        entry = _read_entry(self._entry_path(key), self.version)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["action"], entry["metadata"], entry["rendered"]
+
+    def put(self, key: str, action_def: Dict[str, Any], metadata: Dict[str, Any], rendered: str):
+        _write_entry(self._entry_path(key), {
+            "version": self.version,
+            "action": action_def,
+            "metadata": metadata,
+            "rendered": rendered,
+        })
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -4,37 +4,86 @@ Enhanced Jenkins Declarative Pipeline -> GitHub Actions converter
 Core conversion logic with proper secrets handling
 """
 
-import re
-import yaml
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional, Set
+from typing import List, Dict, Any, Tuple, Optional, Set, Callable, TYPE_CHECKING
 
 from utils import (
-    strip_comments, find_block, sanitize_name, gha_job_id,
-    extract_unsupported_features, validate_conversion_feasibility,
-    generate_limitations_comment
-)
-from jenkins_extractors import (
-    extract_parameters, extract_global_agent, extract_env_kv,
-    split_stages, extract_stage_when_branch, extract_stage_environment,
-    extract_steps_commands, extract_stage_post, extract_pipeline_post,
-    extract_parallel, extract_stage_agent, extract_when_conditions,
-    extract_plugin_steps, extract_script_blocks
+    sanitize_name, gha_job_id, generate_limitations_comment, compact_snippet, PipelineAnalysis
 )
+from pipeline_ir import Pipeline, Stage, Agent, parse_pipeline
 from action_generator import save_enhanced_composite_actions
+from action_store import ActionStore
 from agent_mapper import map_label_to_runs_on
+from patterns import EQUALS_TRUE, EQUALS_FALSE
+from instrumentation import traced
+
+if TYPE_CHECKING:
+    from conversion_cache import StageCache
+
+
+# Bump whenever generated output changes so cached conversions are invalidated
+CONVERTER_VERSION = "2.2.2"
+
+
+def parse_pipeline_grammar(jenkins_text: str, stage_cache: Optional["StageCache"] = None) -> Pipeline:
+    """Grammar backend; groovy_parser is only imported when it is selected"""
+    from pipeline_grammar import parse_pipeline_grammar
+    return parse_pipeline_grammar(jenkins_text, stage_cache)
+
 
+# Parser backends building the pipeline IR: regexes over block text, or the
+# recursive-descent Groovy grammar (groovy_parser). Both take the Jenkinsfile
+# text and an optional StageCache of stages parsed before.
+PARSER_BACKENDS: Dict[str, Callable[..., Pipeline]] = {
+    "regex": parse_pipeline,
+    "grammar": parse_pipeline_grammar,
+}
+DEFAULT_PARSER = "regex"
 
-def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+
+def get_parser(name: str) -> Callable[..., Pipeline]:
+    """Parser backend by name (see PARSER_BACKENDS)"""
+    try:
+        return PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend '{name}' (expected one of: {', '.join(PARSER_BACKENDS)})")
+
+
+def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path("."),
+                           parser: str = DEFAULT_PARSER,
+                           stage_cache: Optional["StageCache"] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Enhanced conversion of Jenkins declarative pipeline to GitHub Actions workflow
     Returns tuple of (workflow_dict, action_paths_metadata)
+    parser selects the backend that builds the pipeline IR (see PARSER_BACKENDS).
+    With a StageCache, unchanged stages are neither parsed nor converted
+    again: their IR, composite action and metadata come from earlier
+    conversions. Its version must name the parser.
+    """
+    return convert_pipeline(get_parser(parser)(jenkins_text, stage_cache), output_dir, stage_cache=stage_cache)
+
+
+@traced("convert_pipeline")
+def convert_pipeline(pipeline: Pipeline, output_dir: Path = Path("."),
+                     deferred_writes: Optional[List[Tuple[Path, Dict[str, Any], Optional[str]]]] = None,
+                     analysis: Optional[PipelineAnalysis] = None,
+                     action_store: Optional[ActionStore] = None,
+                     stage_cache: Optional["StageCache"] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Convert a parsed pipeline (see pipeline_ir) to a GitHub Actions workflow
+    Returns tuple of (workflow_dict, action_paths_metadata)
+    Composite action writes are collected in deferred_writes when it is given.
+    Pass the file's PipelineAnalysis to share it with the reports, an
+    ActionStore to name composite actions consistently across conversions,
+    and the StageCache the pipeline was parsed with to skip stages converted
+    before. Job definitions are always rebuilt: they depend on the
+    neighbouring stages and are cheap.
     """
-    text = strip_comments(jenkins_text)
+    if analysis is None:
+        analysis = PipelineAnalysis.for_pipeline(pipeline)
 
     # Validate conversion feasibility first
-    feasibility = validate_conversion_feasibility(jenkins_text)
-    unsupported_features = extract_unsupported_features(jenkins_text)
+    feasibility = analysis.feasibility
     
     if not feasibility["can_convert"]:
         print("WARNING: Pipeline contains features that may prevent successful conversion:")
@@ -42,46 +91,24 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
             print(f"  - {blocker}")
         print("Review the conversion report for detailed guidance.")
 
-    # pipeline { ... }
-    pstart, pend = find_block(text, r"\bpipeline\b")
-    if pstart == -1:
-        raise ValueError("Not a declarative Jenkins pipeline (no 'pipeline { ... }' found).")
-    pipeline_body = text[pstart:pend]
-
-    # Extract pipeline components with enhanced error handling
-    try:
-        global_agent = extract_global_agent(pipeline_body)
-        parameters = extract_parameters(pipeline_body)
-        
-        # Global environment
-        es, ee = find_block(pipeline_body, r"\benvironment\b")
-        global_env = extract_env_kv(pipeline_body[es:ee]) if es != -1 else {}
-
-        # Stages
-        ss, se = find_block(pipeline_body, r"\bstages\b")
-        if ss == -1:
-            raise ValueError("No 'stages { ... }' found.")
-        stages_list = split_stages(pipeline_body[ss:se])
-
-        # Pipeline-level post
-        pipeline_post = extract_pipeline_post(pipeline_body)
-
-    except Exception as e:
-        raise ValueError(f"Error parsing Jenkins pipeline structure: {e}")
+    global_agent = pipeline.agent
+    parameters = pipeline.parameters
+    global_env = pipeline.environment
+    pipeline_post = pipeline.post_dict()
 
     # Determine default runs-on and container from global agent
     default_runs_on: Any = "ubuntu-latest"
     default_container: Optional[Dict[str, Any]] = None
     if global_agent:
-        if global_agent["type"] == "any":
+        if global_agent.type == "any":
             default_runs_on = "ubuntu-latest"
-        elif global_agent["type"] == "label":
-            default_runs_on = map_label_to_runs_on(global_agent["label"])
-        elif global_agent["type"] == "docker":
+        elif global_agent.type == "label":
+            default_runs_on = map_label_to_runs_on(global_agent.label)
+        elif global_agent.type == "docker":
             default_runs_on = "ubuntu-latest"
-            default_container = {"image": global_agent["image"]}
-            if "args" in global_agent:
-                default_container["options"] = global_agent["args"]
+            default_container = {"image": global_agent.image}
+            if global_agent.args is not None:
+                default_container["options"] = global_agent.args
 
     # Build workflow inputs from parameters
     workflow_inputs = {}
@@ -157,7 +184,7 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
     gha["jobs"] = {}
 
     # Collect stage information for enhanced composite actions
-    stages_info = []
+    stages_info: List[Stage] = []
     last_job_ids: List[str] = []
     prev_job_id: str = ""
 
@@ -173,7 +200,7 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
                 out[k] = v
         return out
 
-    def apply_agent_to_job(job_def: Dict[str, Any], stage_agent: Dict[str, Any]):
+    def apply_agent_to_job(job_def: Dict[str, Any], stage_agent: Optional[Agent]):
         """Apply agent configuration to job definition with proper ordering"""
         if not stage_agent:
             job_def["runs-on"] = default_runs_on
@@ -181,15 +208,15 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
                 job_def["container"] = dict(default_container)
             return
             
-        if stage_agent["type"] == "any":
+        if stage_agent.type == "any":
             job_def["runs-on"] = "ubuntu-latest"
-        elif stage_agent["type"] == "label":
-            job_def["runs-on"] = map_label_to_runs_on(stage_agent["label"])
-        elif stage_agent["type"] == "docker":
+        elif stage_agent.type == "label":
+            job_def["runs-on"] = map_label_to_runs_on(stage_agent.label)
+        elif stage_agent.type == "docker":
             job_def["runs-on"] = "ubuntu-latest"
-            job_def["container"] = {"image": stage_agent["image"]}
-            if "args" in stage_agent:
-                job_def["container"]["options"] = stage_agent["args"]
+            job_def["container"] = {"image": stage_agent.image}
+            if stage_agent.args is not None:
+                job_def["container"]["options"] = stage_agent.args
 
     def create_enhanced_job_steps(action_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create enhanced job steps with proper secrets passing"""
@@ -276,8 +303,8 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
             if "params." in expr:
                 from action_generator import convert_jenkins_variables_to_gha
                 param_expr = convert_jenkins_variables_to_gha(expr)
-                param_expr = re.sub(r'==\s*true', r'== true', param_expr)
-                param_expr = re.sub(r'==\s*false', r'== false', param_expr)
+                param_expr = EQUALS_TRUE.sub(r'== true', param_expr)
+                param_expr = EQUALS_FALSE.sub(r'== false', param_expr)
                 conditions.append(f"github.event_name == 'workflow_dispatch' && {param_expr}")
             else:
                 # Mark complex expressions for manual conversion
@@ -306,50 +333,67 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
         
         return " && ".join(conditions) if conditions else None
 
+    def add_error_job(stage: Stage, error: str):
+        """Create a basic job that requires manual attention"""
+        nonlocal last_job_ids, prev_job_id
+        print(f"WARNING: Error processing stage '{stage.name}': {error}")
+        job_id = gha_job_id(stage.name)
+        job_def = {
+            "runs-on": "ubuntu-latest",
+            "timeout-minutes": 30,
+            "steps": [
+                {"uses": "actions/checkout@v4"},
+                {
+                    "name": "Manual Conversion Required",
+                    "run": generate_limitations_comment("Stage Processing Error", f"Error: {error}"),
+                    "shell": "bash"
+                }
+            ]
+        }
+        
+        # Add job dependencies if needed
+        if last_job_ids:
+            job_def["needs"] = last_job_ids
+            last_job_ids = []
+        elif prev_job_id:
+            job_def["needs"] = prev_job_id
+        
+        gha["jobs"][job_id] = job_def
+        prev_job_id = job_id
+        
+        # Keep the stage so a (minimal) composite action is still generated
+        stage.error = error
+        stage.env, stage.agent, stage.post = {}, None, None
+        stages_info.append(stage)
+
     # Process stages with enhanced features and error handling
-    for stage in stages_list:
-        stage_name = stage["name"]
-        stage_body = stage["content"]
+    for stage in pipeline.stages:
+        stage_name = stage.name
 
         try:
+            if stage.error:
+                raise ValueError(stage.error)
+
             # Handle parallel stages
-            parallel_substages = extract_parallel(stage_body)
-            if parallel_substages:
+            if stage.parallel:
                 upstream = prev_job_id or (last_job_ids[-1] if last_job_ids else None)
                 parallel_ids = []
                 
-                for sub in parallel_substages:
-                    sub_name = sub["name"]
-                    sub_body = sub["content"]
-                    job_id = gha_job_id(sub_name)
+                for sub in stage.parallel:
+                    if sub.error:
+                        raise ValueError(sub.error)
+                    job_id = gha_job_id(sub.name)
                     parallel_ids.append(job_id)
 
-                    stage_agent = extract_stage_agent(sub_body)
-                    stage_env_raw = extract_stage_environment(sub_body)
-                    job_env = compute_job_env(stage_env_raw)
-                    when_conditions = extract_when_conditions(sub_body)
-                    if_cond = create_when_condition(when_conditions)
-                    post_info = extract_stage_post(sub_body)
+                    job_env = compute_job_env(sub.env)
+                    if_cond = create_when_condition(sub.when)
 
-                    # Check for unsupported features in this stage
-                    plugin_steps = extract_plugin_steps(sub_body)
-                    script_blocks = extract_script_blocks(sub_body)
-                    
                     # Add to stages info for enhanced composite action generation
-                    stages_info.append({
-                        "name": sub_name,
-                        "body": sub_body,
-                        "env": stage_env_raw,
-                        "agent": stage_agent,
-                        "post": post_info,
-                        "is_parallel_child": True,
-                        "plugin_steps": plugin_steps,
-                        "script_blocks": script_blocks
-                    })
+                    stages_info.append(sub)
 
                     # Create job definition with proper ordering
                     job_def: Dict[str, Any] = {}
-                    apply_agent_to_job(job_def, stage_agent)
+                    apply_agent_to_job(job_def, sub.agent)
                     
                     if job_env:
                         job_def["env"] = job_env
@@ -372,32 +416,15 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
 
             # Handle sequential stages
             job_id = gha_job_id(stage_name)
-            stage_agent = extract_stage_agent(stage_body)
-            stage_env_raw = extract_stage_environment(stage_body)
-            job_env = compute_job_env(stage_env_raw)
-            when_conditions = extract_when_conditions(stage_body)
-            if_cond = create_when_condition(when_conditions)
-            post_info = extract_stage_post(stage_body)
-
-            # Check for unsupported features in this stage
-            plugin_steps = extract_plugin_steps(stage_body)
-            script_blocks = extract_script_blocks(stage_body)
+            job_env = compute_job_env(stage.env)
+            if_cond = create_when_condition(stage.when)
 
             # Add to stages info for enhanced composite action generation
-            stages_info.append({
-                "name": stage_name,
-                "body": stage_body,
-                "env": stage_env_raw,
-                "agent": stage_agent,
-                "post": post_info,
-                "is_parallel_child": False,
-                "plugin_steps": plugin_steps,
-                "script_blocks": script_blocks
-            })
+            stages_info.append(stage)
 
             # Create job definition with proper ordering
             job_def: Dict[str, Any] = {}
-            apply_agent_to_job(job_def, stage_agent)
+            apply_agent_to_job(job_def, stage.agent)
             
             if job_env:
                 job_def["env"] = job_env
@@ -432,55 +459,20 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
             prev_job_id = job_id
 
         except Exception as e:
-            print(f"WARNING: Error processing stage '{stage_name}': {e}")
-            # Create a basic job that requires manual attention
-            job_id = gha_job_id(stage_name)
-            job_def = {
-                "runs-on": "ubuntu-latest",
-                "timeout-minutes": 30,
-                "steps": [
-                    {"uses": "actions/checkout@v4"},
-                    {
-                        "name": "Manual Conversion Required",
-                        "run": generate_limitations_comment("Stage Processing Error", f"Error: {e}"),
-                        "shell": "bash"
-                    }
-                ]
-            }
-            
-            # Add job dependencies if needed
-            if last_job_ids:
-                job_def["needs"] = last_job_ids
-                last_job_ids = []
-            elif prev_job_id:
-                job_def["needs"] = prev_job_id
-            
-            gha["jobs"][job_id] = job_def
-            prev_job_id = job_id
-            
-            # Add minimal stage info
-            stages_info.append({
-                "name": stage_name,
-                "body": stage_body,
-                "env": {},
-                "agent": {},
-                "post": {},
-                "conversion_error": str(e),
-                "manual_conversion_needed": ["Complete stage conversion due to parsing error"]
-            })
+            add_error_job(stage, str(e))
 
     # Generate enhanced composite actions with error handling
     try:
-        action_paths = save_enhanced_composite_actions(stages_info, output_dir)
+        action_paths = save_enhanced_composite_actions(stages_info, output_dir, deferred_writes, action_store, stage_cache)
     except Exception as e:
         print(f"WARNING: Error generating composite actions: {e}")
         # Create fallback action paths
         action_paths = []
         for stage_info in stages_info:
             action_paths.append({
-                "name": stage_info["name"],
-                "path": f"./.github/actions/{sanitize_name(stage_info['name'].lower())}",
-                "env": stage_info.get("env", {}),
+                "name": stage_info.name,
+                "path": f"./.github/actions/{sanitize_name(stage_info.name.lower())}",
+                "env": stage_info.env,
                 "required_secrets": [],
                 "conversion_error": "Failed to generate composite action",
                 "manual_conversion_needed": ["Complete stage conversion"]
@@ -620,7 +612,7 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
                         post_job_steps.append({
                             "name": f"Extended email notification ({kind}) - MANUAL CONVERSION REQUIRED",
                             "if": gha_condition,
-                            "run": generate_limitations_comment("EmailExt Plugin", pdata["emailext"]),
+                            "run": generate_limitations_comment("EmailExt Plugin", compact_snippet(pdata["emailext"])),
                             "shell": "bash"
                         })
                     
@@ -628,7 +620,7 @@ def convert_jenkins_to_gha(jenkins_text: str, output_dir: Path = Path(".")) -> T
                         post_job_steps.append({
                             "name": f"Publish HTML ({kind}) - MANUAL CONVERSION REQUIRED",
                             "if": gha_condition,
-                            "run": generate_limitations_comment("PublishHTML Plugin", pdata["publishHTML"]),
+                            "run": generate_limitations_comment("PublishHTML Plugin", compact_snippet(pdata["publishHTML"])),
                             "shell": "bash"
                         })
             
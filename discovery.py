@@ -0,0 +1,98 @@
+"""
+Streaming discovery of Jenkinsfiles
+
+Directories are walked recursively with os.scandir and matching files are
+yielded as soon as they are found, so conversion starts before a large
+checkout has been fully scanned. File names are matched against include
+globs; exclude globs skip files and prune whole directories. A file
+reached more than once (through a symlink, overlapping inputs or a repeated
+argument) is yielded only the first time.
+"""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Set, Union
+
+
+# File name globs treated as Jenkinsfiles (case-sensitive)
+DEFAULT_INCLUDE = ("*.Jenkinsfile", "*jenkinsfile*", "Jenkinsfile*")
+# Directories never searched: VCS metadata, dependencies and our own cache
+DEFAULT_EXCLUDE = (".git", ".hg", ".svn", "node_modules", ".conversion-cache")
+
+FileKey = Union[tuple, str]
+
+
+def _matches(patterns: Sequence[str], *names: str) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns for name in names)
+
+
+def file_key(path: Union[str, Path], st: os.stat_result) -> FileKey:
+    """Identity of a file: device and inode, or the real path where the
+    platform reports no inode numbers"""
+    if st.st_ino:
+        return (st.st_dev, st.st_ino)
+    return os.path.normcase(os.path.realpath(path))
+
+
+def _first_visit(path: Union[str, Path], st: os.stat_result, seen: Set[FileKey]) -> bool:
+    key = file_key(path, st)
+    if key in seen:
+        return False
+    seen.add(key)
+    return True
+
+
+def iter_jenkinsfiles(root: Path, include: Sequence[str] = DEFAULT_INCLUDE, exclude: Sequence[str] = (),
+                      seen: Optional[Set[FileKey]] = None) -> Iterator[Path]:
+    """Jenkinsfiles under root, depth first in name order.
+
+    Include globs are matched against file names; exclude globs against
+    names and paths relative to root (e.g. "vendor", "*/legacy/*").
+    Symlinked directories are not followed; symlinked files are, and count
+    as the file they point to.
+    """
+    seen = set() if seen is None else seen
+    exclude = (*DEFAULT_EXCLUDE, *exclude)
+    stack = [(os.fspath(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+            if _matches(exclude, entry.name, rel_path):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, rel_path + "/"))
+                    continue
+                wanted = (entry.is_file() and _matches(include, entry.name)
+                          and _first_visit(entry.path, entry.stat(), seen))
+            except OSError:
+                continue
+            if wanted:
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def iter_inputs(paths: Iterable[Path], include: Sequence[str] = DEFAULT_INCLUDE,
+                exclude: Sequence[str] = ()) -> Iterator[Path]:
+    """Files named directly plus Jenkinsfiles found under directories, each once"""
+    seen: Set[FileKey] = set()
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from iter_jenkinsfiles(path, include, exclude, seen)
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            yield path  # reported when it is read
+            continue
+        if _first_visit(path, st, seen):
+            yield path
@@ -0,0 +1,428 @@
+
+"""
+Single-pass Groovy-aware lexer and block tree for Jenkinsfile parsing
+"""
+
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Iterator, Pattern, Tuple, Union
+
+
+# Token kinds
+COMMENT = "comment"
+STRING = "string"
+GSTRING = "gstring"
+LBRACE = "{"
+RBRACE = "}"
+LPAREN = "("
+RPAREN = ")"
+LBRACKET = "["
+RBRACKET = "]"
+
+Token = namedtuple("Token", ["kind", "start", "end"])
+
+# Everything that is not a string, comment or bracket is skipped in large runs,
+# so the Python-level loop only runs once per structurally relevant token.
+_SKIP_RE = re.compile(r"[^'\"/{}()\[\]$]+")
+# Code and the literals that may contain comment markers, up to the next
+# comment, for iter_comments. One match skips everything before a comment
+# (a quote that opens no complete literal is skipped on its own); literal
+# bodies are unrolled into runs of plain characters and the possessive
+# repeats never backtrack into literals already matched.
+# Interpolated GStrings the regex cannot delimit (nested braces or quotes)
+# end the match and fall back to _scan_gstring.
+_COMMENT_OR_LITERAL_RE = re.compile(r"(?:" + "|".join([
+    r"[^'\"/$]++",
+    r"/(?![/*])",
+    r"\$(?!/)",
+    r"'''[^\\']*+(?:(?:\\(?s:.)|'(?!''))[^\\']*+)*+(?:'''|\Z)",
+    r"'(?='')",
+    r"'[^\\'\n]*+(?:\\.[^\\'\n]*+)*+(?:'|$)",
+    r"\$/(?s:.*?)(?:/\$|\Z)",
+    r'"""[^\\"$]*+(?:(?:\\(?s:.)|\$(?!\{)|\$\{[^{}\'"]*\}|"(?!""))[^\\"$]*+)*+"""',
+    r'"(?!"")[^\\"$\n]*+(?:(?:\\.|\$(?!\{)|\$\{[^{}\'"\n]*\})[^\\"$\n]*+)*+"',
+    r"'",
+]) + r")*+(?:(?P<comment>//[^\n]*|/\*(?s:.*?)(?:\*/|\Z))|(?P<gstring>\"))", re.MULTILINE)
+_LINE_COMMENT_RE = re.compile(r"//[^\n]*")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?(?:\*/|\Z)", re.DOTALL)
+_TRIPLE_SINGLE_RE = re.compile(r"'''(?:\\.|[^\\])*?(?:'''|\Z)", re.DOTALL)
+_SINGLE_RE = re.compile(r"'(?:\\.|[^\\'\n])*(?:'|$)", re.MULTILINE)
+_DOLLAR_SLASHY_RE = re.compile(r"\$/.*?(?:/\$|\Z)", re.DOTALL)
+# Fast paths for GStrings without ${...} interpolation
+_SIMPLE_DOUBLE_RE = re.compile(r"\"(?:\\.|[^\\\"$\n]|\$(?!\{))*\"")
+_SIMPLE_TRIPLE_DOUBLE_RE = re.compile(r"\"\"\"(?:\\.|[^\\\"$]|\$(?!\{)|\"(?!\"\"))*\"\"\"", re.DOTALL)
+
+_BRACKETS = {"{": LBRACE, "}": RBRACE, "(": LPAREN, ")": RPAREN, "[": LBRACKET, "]": RBRACKET}
+_CLOSERS = {RBRACE: LBRACE, RPAREN: LPAREN, RBRACKET: LBRACKET}
+_STAGE_LABEL_RE = re.compile(r"\s*['\"]([^'\"]+)['\"]\s*")
+
+
+def _simple_gstring_end(text: str, pos: int) -> Optional[int]:
+    """End offset of the GString at pos if it has no ${...} interpolation"""
+    m = (_SIMPLE_TRIPLE_DOUBLE_RE if text.startswith('"""', pos) else _SIMPLE_DOUBLE_RE).match(text, pos)
+    return m.end() if m else None
+
+
+def _scan_gstring(text: str, pos: int) -> int:
+    """Return the end offset of the double-quoted GString starting at pos.
+
+    GStrings nest through ${...} interpolations, so the scan keeps a stack of
+    [quote, brace depth] frames (quote is None inside an interpolation)
+    instead of recursing; nesting depth is not bounded by the call stack.
+    """
+    end = _simple_gstring_end(text, pos)
+    if end is not None:
+        return end
+
+    quote = '"""' if text.startswith('"""', pos) else '"'
+    stack = [[quote, 0]]
+    i = pos + len(quote)
+    n = len(text)
+    while i < n:
+        frame = stack[-1]
+        quote = frame[0]
+        if quote is None:
+            # Inside ${...}: track braces, skip nested literals
+            m = _SKIP_RE.match(text, i)
+            if m:
+                i = m.end()
+                continue
+            c = text[i]
+            if c == "{":
+                frame[1] += 1
+                i += 1
+            elif c == "}":
+                if frame[1] == 0:
+                    stack.pop()
+                else:
+                    frame[1] -= 1
+                i += 1
+            elif c == '"':
+                end = _simple_gstring_end(text, i)
+                if end is not None:
+                    i = end
+                else:
+                    quote = '"""' if text.startswith('"""', i) else '"'
+                    stack.append([quote, 0])
+                    i += len(quote)
+            elif c == "'":
+                m = (_TRIPLE_SINGLE_RE if text.startswith("'''", i) else _SINGLE_RE).match(text, i)
+                i = m.end() if m and m.end() > i else i + 1
+            else:
+                i += 1
+            continue
+        c = text[i]
+        if c == "\\":
+            i += 2
+        elif c == "$" and text.startswith("${", i):
+            stack.append([None, 0])
+            i += 2
+        elif text.startswith(quote, i):
+            i += len(quote)
+            stack.pop()
+            if not stack:
+                return i
+        elif c == "\n" and len(quote) == 1:
+            # Unterminated "...": ends at the line break
+            stack.pop()
+            if not stack:
+                return i
+        else:
+            i += 1
+    return n
+
+
+def scan_string(text: str, pos: int) -> int:
+    """Return the end offset of the string literal (quoted, triple-quoted,
+    GString or dollar-slashy) starting at pos"""
+    c = text[pos]
+    if c == '"':
+        return _scan_gstring(text, pos)
+    if c == "'":
+        m = (_TRIPLE_SINGLE_RE if text.startswith("'''", pos) else _SINGLE_RE).match(text, pos)
+        return m.end() if m and m.end() > pos else pos + 1
+    if text.startswith("$/", pos):
+        return _DOLLAR_SLASHY_RE.match(text, pos).end()
+    raise ValueError(f"No string literal at offset {pos}")
+
+
+def tokenize(text: str) -> List[Token]:
+    """Tokenize Groovy source into strings, comments and bracket tokens.
+
+    Whitespace, identifiers and operators are skipped; they are recovered from
+    offsets when needed, which keeps the scan close to a single C-level pass.
+    """
+    tokens: List[Token] = []
+    append = tokens.append
+    n = len(text)
+    i = 0
+    while i < n:
+        m = _SKIP_RE.match(text, i)
+        if m:
+            i = m.end()
+            if i >= n:
+                break
+        c = text[i]
+        kind = _BRACKETS.get(c)
+        if kind is not None:
+            append(Token(kind, i, i + 1))
+            i += 1
+        elif c == "/":
+            if text.startswith("//", i):
+                end = _LINE_COMMENT_RE.match(text, i).end()
+                append(Token(COMMENT, i, end))
+                i = end
+            elif text.startswith("/*", i):
+                end = _BLOCK_COMMENT_RE.match(text, i).end()
+                append(Token(COMMENT, i, end))
+                i = end
+            else:
+                i += 1
+        elif c == '"':
+            end = _scan_gstring(text, i)
+            append(Token(GSTRING, i, end))
+            i = end
+        elif c == "'":
+            m = (_TRIPLE_SINGLE_RE if text.startswith("'''", i) else _SINGLE_RE).match(text, i)
+            end = m.end() if m and m.end() > i else i + 1
+            append(Token(STRING, i, end))
+            i = end
+        elif c == "$" and text.startswith("$/", i):
+            end = _DOLLAR_SLASHY_RE.match(text, i).end()
+            append(Token(GSTRING, i, end))
+            i = end
+        else:
+            i += 1
+    return tokens
+
+
+def iter_comments(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of // and /* */ comments in one pass.
+
+    String literals (quoted, triple-quoted, GStrings with interpolation and
+    dollar-slashy strings) are skipped, so comment markers inside them are
+    not mistaken for comments. Only text[start:end] is scanned.
+    """
+    pos = start
+    if end is None:
+        end = len(text)
+    while True:
+        m = _COMMENT_OR_LITERAL_RE.match(text, pos, end)
+        if m is None:
+            return
+        if m.lastgroup == "comment":
+            yield m.span("comment")
+            pos = m.end()
+        else:
+            # Interpolation too complex for the regex: scan it and resume after it
+            pos = max(_scan_gstring(text, m.start("gstring")), m.end())
+
+
+def _identifier_before(text: str, pos: int) -> Optional[str]:
+    """Return the identifier ending just before pos (ignoring whitespace)"""
+    j = pos - 1
+    while j >= 0 and text[j].isspace():
+        j -= 1
+    end = j + 1
+    while j >= 0 and (text[j].isalnum() or text[j] in "_$"):
+        j -= 1
+    if j + 1 == end:
+        return None
+    return text[j + 1:end]
+
+
+class BlockNode:
+    """A { ... } block with its header and offsets into the source text"""
+
+    __slots__ = ("head", "name", "args", "open", "close", "children", "parent")
+
+    def __init__(self, head: Optional[str], name: Optional[str], args: Optional[str], open_pos: int):
+        self.head = head        # identifier directly before '{' (e.g. 'stages')
+        self.name = name        # call name before '(...)' or '[...]' (e.g. 'stage')
+        self.args = args        # raw text inside the call parentheses/brackets
+        self.open = open_pos    # offset of '{'
+        self.close = -1         # offset of the matching '}'
+        self.children: List["BlockNode"] = []
+        self.parent: Optional["BlockNode"] = None
+
+    @property
+    def start(self) -> int:
+        """Offset of the first character inside the block"""
+        return self.open + 1
+
+    @property
+    def end(self) -> int:
+        """Offset of the closing brace (exclusive end of the content)"""
+        return self.close
+
+    @property
+    def label(self) -> Optional[str]:
+        """String literal argument, e.g. the stage name in stage('Build') { ... }"""
+        if self.args is None:
+            return None
+        m = _STAGE_LABEL_RE.fullmatch(self.args)
+        return m.group(1) if m else None
+
+    def __repr__(self) -> str:
+        return f"BlockNode(head={self.head!r}, name={self.name!r}, open={self.open}, close={self.close})"
+
+
+class BlockTree:
+    """Block tree for a piece of Groovy source, built from a single token pass"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.roots: List[BlockNode] = []
+        self.nodes: List[BlockNode] = []   # closed blocks in document order
+        self._build()
+        self._opens = [node.open for node in self.nodes]
+
+    def _build(self):
+        text = self.text
+        stack: List[BlockNode] = []
+        groups: List[int] = []             # offsets of open '(' / '['
+        last_group = (-1, -1)              # (close offset, open offset) of the last ')' or ']'
+        opened: List[BlockNode] = []
+
+        for kind, start, _ in self.tokens:
+            if kind == LPAREN or kind == LBRACKET:
+                groups.append(start)
+            elif kind == RPAREN or kind == RBRACKET:
+                if groups:
+                    last_group = (start, groups.pop())
+            elif kind == LBRACE:
+                head = name = args = None
+                j = start - 1
+                while j >= 0 and text[j].isspace():
+                    j -= 1
+                if j >= 0 and j == last_group[0]:
+                    group_open = last_group[1]
+                    name = _identifier_before(text, group_open)
+                    args = text[group_open + 1:j]
+                else:
+                    head = _identifier_before(text, start)
+                node = BlockNode(head, name, args, start)
+                if stack:
+                    node.parent = stack[-1]
+                stack.append(node)
+                opened.append(node)
+            elif kind == RBRACE:
+                if stack:
+                    node = stack.pop()
+                    node.close = start
+                    if node.parent is None:
+                        self.roots.append(node)
+                    else:
+                        node.parent.children.append(node)
+
+        # Unclosed blocks are dropped, like the brace counter in find_block did
+        self.nodes = [node for node in opened if node.close != -1]
+
+    def _range(self, start: int, end: Optional[int]) -> Iterator[BlockNode]:
+        """Closed blocks fully contained in [start, end), in document order"""
+        if end is None:
+            end = len(self.text)
+        for idx in range(bisect_left(self._opens, start), len(self.nodes)):
+            node = self.nodes[idx]
+            if node.open >= end:
+                break
+            if node.close < end:
+                yield node
+
+    def find(self, pattern: Union[str, Pattern], start: int = 0, end: Optional[int] = None) -> Optional[BlockNode]:
+        """First block whose header identifier fully matches pattern"""
+        regex = _compile(pattern) if isinstance(pattern, str) else pattern
+        for node in self._range(start, end):
+            if node.head is not None and regex.fullmatch(node.head):
+                return node
+        return None
+
+    def stages(self, start: int = 0, end: Optional[int] = None) -> List[BlockNode]:
+        """Outermost stage('name') { ... } blocks within [start, end)"""
+        result = []
+        skip_until = -1
+        for node in self._range(start, end):
+            if node.open < skip_until:
+                continue
+            if node.name == "stage" and node.label is not None:
+                result.append(node)
+                skip_until = node.close
+        return result
+
+
+class SourceView:
+    """A [start, end) window on a source text.
+
+    Regexes run against the window through pos/endpos, and nested blocks are
+    looked up in the block tree of the whole text, so narrowing a view never
+    copies. str(view) materializes the window when a string is needed.
+    """
+
+    __slots__ = ("text", "start", "end")
+
+    def __init__(self, text: str, start: int = 0, end: Optional[int] = None):
+        self.text = text
+        self.start = start
+        self.end = len(text) if end is None else end
+
+    @classmethod
+    def of(cls, source: "Source") -> "SourceView":
+        """Wrap a plain string in a view (views are returned unchanged)"""
+        return source if isinstance(source, SourceView) else cls(source)
+
+    def __str__(self) -> str:
+        if self.start == 0 and self.end == len(self.text):
+            return self.text
+        return self.text[self.start:self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"SourceView(start={self.start}, end={self.end})"
+
+    def search(self, pattern: Pattern) -> Optional["re.Match"]:
+        return pattern.search(self.text, self.start, self.end)
+
+    def finditer(self, pattern: Pattern) -> Iterator["re.Match"]:
+        return pattern.finditer(self.text, self.start, self.end)
+
+    def findall(self, pattern: Pattern) -> List[Any]:
+        return pattern.findall(self.text, self.start, self.end)
+
+    def block(self, pattern: Union[str, Pattern]) -> Optional["SourceView"]:
+        """Content of the first { ... } block in this view whose header matches pattern"""
+        node = parse_blocks(self.text).find(pattern, self.start, self.end)
+        if node is None:
+            return None
+        return SourceView(self.text, node.start, node.end)
+
+    def stages(self) -> List[Tuple[str, "SourceView"]]:
+        """(name, body) of the outermost stage('name') { ... } blocks in this view"""
+        nodes = parse_blocks(self.text).stages(self.start, self.end)
+        return [(node.label, SourceView(self.text, node.start, node.end)) for node in nodes]
+
+    def has_comments(self) -> bool:
+        return next(iter_comments(self.text, self.start, self.end), None) is not None
+
+
+Source = Union[str, SourceView]
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=256)
+def parse_blocks(text: str) -> BlockTree:
+    """Tokenize text once and return its (cached) block tree"""
+    return BlockTree(text)
+
+
+def clear_cache():
+    """Drop cached block trees (e.g. between large batch conversions)"""
+    parse_blocks.cache_clear()
@@ -0,0 +1,720 @@
+
+"""
+Recursive-descent parser for the Groovy subset used in Jenkinsfiles
+
+Builds a small syntax tree of calls, closures, literals and assignments with
+offsets into the source, so nested constructs (closures inside calls inside
+lists, named arguments in any order) come from the grammar instead of
+brace-counting regexes. Code the converter does not interpret (conditions,
+arithmetic, control flow) is kept as generic Expr nodes whose nested calls
+stay reachable through iter_calls().
+
+    nodes = parse_groovy(text)
+    for call in iter_calls(nodes):
+        print(call.name, call.arg(0))
+"""
+
+import re
+from collections import namedtuple
+from typing import List, Dict, Optional, Iterator, Iterable
+
+from groovy_lexer import scan_string
+
+
+class GroovySyntaxError(ValueError):
+    """Source the grammar cannot parse; the message carries line and column"""
+
+    def __init__(self, message: str, text: str, pos: int):
+        self.line = text.count("\n", 0, pos) + 1
+        self.column = pos - (text.rfind("\n", 0, pos) + 1) + 1
+        super().__init__(f"line {self.line}, column {self.column}: {message}")
+
+
+# ---------------------------------------------------------------------------
+# Lexer
+# ---------------------------------------------------------------------------
+
+# Token kinds
+NAME = "name"
+STRING = "string"
+NUMBER = "number"
+OP = "op"
+NEWLINE = "newline"
+EOF = "eof"
+
+Token = namedtuple("Token", ["kind", "value", "start", "end"])
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>[ \t\f\r]+|\\\r?\n)
+  | (?P<newline>\n|;)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>['"]|\$/)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<op>\?\.|\*\.|\.&|\.@|\?:|->|\.\.<|\.\.|==~|=~|<=>|===|!==|==|!=|<=|>=|&&|\|\||\+\+|--
+          |<<=|>>=|<<|>>>|>>|\*\*|[-+*/%&|^]=|[-+*/%=<>!&|^~?:.,(){}\[\]@])
+""", re.VERBOSE | re.DOTALL)
+_SLASHY_RE = re.compile(r"/(?:\\.|[^/\\\n])+/")
+
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+_CLOSERS = {")", "]", "}"}
+# After these tokens a '/' starts a slashy string rather than a division
+_SLASHY_AFTER = {"(", "[", "{", ",", "=", "==", "!=", "=~", "==~", "~", ":", "!", "&&", "||", "?", "+"}
+_SLASHY_AFTER_NAMES = {"return", "case", "in"}
+
+
+def _slashy_allowed(tokens: List[Token]) -> bool:
+    if not tokens:
+        return True
+    last = tokens[-1]
+    if last.kind == NEWLINE:
+        return True
+    if last.kind == OP:
+        return last.value in _SLASHY_AFTER
+    return last.kind == NAME and last.value in _SLASHY_AFTER_NAMES
+
+
+def lex(text: str) -> List[Token]:
+    """Split Groovy source into tokens, dropping whitespace and comments.
+
+    Newlines end statements only at the top level and directly inside braces;
+    inside ( ) and [ ] they are skipped, as in Groovy.
+    """
+    tokens: List[Token] = []
+    append = tokens.append
+    stack: List[str] = []
+    match = _TOKEN_RE.match
+    n = len(text)
+    pos = 0
+    while pos < n:
+        m = match(text, pos)
+        if m is None:
+            raise GroovySyntaxError(f"unexpected character {text[pos]!r}", text, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind == "newline":
+            if (not stack or stack[-1] == "{") and tokens and tokens[-1].kind != NEWLINE:
+                append(Token(NEWLINE, "\n", pos, end))
+        elif kind == "string":
+            end = scan_string(text, pos)
+            append(Token(STRING, text[pos:end], pos, end))
+        elif kind == "op":
+            value = m.group()
+            slashy = _SLASHY_RE.match(text, pos) if value == "/" and _slashy_allowed(tokens) else None
+            if slashy:
+                end = slashy.end()
+                append(Token(STRING, slashy.group(), pos, end))
+            else:
+                if value in _OPENERS:
+                    stack.append(value)
+                elif value in _CLOSERS and stack:
+                    stack.pop()
+                append(Token(OP, value, pos, end))
+        elif kind == "name":
+            append(Token(NAME, m.group(), pos, end))
+        elif kind == "number":
+            append(Token(NUMBER, m.group(), pos, end))
+        pos = end
+    append(Token(EOF, "", n, n))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Syntax tree
+# ---------------------------------------------------------------------------
+
+class Node:
+    """Base class; every node covers text[start:end]"""
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+    def children(self) -> List["Node"]:
+        return []
+
+
+class Atom(Node):
+    """Identifier, dotted property path, number or keyword literal"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str, start: int, end: int):
+        super().__init__(start, end)
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Atom({self.value!r})"
+
+
+class Str(Node):
+    """String literal; value is the raw text between the delimiters"""
+
+    __slots__ = ("value", "quote")
+
+    def __init__(self, value: str, quote: str, start: int, end: int):
+        super().__init__(start, end)
+        self.value = value
+        self.quote = quote
+
+    @property
+    def triple(self) -> bool:
+        return len(self.quote) == 3
+
+    def __repr__(self) -> str:
+        return f"Str({self.value!r})"
+
+
+class ListExpr(Node):
+    """[a, b, ...] list literal"""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Node], start: int, end: int):
+        super().__init__(start, end)
+        self.items = items
+
+    def children(self) -> List[Node]:
+        return self.items
+
+
+class MapExpr(Node):
+    """[key: value, ...] map literal"""
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: Dict[str, Node], start: int, end: int):
+        super().__init__(start, end)
+        self.entries = entries
+
+    def children(self) -> List[Node]:
+        return list(self.entries.values())
+
+
+class Closure(Node):
+    """{ ... } block or closure; start/end delimit the content between the braces"""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body: List[Node], start: int, end: int):
+        super().__init__(start, end)
+        self.body = body
+
+    def children(self) -> List[Node]:
+        return self.body
+
+    def calls(self) -> Iterator["Call"]:
+        """Calls made directly in this block (not nested inside other calls)"""
+        return (node for node in self.body if isinstance(node, Call))
+
+    def assignments(self) -> Iterator["Assign"]:
+        return (node for node in self.body if isinstance(node, Assign))
+
+
+class Call(Node):
+    """Method call, with or without parentheses, and its trailing closure.
+
+    name is the dotted path of the callee ('sh', 'docker.withRegistry'); for
+    calls on a computed receiver such as sh(...).trim() it is the method name
+    and receiver holds the receiver expression.
+    """
+
+    __slots__ = ("name", "receiver", "args", "named", "closure")
+
+    def __init__(self, name: str, receiver: Optional[Node], args: List[Node],
+                 named: Dict[str, Node], closure: Optional[Closure], start: int, end: int):
+        super().__init__(start, end)
+        self.name = name
+        self.receiver = receiver
+        self.args = args
+        self.named = named
+        self.closure = closure
+
+    def children(self) -> List[Node]:
+        nodes = [self.receiver] if self.receiver is not None else []
+        nodes.extend(self.args)
+        nodes.extend(self.named.values())
+        if self.closure is not None:
+            nodes.append(self.closure)
+        return nodes
+
+    def arg(self, index: int) -> Optional[Node]:
+        return self.args[index] if index < len(self.args) else None
+
+    def __repr__(self) -> str:
+        return f"Call({self.name!r}, args={self.args!r}, named={list(self.named)!r})"
+
+
+class Assign(Node):
+    """target = value (also compound assignments such as +=)"""
+
+    __slots__ = ("target", "value")
+
+    def __init__(self, target: Node, value: Node, start: int, end: int):
+        super().__init__(start, end)
+        self.target = target
+        self.value = value
+
+    def children(self) -> List[Node]:
+        return [self.target, self.value]
+
+
+class Expr(Node):
+    """Any other expression or statement (operators, if/for/try, ...)"""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: List[Node], start: int, end: int):
+        super().__init__(start, end)
+        self.parts = parts
+
+    def children(self) -> List[Node]:
+        return self.parts
+
+
+def iter_calls(nodes: Iterable[Node]) -> Iterator[Call]:
+    """Every Call in nodes and below, in document order"""
+    stack = list(nodes)[::-1]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Call):
+            yield node
+        stack.extend(reversed(node.children()))
+
+
+def string_value(node: Optional[Node]) -> Optional[str]:
+    """Value of a string literal node (None for anything else)"""
+    return node.value if isinstance(node, Str) else None
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+_BINARY_OPS = {
+    "+", "-", "*", "/", "%", "**", "==", "!=", "<", ">", "<=", ">=", "<=>", "===", "!==",
+    "&&", "||", "&", "|", "^", "<<", ">>", ">>>", "=~", "==~", "..", "..<", "?:",
+}
+_BINARY_NAMES = {"in", "instanceof", "as"}
+_ASSIGN_OPS = {"=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "<<=", ">>="}
+_PREFIX_OPS = {"!", "-", "+", "~", "++", "--"}
+_MEMBER_OPS = {".", "?.", "*.", ".&", ".@"}
+_MODIFIERS = {"def", "final", "static", "private", "public", "protected"}
+_PAREN_STATEMENTS = {"if", "while", "switch", "synchronized"}
+# Names that never start a command argument (they continue an expression)
+_NOT_ARGUMENTS = _BINARY_NAMES | {"else", "catch", "finally"}
+
+
+class Parser:
+    """Recursive-descent parser over the token list of one source text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = lex(text)
+        # Lookahead past the end (at most two tokens) keeps returning EOF
+        self.tokens.extend(self.tokens[-1:] * 2)
+        self.pos = 0
+
+    # -- token helpers ------------------------------------------------------
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[self.pos + offset]
+
+    def advance(self) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.kind != EOF:
+            self.pos += 1
+        return tok
+
+    def at(self, value: str, offset: int = 0) -> bool:
+        tok = self.peek(offset)
+        return tok.kind == OP and tok.value == value
+
+    def expect(self, value: str) -> Token:
+        if not self.at(value):
+            tok = self.peek()
+            found = tok.value if tok.kind != EOF else "end of input"
+            raise GroovySyntaxError(f"expected {value!r}, found {found!r}", self.text, tok.start)
+        return self.advance()
+
+    def skip_newlines(self):
+        while self.peek().kind == NEWLINE:
+            self.pos += 1
+
+    def error(self, message: str) -> GroovySyntaxError:
+        return GroovySyntaxError(message, self.text, self.peek().start)
+
+    # -- statements ---------------------------------------------------------
+
+    def parse(self) -> List[Node]:
+        nodes = self.statements()
+        if self.peek().kind != EOF:
+            raise self.error(f"unexpected {self.peek().value!r}")
+        return nodes
+
+    def statements(self) -> List[Node]:
+        """Statements up to a closing '}' or the end of input"""
+        nodes = []
+        while True:
+            self.skip_newlines()
+            tok = self.peek()
+            if tok.kind == EOF or self.at("}"):
+                return nodes
+            nodes.append(self.statement())
+            tok = self.peek()
+            if tok.kind not in (NEWLINE, EOF) and not self.at("}") and not self.at(":", -1):
+                raise self.error(f"unexpected {tok.value!r} after statement")
+
+    def statement(self) -> Node:
+        tok = self.peek()
+        if tok.kind == OP and tok.value == "@":
+            self.annotation()
+            self.skip_newlines()
+            return self.statement()
+        if tok.kind == NAME:
+            word = tok.value
+            if word in _PAREN_STATEMENTS:
+                return self.paren_statement()
+            if word == "for":
+                return self.for_statement()
+            if word == "try":
+                return self.try_statement()
+            if word in ("return", "throw", "assert"):
+                self.advance()
+                if self.peek().kind in (NEWLINE, EOF) or self.at("}"):
+                    return Expr([], tok.start, tok.end)
+                value = self.expression()
+                return Expr([value], tok.start, value.end)
+            if word in ("break", "continue"):
+                self.advance()
+                return Expr([], tok.start, tok.end)
+            if word in ("import", "package"):
+                return self.skip_line()
+            if word in ("case", "default") and (word == "case" or self.at(":", 1)):
+                return self.case_label()
+            if word in _MODIFIERS:
+                self.advance()
+                while self.peek().kind == NAME and self.peek().value in _MODIFIERS:
+                    self.advance()
+                if self.peek().kind == NAME and self.peek(1).kind == NAME:
+                    self.advance()  # declared type: def String name = ...
+                if self.peek().kind in (NEWLINE, EOF):
+                    return Expr([], tok.start, tok.end)
+                if self.peek().kind == NAME and self.at("(", 1):
+                    method = self.method_definition(tok.start)
+                    if method is not None:
+                        return method
+                return self.statement()
+            if self.peek(1).kind == NAME and self.peek(2).kind == OP and self.peek(2).value in _ASSIGN_OPS:
+                self.advance()  # typed declaration: String name = ...
+
+        expr = self.expression()
+        tok = self.peek()
+        if tok.kind == OP and tok.value in _ASSIGN_OPS:
+            self.advance()
+            self.skip_newlines()
+            value = self.expression()
+            return Assign(expr, value, expr.start, value.end)
+        if isinstance(expr, Atom) and self.starts_command_argument():
+            return self.command_call(expr)
+        return expr
+
+    def annotation(self):
+        """Skip @Name or @Name(...)"""
+        self.expect("@")
+        self.advance()
+        while self.peek().kind == OP and self.peek().value == "." and self.peek(1).kind == NAME:
+            self.advance()
+            self.advance()
+        if self.at("("):
+            self.skip_balanced()
+
+    def method_definition(self, start: int) -> Optional[Node]:
+        """def name(params) { ... }; None (nothing consumed) if it is a call instead"""
+        saved = self.pos
+        self.advance()
+        self.skip_balanced()
+        self.skip_newlines()
+        if not self.at("{"):
+            self.pos = saved
+            return None
+        body = self.block()
+        return Expr([body], start, body.end + 1)
+
+    def skip_line(self) -> Node:
+        start = self.peek().start
+        end = start
+        while self.peek().kind not in (NEWLINE, EOF):
+            end = self.advance().end
+        return Expr([], start, end)
+
+    def skip_balanced(self) -> int:
+        """Skip a bracketed token group starting at the current opener; returns its end"""
+        depth = 0
+        while True:
+            tok = self.advance()
+            if tok.kind == EOF:
+                raise GroovySyntaxError("unbalanced brackets", self.text, tok.start)
+            if tok.kind == OP and tok.value in _OPENERS:
+                depth += 1
+            elif tok.kind == OP and tok.value in _CLOSERS:
+                depth -= 1
+                if depth == 0:
+                    return tok.end
+
+    def case_label(self) -> Node:
+        start = self.advance().start
+        parts = [] if self.at(":") else [self.expression()]
+        end = self.expect(":").end
+        return Expr(parts, start, end)
+
+    def body(self) -> Node:
+        """Body of if/for/while/try: a { } block or a single statement"""
+        self.skip_newlines()
+        if self.at("{"):
+            return self.block()
+        return self.statement()
+
+    def paren_statement(self) -> Node:
+        """if/while/switch/synchronized (condition) body [else body]"""
+        start = self.advance().start
+        self.expect("(")
+        parts: List[Node] = [self.expression()]
+        self.expect(")")
+        parts.append(self.body())
+        end = parts[-1].end
+        saved = self.pos
+        self.skip_newlines()
+        if self.peek().kind == NAME and self.peek().value == "else":
+            self.advance()
+            self.skip_newlines()
+            parts.append(self.paren_statement() if self.peek().value == "if" else self.body())
+            end = parts[-1].end
+        else:
+            self.pos = saved
+        return Expr(parts, start, end)
+
+    def for_statement(self) -> Node:
+        start = self.advance().start
+        self.skip_balanced()  # for (init; cond; step) / for (x in items): header not needed
+        body = self.body()
+        return Expr([body], start, body.end)
+
+    def try_statement(self) -> Node:
+        start = self.advance().start
+        parts: List[Node] = [self.body()]
+        while True:
+            saved = self.pos
+            self.skip_newlines()
+            word = self.peek().value if self.peek().kind == NAME else None
+            if word == "catch":
+                self.advance()
+                self.skip_balanced()
+                parts.append(self.body())
+            elif word == "finally":
+                self.advance()
+                parts.append(self.body())
+            else:
+                self.pos = saved
+                return Expr(parts, start, parts[-1].end)
+
+    def block(self) -> Closure:
+        """{ [params ->] statements }"""
+        self.expect("{")
+        start = self.peek(-1).end
+        # Closure parameters: { a, b -> ... } or { String s -> ... }
+        offset = 0
+        while self.peek(offset).kind == NAME or self.at(",", offset):
+            offset += 1
+        if self.at("->", offset):
+            self.pos += offset + 1
+        body = self.statements()
+        end = self.expect("}").start
+        return Closure(body, start, end)
+
+    # -- calls --------------------------------------------------------------
+
+    def starts_command_argument(self) -> bool:
+        """Whether the next token begins an argument of a parenthesis-less call"""
+        tok = self.peek()
+        if tok.kind in (STRING, NUMBER):
+            return True
+        if tok.kind == NAME:
+            return tok.value not in _NOT_ARGUMENTS
+        return tok.kind == OP and tok.value in ("!", "-") and self.peek(1).kind != NEWLINE
+
+    def command_call(self, callee: Atom) -> Call:
+        """name arg, key: value, ... [{ closure }] without parentheses"""
+        args: List[Node] = []
+        named: Dict[str, Node] = {}
+        while True:
+            self.argument(args, named)
+            if not self.at(","):
+                break
+            self.advance()
+            self.skip_newlines()
+        closure = self.block() if self.at("{") else None
+        end = closure.end + 1 if closure is not None else self.peek(-1).end
+        return Call(callee.value, None, args, named, closure, callee.start, end)
+
+    def argument(self, args: List[Node], named: Dict[str, Node]):
+        tok = self.peek()
+        if tok.kind in (NAME, STRING) and self.at(":", 1):
+            self.advance()
+            self.advance()
+            self.skip_newlines()
+            key = tok.value if tok.kind == NAME else _string_node(tok).value
+            named[key] = self.expression()
+        else:
+            args.append(self.expression())
+
+    def call_arguments(self, closer: str):
+        """Arguments up to closer; the opener has been consumed"""
+        args: List[Node] = []
+        named: Dict[str, Node] = {}
+        while not self.at(closer):
+            self.argument(args, named)
+            if not self.at(","):
+                break
+            self.advance()
+        end = self.expect(closer).end
+        return args, named, end
+
+    # -- expressions --------------------------------------------------------
+
+    def expression(self) -> Node:
+        first = self.unary()
+        parts = [first]
+        while True:
+            tok = self.peek()
+            if tok.kind == OP and tok.value == "?":
+                self.advance()
+                self.skip_newlines()
+                parts.append(self.expression())
+                self.skip_newlines()
+                self.expect(":")
+                self.skip_newlines()
+                parts.append(self.expression())
+            elif (tok.kind == OP and tok.value in _BINARY_OPS) or (tok.kind == NAME and tok.value in _BINARY_NAMES):
+                self.advance()
+                self.skip_newlines()
+                parts.append(self.unary())
+            else:
+                break
+        if len(parts) == 1:
+            return first
+        return Expr(parts, first.start, parts[-1].end)
+
+    def unary(self) -> Node:
+        tok = self.peek()
+        if tok.kind == OP and tok.value in _PREFIX_OPS:
+            self.advance()
+            operand = self.unary()
+            return Expr([operand], tok.start, operand.end)
+        if tok.kind == NAME and tok.value == "new":
+            self.advance()
+            operand = self.postfix(self.primary())
+            return Expr([operand], tok.start, operand.end)
+        return self.postfix(self.primary())
+
+    def primary(self) -> Node:
+        tok = self.peek()
+        if tok.kind == STRING:
+            self.advance()
+            return _string_node(tok)
+        if tok.kind in (NAME, NUMBER):
+            self.advance()
+            return Atom(tok.value, tok.start, tok.end)
+        if tok.kind == OP:
+            if tok.value == "(":
+                self.advance()
+                inner = self.expression()
+                end = self.expect(")").end
+                return Expr([inner], tok.start, end)
+            if tok.value == "[":
+                return self.list_or_map()
+            if tok.value == "{":
+                closure = self.block()
+                return closure
+        found = tok.value if tok.kind != EOF else "end of input"
+        raise self.error(f"unexpected {found!r}")
+
+    def list_or_map(self) -> Node:
+        start = self.expect("[").start
+        if self.at(":") and self.at("]", 1):
+            self.advance()
+            return MapExpr({}, start, self.advance().end)
+        items, named, end = self.call_arguments("]")
+        if named and not items:
+            return MapExpr(named, start, end)
+        return ListExpr(items + list(named.values()), start, end)
+
+    def postfix(self, node: Node) -> Node:
+        while True:
+            tok = self.peek()
+            if tok.kind == NEWLINE and self.peek(1).kind == OP and self.peek(1).value in _MEMBER_OPS:
+                self.skip_newlines()  # method chain continued on the next line
+                continue
+            if tok.kind != OP:
+                return node
+            if tok.value in _MEMBER_OPS:
+                self.advance()
+                member = self.advance()
+                if member.kind == STRING:
+                    member_name = _string_node(member).value
+                elif member.kind in (NAME, NUMBER):
+                    member_name = member.value
+                else:
+                    raise GroovySyntaxError(f"expected a member name after {tok.value!r}", self.text, member.start)
+                if isinstance(node, Atom) and tok.value == ".":
+                    node = Atom(f"{node.value}.{member_name}", node.start, member.end)
+                else:
+                    node = Expr([node, Atom(member_name, member.start, member.end)], node.start, member.end)
+            elif tok.value == "(":
+                self.advance()
+                args, named, end = self.call_arguments(")")
+                node = self.make_call(node, args, named, end)
+            elif tok.value == "{" and isinstance(node, (Atom, Call, Expr)):
+                closure = self.block()
+                if isinstance(node, Call) and node.closure is None:
+                    node.closure = closure
+                    node.end = closure.end + 1
+                else:
+                    node = self.make_call(node, [], {}, closure.end + 1, closure)
+            elif tok.value == "[":
+                self.advance()
+                args, named, end = self.call_arguments("]")
+                node = Expr([node] + args + list(named.values()), node.start, end)
+            elif tok.value in ("++", "--"):
+                self.advance()
+                node = Expr([node], node.start, tok.end)
+            else:
+                return node
+
+    def make_call(self, callee: Node, args: List[Node], named: Dict[str, Node], end: int,
+                  closure: Optional[Closure] = None) -> Call:
+        if isinstance(callee, Atom):
+            return Call(callee.value, None, args, named, closure, callee.start, end)
+        if isinstance(callee, Expr) and len(callee.parts) == 2 and isinstance(callee.parts[1], Atom):
+            receiver, method = callee.parts
+            return Call(method.value, receiver, args, named, closure, callee.start, end)
+        return Call("", callee, args, named, closure, callee.start, end)
+
+
+def _string_node(tok: Token) -> Str:
+    raw = tok.value
+    if raw.startswith(("'''", '"""')):
+        quote, closing = raw[:3], raw[:3]
+    elif raw.startswith("$/"):
+        quote, closing = "$/", "/$"
+    else:
+        quote = closing = raw[0]
+    inner_end = len(raw) - len(closing) if len(raw) >= len(quote) + len(closing) and raw.endswith(closing) else len(raw)
+    return Str(raw[len(quote):inner_end], quote, tok.start, tok.end)
+
+
+def parse_groovy(text: str) -> List[Node]:
+    """Parse Groovy source into a list of top-level statement nodes"""
+    return Parser(text).parse()
@@ -0,0 +1,153 @@
+
+"""
+Lightweight timing spans for profiling conversions
+
+Spans are only recorded while a Trace is active (see tracing()); otherwise
+span() hands back a shared no-op context manager, so instrumented code pays
+one context-variable lookup per call.
+
+    with tracing("Jenkinsfile") as trace:
+        with span("parse"):
+            ...
+    print_breakdown(phase_breakdown([trace.to_dict()]))
+"""
+
+import contextlib
+import functools
+import sys
+import time
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Callable, Iterator, TextIO
+
+
+_active_trace: ContextVar[Optional["Trace"]] = ContextVar("active_trace", default=None)
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Trace:
+    """Spans recorded for one unit of work (typically one Jenkinsfile)"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._token = None
+        self.duration = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"label": self.label, "duration": self.duration, "spans": self.spans}
+
+
+class _Span:
+    __slots__ = ("trace", "record", "start")
+
+    def __init__(self, trace: Trace, name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.record = {"name": name, "attrs": attrs, "child_time": 0.0}
+
+    def __enter__(self):
+        stack = self.trace._stack
+        # A phase nested inside itself must not count twice toward its total
+        self.record["recursive"] = any(open_span["name"] == self.record["name"] for open_span in stack)
+        self.record["depth"] = len(stack)
+        self.start = time.perf_counter()
+        self.record["start"] = self.start - self.trace.origin
+        stack.append(self.record)
+        self.trace.spans.append(self.record)
+        return self.record
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        record = self.trace._stack.pop()
+        record["duration"] = duration
+        record["self"] = duration - record.pop("child_time")
+        if self.trace._stack:
+            self.trace._stack[-1]["child_time"] += duration
+        return False
+
+
+def span(name: str, **attrs):
+    """Context manager timing one phase of the active trace (no-op without one)"""
+    trace = _active_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name, attrs)
+
+
+def traced(name: str) -> Callable:
+    """Decorator recording every call of a function as a span"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _active_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_trace(label: str) -> Trace:
+    """Make a new Trace the active one until finish_trace() is called"""
+    trace = Trace(label)
+    trace._token = _active_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace: Trace) -> Trace:
+    _active_trace.reset(trace._token)
+    trace.duration = time.perf_counter() - trace.origin
+    return trace
+
+
+@contextlib.contextmanager
+def tracing(label: str, enabled: bool = True) -> Iterator[Optional[Trace]]:
+    """Record spans opened in this context into a new Trace (None when disabled)"""
+    if not enabled:
+        yield None
+        return
+    trace = start_trace(label)
+    try:
+        yield trace
+    finally:
+        finish_trace(trace)
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """Run the body under cProfile and dump pstats to path (no-op without a path)"""
+    if not path:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def phase_breakdown(traces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per span name: calls, inclusive and self (exclusive) time, summed over traces"""
+    phases: Dict[str, Dict[str, Any]] = {}
+    for trace in traces:
+        for record in trace["spans"]:
+            phase = phases.setdefault(record["name"], {"name": record["name"], "calls": 0, "total": 0.0, "self": 0.0})
+            phase["calls"] += 1
+            phase["self"] += record["self"]
+            if not record["recursive"]:
+                phase["total"] += record["duration"]
+    return sorted(phases.values(), key=lambda phase: phase["self"], reverse=True)
+
+
+def print_breakdown(phases: List[Dict[str, Any]], out: TextIO = sys.stdout):
+    """Table of phases ordered by self time"""
+    total_self = sum(phase["self"] for phase in phases) or 1.0
+    print(f"   {'phase':<32} {'calls':>7} {'total ms':>11} {'self ms':>11} {'self %':>7}", file=out)
+    for phase in phases:
+        print(f"   {phase['name']:<32} {phase['calls']:>7} {phase['total'] * 1000:>11.2f} "
+              f"{phase['self'] * 1000:>11.2f} {phase['self'] / total_self:>7.1%}", file=out)
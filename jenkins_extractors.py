@@ -3,59 +3,49 @@
 Enhanced Jenkins pipeline parsing and feature extraction functions
 """
 
-import re
 from typing import List, Dict, Any, Set, Optional
-from utils import find_block, multiline_to_commands, strip_comments
-
-
-def extract_tools(stage_body: str) -> Dict[str, str]:
+from utils import multiline_to_commands, strip_comments
+from groovy_lexer import SourceView, Source
+from patterns import (
+    AGENT_BLOCK, NODE_BLOCK, DOCKER_BLOCK, PARAMETERS_BLOCK, ENVIRONMENT_BLOCK,
+    STEPS_BLOCK, TOOLS_BLOCK, WHEN_BLOCK, POST_BLOCK, PARALLEL_BLOCK, POST_CONDITION_BLOCKS,
+    SH_QUOTED, SH_TRIPLE_QUOTED, SH_SCRIPT_CALL, SH_SONAR, ECHO_QUOTED, SCRIPT_BLOCK,
+    TOOL_VERSIONS, GIT_STEP_PATTERNS, SONAR_ENV_BLOCK, INPUT_STEP, INPUT_PARAM_PATTERNS,
+    DOCKER_BUILD_PATTERNS, DOCKER_PUSH_PATTERNS, DOCKER_LOGIN, KUBECTL_COMMAND, HELM_COMMAND,
+    STRING_PARAM, BOOLEAN_PARAM, CHOICE_PARAM, AGENT_ANY, AGENT_LABEL, DOCKER_IMAGE,
+    DOCKER_ARGS, DOCKER_REUSE_NODE, ENV_ASSIGNMENT, WHEN_BRANCH, WHEN_EXPRESSION,
+    WHEN_ENVIRONMENT, WHEN_ANY_OF, WHEN_ALL_OF, WHEN_CHANGE_REQUEST, WHEN_BUILDING_TAG,
+    ARCHIVE_PATTERNS, JUNIT_PATTERNS, PUBLISH_COVERAGE, JACOCO_ADAPTER, PUBLISH_HTML,
+    MAIL, EMAILEXT, SLACK_SEND, DELETE_DIR, CLEAN_WS, STAGE_CREDENTIAL_PATTERNS,
+    WITH_CREDENTIALS_BLOCK, FILE_BINDING, USERNAME_PASSWORD_BINDING, STRING_BINDING,
+    GROOVY_CLOSURE_CALL, JENKINS_API_USE, CONDITIONAL, LOOP, PLUGIN_STEP_PATTERNS
+)
+
+
+def extract_tools(stage_body: Source) -> Dict[str, str]:
     """Extract tools block from stage"""
     tools = {}
-    s, e = find_block(stage_body, r"\btools\b")
-    if s == -1:
+    tools_body = SourceView.of(stage_body).block(TOOLS_BLOCK)
+    if tools_body is None:
         return tools
     
-    tools_body = stage_body[s:e]
-    
-    # Maven tools
-    m = re.search(r"maven\s+['\"]([^'\"]+)['\"]", tools_body)
-    if m:
-        tools["maven"] = m.group(1)
-    
-    # JDK tools
-    m = re.search(r"jdk\s+['\"]([^'\"]+)['\"]", tools_body)
-    if m:
-        tools["jdk"] = m.group(1)
-    
-    # Node.js tools
-    m = re.search(r"nodejs\s+['\"]([^'\"]+)['\"]", tools_body)
-    if m:
-        tools["nodejs"] = m.group(1)
-    
-    # Git tools
-    m = re.search(r"git\s+['\"]([^'\"]+)['\"]", tools_body)
-    if m:
-        tools["git"] = m.group(1)
+    # Maven, JDK, Node.js and Git tools
+    for tool, pattern in TOOL_VERSIONS.items():
+        m = tools_body.search(pattern)
+        if m:
+            tools[tool] = m.group(1)
         
     return tools
 
 
-def extract_git_steps(stage_body: str) -> List[Dict[str, Any]]:
+def extract_git_steps(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract git checkout steps with enhanced pattern matching"""
+    stage_body = SourceView.of(stage_body)
     git_steps = []
     
-    # Enhanced git patterns
-    patterns = [
-        # git branch: "...", url: "...", credentialsId: "..."
-        r"git\s+(?:branch\s*:\s*['\"]([^'\"]*)['\"](?:\s*,)?)?\s*(?:url\s*:\s*['\"]([^'\"]+)['\"](?:\s*,)?)?\s*(?:credentialsId\s*:\s*['\"]([^'\"]*)['\"])?",
-        # checkout scm
-        r"checkout\s+scm",
-        # git commands in sh blocks
-        r"git\s+clone\s+([^\s]+)(?:\s+([^\s]+))?"
-    ]
-    
-    for pattern in patterns:
-        for m in re.finditer(pattern, stage_body):
+    # git step, checkout scm and git clone in sh blocks
+    for pattern in GIT_STEP_PATTERNS:
+        for m in stage_body.finditer(pattern):
             if "checkout scm" in m.group(0):
                 git_steps.append({
                     "type": "scm",
@@ -88,14 +78,13 @@ def extract_git_steps(stage_body: str) -> List[Dict[str, Any]]:
     return git_steps
 
 
-def extract_sonarqube_steps(stage_body: str) -> List[Dict[str, Any]]:
+def extract_sonarqube_steps(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract SonarQube steps with enhanced parsing"""
+    stage_body = SourceView.of(stage_body)
     sonar_steps = []
     
-    # withSonarQubeEnv pattern
-    pattern = r"withSonarQubeEnv\s*\(\s*(?:['\"]([^'\"]*)['\"]|([^)]+))?\s*\)\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}"
-    
-    for m in re.finditer(pattern, stage_body, re.DOTALL):
+    # withSonarQubeEnv blocks
+    for m in stage_body.finditer(SONAR_ENV_BLOCK):
         server_name = m.group(1) or m.group(2) or ""
         inner_commands = m.group(3) or ""
         
@@ -103,11 +92,11 @@ def extract_sonarqube_steps(stage_body: str) -> List[Dict[str, Any]]:
         commands = []
         
         # Multi-line sh commands
-        for cmd_match in re.finditer(r"sh\s+['\"]([^'\"]+)['\"]", inner_commands):
+        for cmd_match in SH_QUOTED.finditer(inner_commands):
             commands.append(cmd_match.group(1))
         
         # Triple-quoted sh commands
-        for cmd_match in re.finditer(r"sh\s+([\"']{3})([\s\S]*?)\1", inner_commands):
+        for cmd_match in SH_TRIPLE_QUOTED.finditer(inner_commands):
             commands.extend(multiline_to_commands(cmd_match.group(2)))
         
         if commands or server_name:
@@ -118,7 +107,7 @@ def extract_sonarqube_steps(stage_body: str) -> List[Dict[str, Any]]:
     
     # Also check for direct sonar commands outside withSonarQubeEnv
     direct_sonar_commands = []
-    for m in re.finditer(r"sh\s+['\"]([^'\"]*sonar[^'\"]*)['\"]", stage_body):
+    for m in stage_body.finditer(SH_SONAR):
         direct_sonar_commands.append(m.group(1))
     
     if direct_sonar_commands:
@@ -130,14 +119,12 @@ def extract_sonarqube_steps(stage_body: str) -> List[Dict[str, Any]]:
     return sonar_steps
 
 
-def extract_input_steps(stage_body: str) -> List[Dict[str, Any]]:
+def extract_input_steps(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract input approval steps with enhanced parameter parsing"""
+    stage_body = SourceView.of(stage_body)
     input_steps = []
     
-    # Enhanced input pattern
-    pattern = r"input\s*\(\s*(?:message\s*:\s*['\"]([^'\"]+)['\"])?(?:\s*,\s*ok\s*:\s*['\"]([^'\"]*)['\"])?(?:\s*,\s*parameters\s*:\s*\[([^\]]*)\])?\s*\)"
-    
-    for m in re.finditer(pattern, stage_body, re.DOTALL):
+    for m in stage_body.finditer(INPUT_STEP):
         message = m.group(1) or "Approval required"
         ok_button = m.group(2) or "Proceed"
         parameters_str = m.group(3) or ""
@@ -145,13 +132,8 @@ def extract_input_steps(stage_body: str) -> List[Dict[str, Any]]:
         # Parse parameters if present
         parameters = []
         if parameters_str:
-            param_patterns = [
-                r"string\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]",
-                r"choice\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]",
-                r"booleanParam\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]"
-            ]
-            for pattern in param_patterns:
-                for param_match in re.finditer(pattern, parameters_str):
+            for pattern in INPUT_PARAM_PATTERNS:
+                for param_match in pattern.finditer(parameters_str):
                     parameters.append(param_match.group(1))
         
         input_steps.append({
@@ -163,52 +145,26 @@ def extract_input_steps(stage_body: str) -> List[Dict[str, Any]]:
     return input_steps
 
 
-def extract_credentials_usage(stage_body: str) -> Set[str]:
+def extract_credentials_usage(stage_body: Source) -> Set[str]:
     """Extract credential IDs used in the stage with comprehensive patterns"""
+    stage_body = SourceView.of(stage_body)
     credentials = set()
     
-    # All possible credential patterns
-    patterns = [
-        r'credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-        r'usernamePassword\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'string\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'file\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'sshUserPrivateKey\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'withCredentials\s*\[[^\]]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'sshagent\s*\(\s*\[[\'"]([^\'"]+)[\'"]\]\s*\)',
-        r'dockerCredentials\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, stage_body, re.IGNORECASE)
-        credentials.update(matches)
-    
-    # Extract from environment variable assignments
-    env_patterns = [
-        r'=\s*credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-        r'KUBECONFIG[^=]*=\s*credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-    ]
-    
-    for pattern in env_patterns:
-        matches = re.findall(pattern, stage_body, re.IGNORECASE)
-        credentials.update(matches)
+    # All possible credential patterns, including environment variable assignments
+    for pattern in STAGE_CREDENTIAL_PATTERNS:
+        credentials.update(stage_body.findall(pattern))
     
     return credentials
 
 
-def extract_docker_steps(stage_body: str) -> List[Dict[str, Any]]:
+def extract_docker_steps(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract Docker-related steps with enhanced parsing"""
+    stage_body = SourceView.of(stage_body)
     docker_steps = []
     
     # Docker build patterns
-    build_patterns = [
-        r"docker\s+build\s+(?:--pull\s+)?(?:--progress=\w+\s+)?(?:-f\s+([^\s]+)\s+)?(?:-t\s+([^\s]+)\s+)?([^\s]*)",
-        r"docker\s+build\s+[^|]*-t\s+([^\s]+)",
-    ]
-    
-    for pattern in build_patterns:
-        for m in re.finditer(pattern, stage_body):
+    for pattern in DOCKER_BUILD_PATTERNS:
+        for m in stage_body.finditer(pattern):
             groups = m.groups()
             dockerfile = ""
             tag = ""
@@ -230,13 +186,8 @@ def extract_docker_steps(stage_body: str) -> List[Dict[str, Any]]:
                 })
     
     # Docker push patterns
-    push_patterns = [
-        r"docker\s+push\s+([^\s]+)",
-        r"docker\s+image\s+push\s+([^\s]+)"
-    ]
-    
-    for pattern in push_patterns:
-        for m in re.finditer(pattern, stage_body):
+    for pattern in DOCKER_PUSH_PATTERNS:
+        for m in stage_body.finditer(pattern):
             tag = m.group(1).strip()
             docker_steps.append({
                 "type": "push",
@@ -244,7 +195,7 @@ def extract_docker_steps(stage_body: str) -> List[Dict[str, Any]]:
             })
     
     # Docker login patterns
-    if re.search(r"docker\s+login", stage_body):
+    if stage_body.search(DOCKER_LOGIN):
         docker_steps.append({
             "type": "login"
         })
@@ -252,39 +203,38 @@ def extract_docker_steps(stage_body: str) -> List[Dict[str, Any]]:
     return docker_steps
 
 
-def extract_kubectl_steps(stage_body: str) -> List[str]:
+def extract_kubectl_steps(stage_body: Source) -> List[str]:
     """Extract kubectl commands with enhanced parsing"""
+    stage_body = SourceView.of(stage_body)
     kubectl_commands = []
     
     # Direct kubectl commands
-    for m in re.finditer(r"kubectl\s+([^\n\"']+)", stage_body):
+    for m in stage_body.finditer(KUBECTL_COMMAND):
         kubectl_commands.append(f"kubectl {m.group(1).strip()}")
     
     # kubectl in multiline sh blocks
-    for m in re.finditer(r"sh\s+([\"']{3})([\s\S]*?)\1", stage_body):
+    for m in stage_body.finditer(SH_TRIPLE_QUOTED):
         commands = multiline_to_commands(m.group(2))
         for cmd in commands:
             if cmd.strip().startswith('kubectl'):
                 kubectl_commands.append(cmd.strip())
     
     # helm commands (related to k8s)
-    for m in re.finditer(r"helm\s+([^\n\"']+)", stage_body):
+    for m in stage_body.finditer(HELM_COMMAND):
         kubectl_commands.append(f"helm {m.group(1).strip()}")
     
     return kubectl_commands
 
 
-def extract_parameters(pipeline_body: str) -> Dict[str, Any]:
+def extract_parameters(pipeline_body: Source) -> Dict[str, Any]:
     """Extract pipeline parameters with enhanced support"""
     params = {}
-    s, e = find_block(pipeline_body, r"\bparameters\b")
-    if s == -1:
+    param_body = SourceView.of(pipeline_body).block(PARAMETERS_BLOCK)
+    if param_body is None:
         return params
     
-    param_body = pipeline_body[s:e]
-    
     # string parameters
-    for m in re.finditer(r"string\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*defaultValue\s*:\s*['\"]([^'\"]*)['\"])?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?", param_body):
+    for m in param_body.finditer(STRING_PARAM):
         name = m.group(1)
         default = m.group(2) or ""
         description = m.group(3) or ""
@@ -295,7 +245,7 @@ def extract_parameters(pipeline_body: str) -> Dict[str, Any]:
         }
     
     # boolean parameters
-    for m in re.finditer(r"booleanParam\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*defaultValue\s*:\s*(true|false))?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?", param_body):
+    for m in param_body.finditer(BOOLEAN_PARAM):
         name = m.group(1)
         default = m.group(2) or "false"
         description = m.group(3) or ""
@@ -306,7 +256,7 @@ def extract_parameters(pipeline_body: str) -> Dict[str, Any]:
         }
     
     # choice parameters
-    for m in re.finditer(r"choice\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*choices\s*:\s*\[([^\]]+)\])?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?", param_body):
+    for m in param_body.finditer(CHOICE_PARAM):
         name = m.group(1)
         choices_str = m.group(2) or ""
         description = m.group(3) or ""
@@ -321,37 +271,34 @@ def extract_parameters(pipeline_body: str) -> Dict[str, Any]:
     return params
 
 
-def extract_global_agent(pipeline_body: str) -> Dict[str, Any]:
+def extract_global_agent(pipeline_body: Source) -> Dict[str, Any]:
     """Enhanced agent extraction with better parsing"""
-    s, e = find_block(pipeline_body, r"\bagent\b")
-    if s == -1:
+    agent_body = SourceView.of(pipeline_body).block(AGENT_BLOCK)
+    if agent_body is None:
         return {}
-    agent_body = pipeline_body[s:e]
     
     # agent any
-    if re.search(r"\bany\b", agent_body):
+    if agent_body.search(AGENT_ANY):
         return {"type": "any"}
     
     # agent { node { label '...' } }
-    ns, ne = find_block(agent_body, r"\bnode\b")
-    if ns != -1:
-        node_body = agent_body[ns:ne]
-        m = re.search(r"label\s+['\"]([^'\"]+)['\"]", node_body)
+    node_body = agent_body.block(NODE_BLOCK)
+    if node_body is not None:
+        m = node_body.search(AGENT_LABEL)
         if m:
             return {"type": "label", "label": m.group(1).strip()}
     
     # agent { label '...' }
-    m = re.search(r"label\s+['\"]([^'\"]+)['\"]", agent_body)
+    m = agent_body.search(AGENT_LABEL)
     if m:
         return {"type": "label", "label": m.group(1).strip()}
     
     # agent { docker { ... } }
-    ds, de = find_block(agent_body, r"\bdocker\b")
-    if ds != -1:
-        docker_body = agent_body[ds:de]
-        img = re.search(r"image\s+['\"]([^'\"]+)['\"]", docker_body)
-        args = re.search(r"args\s+['\"]([^'\"]+)['\"]", docker_body)
-        reuse_node = re.search(r"reuseNode\s+(true|false)", docker_body)
+    docker_body = agent_body.block(DOCKER_BLOCK)
+    if docker_body is not None:
+        img = docker_body.search(DOCKER_IMAGE)
+        args = docker_body.search(DOCKER_ARGS)
+        reuse_node = docker_body.search(DOCKER_REUSE_NODE)
         
         if img:
             out = {"type": "docker", "image": img.group(1).strip()}
@@ -364,34 +311,31 @@ def extract_global_agent(pipeline_body: str) -> Dict[str, Any]:
     return {}
 
 
-def extract_stage_agent(stage_body: str) -> Dict[str, Any]:
+def extract_stage_agent(stage_body: Source) -> Dict[str, Any]:
     """Enhanced stage agent extraction"""
-    s, e = find_block(stage_body, r"\bagent\b")
-    if s == -1:
+    body = SourceView.of(stage_body).block(AGENT_BLOCK)
+    if body is None:
         return {}
-    body = stage_body[s:e]
     
-    if re.search(r"\bany\b", body):
+    if body.search(AGENT_ANY):
         return {"type": "any"}
     
     # Handle node { label } syntax
-    ns, ne = find_block(body, r"\bnode\b")
-    if ns != -1:
-        node_body = body[ns:ne]
-        m = re.search(r"label\s+['\"]([^'\"]+)['\"]", node_body)
+    node_body = body.block(NODE_BLOCK)
+    if node_body is not None:
+        m = node_body.search(AGENT_LABEL)
         if m:
             return {"type": "label", "label": m.group(1).strip()}
     
-    m = re.search(r"label\s+['\"]([^'\"]+)['\"]", body)
+    m = body.search(AGENT_LABEL)
     if m:
         return {"type": "label", "label": m.group(1).strip()}
     
-    ds, de = find_block(body, r"\bdocker\b")
-    if ds != -1:
-        dbody = body[ds:de]
-        img = re.search(r"image\s+['\"]([^'\"]+)['\"]", dbody)
-        args = re.search(r"args\s+['\"]([^'\"]+)['\"]", dbody)
-        reuse_node = re.search(r"reuseNode\s+(true|false)", dbody)
+    dbody = body.block(DOCKER_BLOCK)
+    if dbody is not None:
+        img = dbody.search(DOCKER_IMAGE)
+        args = dbody.search(DOCKER_ARGS)
+        reuse_node = dbody.search(DOCKER_REUSE_NODE)
         
         if img:
             out = {"type": "docker", "image": img.group(1).strip()}
@@ -404,14 +348,14 @@ def extract_stage_agent(stage_body: str) -> Dict[str, Any]:
     return {}
 
 
-def extract_env_kv(env_body: str) -> Dict[str, str]:
+def extract_env_kv(env_body: Source) -> Dict[str, str]:
     """Extract environment key-value pairs from environment block"""
     env: Dict[str, str] = {}
-    for line in env_body.splitlines():
+    for line in str(env_body).splitlines():
         line = line.strip()
         if not line or line.startswith("#"):
             continue
-        m = re.match(r"([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.+)", line)
+        m = ENV_ASSIGNMENT.match(line)
         if m:
             key = m.group(1)
             val = m.group(2).strip()
@@ -421,124 +365,97 @@ def extract_env_kv(env_body: str) -> Dict[str, str]:
     return env
 
 
-def split_stages(stages_body: str) -> List[Dict[str, Any]]:
-    """Split stages block into individual stages with enhanced parsing"""
-    res = []
-    i = 0
-    while True:
-        m = re.search(r"stage\s*\(\s*['\"]([^'\"]+)['\"]\s*\)\s*\{", stages_body[i:])
-        if not m:
-            break
-        name = m.group(1)
-        abs_start = i + m.start()
-        block_start = abs_start + m.end() - m.start() - 1
-        depth = 0
-        j = block_start + 1
-        content_start = j
-        while j < len(stages_body):
-            if stages_body[j] == '{':
-                depth += 1
-            elif stages_body[j] == '}':
-                if depth == 0:
-                    res.append({"name": name, "content": stages_body[content_start:j]})
-                    i = j + 1
-                    break
-                depth -= 1
-            j += 1
-        else:
-            break
-    return res
-
-
-def extract_stage_when_branch(stage_body: str) -> str:
+def split_stages(stages_body: Source) -> List[Dict[str, Any]]:
+    """Split stages block into individual stages (content is a SourceView)"""
+    return [
+        {"name": name, "content": content}
+        for name, content in SourceView.of(stages_body).stages()
+    ]
+
+
+def extract_stage_when_branch(stage_body: Source) -> str:
     """Extract branch condition from when block"""
-    s, e = find_block(stage_body, r"\bwhen\b")
-    if s == -1:
+    when_body = SourceView.of(stage_body).block(WHEN_BLOCK)
+    if when_body is None:
         return ""
-    when_body = stage_body[s:e]
-    m = re.search(r"branch\s+['\"]([^'\"]+)['\"]", when_body)
+    m = when_body.search(WHEN_BRANCH)
     return m.group(1) if m else ""
 
 
-def extract_stage_when_expression(stage_body: str) -> Optional[str]:
+def extract_stage_when_expression(stage_body: Source) -> Optional[str]:
     """Extract expression condition from when block"""
-    s, e = find_block(stage_body, r"\bwhen\b")
-    if s == -1:
+    when_body = SourceView.of(stage_body).block(WHEN_BLOCK)
+    if when_body is None:
         return None
-    when_body = stage_body[s:e]
     
     # Look for expression { ... }
-    expr_match = re.search(r"expression\s*\{\s*return\s+([^}]+)\s*\}", when_body)
+    expr_match = when_body.search(WHEN_EXPRESSION)
     if expr_match:
         return expr_match.group(1).strip()
     
     # Look for other when conditions
-    if re.search(r"anyOf\s*\{", when_body):
+    if when_body.search(WHEN_ANY_OF):
         return "complex_anyOf_condition"
-    if re.search(r"allOf\s*\{", when_body):
+    if when_body.search(WHEN_ALL_OF):
         return "complex_allOf_condition"
     
     return None
 
 
-def extract_stage_environment(stage_body: str) -> Dict[str, str]:
+def extract_stage_environment(stage_body: Source) -> Dict[str, str]:
     """Extract environment variables from stage"""
-    s, e = find_block(stage_body, r"\benvironment\b")
-    if s == -1:
+    env_body = SourceView.of(stage_body).block(ENVIRONMENT_BLOCK)
+    if env_body is None:
         return {}
-    return extract_env_kv(stage_body[s:e])
+    return extract_env_kv(env_body)
 
 
-def extract_steps_commands(stage_body: str) -> List[str]:
+def extract_steps_commands(stage_body: Source) -> List[str]:
     """Extract shell commands from steps block with enhanced parsing"""
     cmds: List[str] = []
-    s, e = find_block(stage_body, r"\bsteps\b")
-    search_zone = stage_body[s:e] if s != -1 else stage_body
-    zone = strip_comments(search_zone)
+    stage_body = SourceView.of(stage_body)
+    zone = stage_body.block(STEPS_BLOCK)
+    if zone is None:
+        zone = stage_body
+    if zone.has_comments():
+        zone = SourceView(strip_comments(str(zone)))
 
     # Triple-quoted strings
-    for m in re.finditer(r"sh\s+([\"']{3})([\s\S]*?)\1", zone):
+    for m in zone.finditer(SH_TRIPLE_QUOTED):
         inner = m.group(2)
         cmds.extend(multiline_to_commands(inner))
     
     # Single/double quoted strings
-    for m in re.finditer(r"sh\s+['\"]([^'\"]+)['\"]", zone):
+    for m in zone.finditer(SH_QUOTED):
         cmds.append(m.group(1).strip())
     
     # Echo commands
-    for m in re.finditer(r"\becho\s+['\"]([^'\"]+)['\"]", zone):
+    for m in zone.finditer(ECHO_QUOTED):
         cmds.append(f"echo {m.group(1).strip()}")
     
     # Script blocks with returnStdout
-    for m in re.finditer(r"sh\s*\(\s*script\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*returnStdout\s*:\s*true)?\s*\)", zone):
+    for m in zone.finditer(SH_SCRIPT_CALL):
         cmds.append(m.group(1).strip())
 
     return cmds
 
 
-def _extract_post_body(body: str) -> Dict[str, Any]:
+def _extract_post_body(body: Source) -> Dict[str, Any]:
     """Extract post block content with enhanced parsing for stage and pipeline level"""
     out: Dict[str, Any] = {}
-    ps, pe = find_block(body, r"\bpost\b")
-    if ps == -1:
+    post_body = SourceView.of(body).block(POST_BLOCK)
+    if post_body is None:
         return out
-    post_body = body[ps:pe]
 
     def _collect(kind: str) -> Dict[str, Any]:
-        ks, ke = find_block(post_body, rf"\b{kind}\b")
-        if ks == -1:
+        kbody = post_body.block(POST_CONDITION_BLOCKS[kind])
+        if kbody is None:
             return {}
-        kbody = post_body[ks:ke]
         data: Dict[str, Any] = {}
         
         # archiveArtifacts with various options
-        archive_patterns = [
-            r"archiveArtifacts\s*\(\s*artifacts\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*onlyIfSuccessful\s*:\s*(true|false))?(?:\s*,\s*allowEmptyArchive\s*:\s*(true|false))?\s*\)",
-            r"archiveArtifacts\s+['\"]([^'\"]+)['\"]"
-        ]
-        
-        for pattern in archive_patterns:
-            m = re.search(pattern, kbody)
+        for pattern in ARCHIVE_PATTERNS:
+            m = kbody.search(pattern)
             if m:
                 data["archive"] = m.group(1).strip()
                 if len(m.groups()) > 1 and m.group(2):
@@ -548,13 +465,8 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
                 break
         
         # junit test results
-        junit_patterns = [
-            r"junit\s*\(\s*(?:allowEmptyResults\s*:\s*(true|false)\s*,\s*)?testResults\s*:\s*['\"]([^'\"]+)['\"]",
-            r"junit\s+['\"]([^'\"]+)['\"]"
-        ]
-        
-        for pattern in junit_patterns:
-            m = re.search(pattern, kbody)
+        for pattern in JUNIT_PATTERNS:
+            m = kbody.search(pattern)
             if m:
                 if len(m.groups()) > 1:
                     data["junit"] = {
@@ -569,11 +481,11 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
                 break
         
         # publishCoverage
-        coverage_match = re.search(r"publishCoverage\s+adapters\s*:\s*\[([^\]]+)\]", kbody)
+        coverage_match = kbody.search(PUBLISH_COVERAGE)
         if coverage_match:
             adapters = coverage_match.group(1)
             if "jacocoAdapter" in adapters:
-                jacoco_match = re.search(r"jacocoAdapter\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", adapters)
+                jacoco_match = JACOCO_ADAPTER.search(adapters)
                 if jacoco_match:
                     data["coverage"] = {
                         "type": "jacoco",
@@ -581,20 +493,15 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
                     }
         
         # publishHTML
-        html_match = re.search(r"publishHTML\s*\([^)]+\)", kbody)
+        html_match = kbody.search(PUBLISH_HTML)
         if html_match:
             data["publishHTML"] = html_match.group(0)
         
         # mail notifications
-        mail_patterns = [
-            r"mail\s+to\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*subject\s*:\s*['\"]([^'\"]*)['\"])?(?:\s*,\s*body\s*:\s*['\"]([^'\"]*)['\"])?",
-            r"emailext\s*\([^)]+\)"
-        ]
-        
-        for pattern in mail_patterns:
-            m = re.search(pattern, kbody)
+        for pattern in (MAIL, EMAILEXT):
+            m = kbody.search(pattern)
             if m:
-                if "emailext" in pattern:
+                if pattern is EMAILEXT:
                     data["emailext"] = m.group(0)
                 else:
                     data["mail"] = {
@@ -605,31 +512,31 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
                 break
         
         # slack notifications
-        slack_match = re.search(r"slackSend\s*\([^)]+\)", kbody)
+        slack_match = kbody.search(SLACK_SEND)
         if slack_match:
             data["slack"] = slack_match.group(0)
         
         # deleteDir
-        if re.search(r"deleteDir\s*\(\s*\)", kbody):
+        if kbody.search(DELETE_DIR):
             data["deleteDir"] = True
         
         # cleanWs
-        if re.search(r"cleanWs\s*\(\s*\)", kbody):
+        if kbody.search(CLEAN_WS):
             data["cleanWs"] = True
         
         # capture shell/echo commands inside post
         cmds = []
-        for mm in re.finditer(r"sh\s+['\"]([^'\"]+)['\"]", kbody):
+        for mm in kbody.finditer(SH_QUOTED):
             cmds.append(mm.group(1).strip())
-        for mm in re.finditer(r"sh\s+([\"']{3})([\s\S]*?)\1", kbody):
+        for mm in kbody.finditer(SH_TRIPLE_QUOTED):
             cmds.extend(multiline_to_commands(mm.group(2)))
-        for mm in re.finditer(r"\becho\s+['\"]([^'\"]+)['\"]", kbody):
+        for mm in kbody.finditer(ECHO_QUOTED):
             cmds.append(f"echo {mm.group(1).strip()}")
         if cmds:
             data["commands"] = cmds
         
         # script blocks in post
-        script_match = re.search(r"script\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}", kbody, re.DOTALL)
+        script_match = kbody.search(SCRIPT_BLOCK)
         if script_match:
             script_content = script_match.group(1).strip()
             if script_content:
@@ -637,7 +544,7 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
         
         return data
 
-    for kind in ("always", "success", "failure", "cleanup", "unstable", "aborted"):
+    for kind in POST_CONDITION_BLOCKS:
         kdata = _collect(kind)
         if kdata:
             out[kind] = kdata
@@ -645,33 +552,34 @@ def _extract_post_body(body: str) -> Dict[str, Any]:
     return out
 
 
-def extract_stage_post(stage_body: str) -> Dict[str, Any]:
+def extract_stage_post(stage_body: Source) -> Dict[str, Any]:
     """Extract post block from stage"""
     return _extract_post_body(stage_body)
 
 
-def extract_pipeline_post(pipeline_body: str) -> Dict[str, Any]:
+def extract_pipeline_post(pipeline_body: Source) -> Dict[str, Any]:
     """Extract post block from pipeline"""
     return _extract_post_body(pipeline_body)
 
 
-def extract_parallel(stage_body: str) -> List[Dict[str, Any]]:
-    """Extract parallel stages from stage body"""
-    ps, pe = find_block(stage_body, r"\bparallel\b")
-    if ps == -1:
+def extract_parallel(stage_body: Source) -> List[Dict[str, Any]]:
+    """Extract parallel stages from stage body (content is a SourceView)"""
+    parallel_body = SourceView.of(stage_body).block(PARALLEL_BLOCK)
+    if parallel_body is None:
         return []
-    par_body = stage_body[ps:pe]
-    return split_stages(par_body)
+    return [
+        {"name": name, "content": content}
+        for name, content in parallel_body.stages()
+    ]
 
 
-def extract_withCredentials_blocks(stage_body: str) -> List[Dict[str, Any]]:
+def extract_withCredentials_blocks(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract withCredentials blocks with their contents"""
+    stage_body = SourceView.of(stage_body)
     cred_blocks = []
     
     # Find withCredentials blocks
-    pattern = r"withCredentials\s*\[\s*([^\]]+)\s*\]\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}"
-    
-    for m in re.finditer(pattern, stage_body, re.DOTALL):
+    for m in stage_body.finditer(WITH_CREDENTIALS_BLOCK):
         credentials_def = m.group(1)
         block_content = m.group(2)
         
@@ -679,7 +587,7 @@ def extract_withCredentials_blocks(stage_body: str) -> List[Dict[str, Any]]:
         cred_types = []
         
         # file credential
-        file_matches = re.finditer(r"file\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*variable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)", credentials_def)
+        file_matches = FILE_BINDING.finditer(credentials_def)
         for fm in file_matches:
             cred_types.append({
                 "type": "file",
@@ -688,7 +596,7 @@ def extract_withCredentials_blocks(stage_body: str) -> List[Dict[str, Any]]:
             })
         
         # usernamePassword credential
-        userpass_matches = re.finditer(r"usernamePassword\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*usernameVariable\s*:\s*['\"]([^'\"]+)['\"])?(?:\s*,\s*passwordVariable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)", credentials_def)
+        userpass_matches = USERNAME_PASSWORD_BINDING.finditer(credentials_def)
         for um in userpass_matches:
             cred_id = um.group(1)
             username_var = um.group(2) if um.group(2) else f"{cred_id.upper()}_USR"
@@ -701,7 +609,7 @@ def extract_withCredentials_blocks(stage_body: str) -> List[Dict[str, Any]]:
             })
         
         # string/token credential
-        string_matches = re.finditer(r"string\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*variable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)", credentials_def)
+        string_matches = STRING_BINDING.finditer(credentials_def)
         for sm in string_matches:
             cred_types.append({
                 "type": "string",
@@ -718,63 +626,49 @@ def extract_withCredentials_blocks(stage_body: str) -> List[Dict[str, Any]]:
     return cred_blocks
 
 
-def extract_script_blocks(stage_body: str) -> List[Dict[str, Any]]:
+def extract_script_blocks(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract script blocks and their complexity"""
+    stage_body = SourceView.of(stage_body)
     script_blocks = []
     
-    pattern = r"script\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}"
-    
-    for m in re.finditer(pattern, stage_body, re.DOTALL):
-        script_content = m.group(1).strip()
-        
-        # Analyze script complexity
-        complexity = {
-            "has_groovy_specific": bool(re.search(r"\.each\s*\{|\.collect\s*\{|\.findAll\s*\{", script_content)),
-            "has_jenkins_api": bool(re.search(r"currentBuild\.|env\.|params\.", script_content)),
-            "has_conditionals": bool(re.search(r"if\s*\(|switch\s*\(", script_content)),
-            "has_loops": bool(re.search(r"for\s*\(|while\s*\(", script_content)),
-            "line_count": len(script_content.split('\n')),
-            "requires_manual_conversion": False
-        }
-        
-        # Mark as requiring manual conversion if complex
-        if (complexity["has_groovy_specific"] or 
-            complexity["line_count"] > 10 or 
-            complexity["has_jenkins_api"]):
-            complexity["requires_manual_conversion"] = True
-        
-        script_blocks.append({
-            "content": script_content,
-            "complexity": complexity
-        })
+    for m in stage_body.finditer(SCRIPT_BLOCK):
+        script_blocks.append(describe_script_block(m.group(1).strip()))
     
     return script_blocks
 
 
-def extract_plugin_steps(stage_body: str) -> List[Dict[str, Any]]:
+def describe_script_block(script_content: str) -> Dict[str, Any]:
+    """Script block content with its complexity analysis"""
+    # Analyze script complexity
+    complexity = {
+        "has_groovy_specific": bool(GROOVY_CLOSURE_CALL.search(script_content)),
+        "has_jenkins_api": bool(JENKINS_API_USE.search(script_content)),
+        "has_conditionals": bool(CONDITIONAL.search(script_content)),
+        "has_loops": bool(LOOP.search(script_content)),
+        "line_count": len(script_content.split('\n')),
+        "requires_manual_conversion": False
+    }
+    
+    # Mark as requiring manual conversion if complex
+    if (complexity["has_groovy_specific"] or 
+        complexity["line_count"] > 10 or 
+        complexity["has_jenkins_api"]):
+        complexity["requires_manual_conversion"] = True
+    
+    return {
+        "content": script_content,
+        "complexity": complexity
+    }
+
+
+def extract_plugin_steps(stage_body: Source) -> List[Dict[str, Any]]:
     """Extract Jenkins plugin-specific steps that need special handling"""
+    stage_body = SourceView.of(stage_body)
     plugin_steps = []
     
     # Common Jenkins plugins and their patterns
-    plugin_patterns = {
-        "publishHTML": r"publishHTML\s*\([^)]+\)",
-        "publishTestResults": r"publishTestResults\s*\([^)]+\)",
-        "step": r"step\s*\[\s*\$class\s*:\s*['\"]([^'\"]+)['\"]",
-        "build": r"build\s+job\s*:\s*['\"]([^'\"]+)['\"]",
-        "emailext": r"emailext\s*\([^)]+\)",
-        "slackSend": r"slackSend\s*\([^)]+\)",
-        "milestone": r"milestone\s*\([^)]+\)",
-        "timeout": r"timeout\s*\([^)]+\)\s*\{",
-        "retry": r"retry\s*\([^)]+\)\s*\{",
-        "lock": r"lock\s*\([^)]+\)\s*\{",
-        "ws": r"ws\s*\([^)]+\)\s*\{",
-        "node": r"node\s*\([^)]+\)\s*\{",
-        "waitForQualityGate": r"waitForQualityGate\s*\(\s*\)",
-        "readProperties": r"readProperties\s+file\s*:\s*['\"]([^'\"]+)['\"]"
-    }
-    
-    for plugin_name, pattern in plugin_patterns.items():
-        matches = re.finditer(pattern, stage_body, re.DOTALL)
+    for plugin_name, pattern in PLUGIN_STEP_PATTERNS.items():
+        matches = stage_body.finditer(pattern)
         for match in matches:
             step_info = {
                 "plugin": plugin_name,
@@ -795,27 +689,25 @@ def extract_plugin_steps(stage_body: str) -> List[Dict[str, Any]]:
     return plugin_steps
 
 
-def extract_when_conditions(stage_body: str) -> Dict[str, Any]:
+def extract_when_conditions(stage_body: Source) -> Dict[str, Any]:
     """Extract all when conditions with enhanced parsing"""
     conditions = {}
-    s, e = find_block(stage_body, r"\bwhen\b")
-    if s == -1:
+    when_body = SourceView.of(stage_body).block(WHEN_BLOCK)
+    if when_body is None:
         return conditions
     
-    when_body = stage_body[s:e]
-    
     # Branch condition
-    branch_match = re.search(r"branch\s+['\"]([^'\"]+)['\"]", when_body)
+    branch_match = when_body.search(WHEN_BRANCH)
     if branch_match:
         conditions["branch"] = branch_match.group(1)
     
     # Expression condition
-    expr_match = re.search(r"expression\s*\{\s*return\s+([^}]+)\s*\}", when_body)
+    expr_match = when_body.search(WHEN_EXPRESSION)
     if expr_match:
         conditions["expression"] = expr_match.group(1).strip()
     
     # Environment condition
-    env_match = re.search(r"environment\s+name\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*value\s*:\s*['\"]([^'\"]+)['\"])?", when_body)
+    env_match = when_body.search(WHEN_ENVIRONMENT)
     if env_match:
         conditions["environment"] = {
             "name": env_match.group(1),
@@ -823,21 +715,21 @@ def extract_when_conditions(stage_body: str) -> Dict[str, Any]:
         }
     
     # anyOf condition
-    if re.search(r"anyOf\s*\{", when_body):
+    if when_body.search(WHEN_ANY_OF):
         conditions["anyOf"] = True
         conditions["complex"] = True
     
     # allOf condition
-    if re.search(r"allOf\s*\{", when_body):
+    if when_body.search(WHEN_ALL_OF):
         conditions["allOf"] = True
         conditions["complex"] = True
     
     # changeRequest condition
-    if re.search(r"changeRequest", when_body):
+    if when_body.search(WHEN_CHANGE_REQUEST):
         conditions["changeRequest"] = True
     
     # buildingTag condition
-    if re.search(r"buildingTag", when_body):
+    if when_body.search(WHEN_BUILDING_TAG):
         conditions["buildingTag"] = True
     
     return conditions
\ No newline at end of file
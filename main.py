@@ -5,41 +5,32 @@ Enhanced Jenkins Declarative Pipeline -> GitHub Actions converter
 
 """
 
+import io
+import os
 import sys
-import re
-import yaml
+import contextlib
+import time
 from pathlib import Path
-from typing import List, Dict, Any
-from converter import convert_jenkins_to_gha
-from report_generator import generate_conversion_report
+from collections import deque
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator, Callable, Set, TYPE_CHECKING
+from instrumentation import (
+    span, tracing, profiled, start_trace, finish_trace, phase_breakdown, print_breakdown
+)
 # from enhanced_report_generator import generate_enhanced_conversion_report
 
+# The converter, yaml, the report generators and the process pool are
+# imported where they are used, so the usage message, option errors and
+# small conversions don't pay for what they never touch (see
+# benchmark.py --startup)
+if TYPE_CHECKING:
+    from utils import PipelineAnalysis
+    from conversion_cache import StageCache
 
-def cleanup_generated_actions(output_dir: Path):
-    """Clean up generated actions by removing duplicates and fixing variables"""
-    actions_dir = output_dir / ".github" / "actions"
-    if not actions_dir.exists():
-        return
-    
-    for action_dir in actions_dir.iterdir():
-        if action_dir.is_dir():
-            action_file = action_dir / "action.yml"
-            if action_file.exists():
-                with action_file.open('r') as f:
-                    content = f.read()
-                
-                # Fix variable references
-                fixes = [
-                    (r'\$\{\{\s*inputs\.APP_NAME\s*\}\}', '${{ inputs.app-name }}'),
-                    (r'\$\{\{\s*inputs\.DEPLOY_ENV\s*\}\}', '${{ inputs.deploy-env }}'),
-                    (r'\$\{\{\s*inputs\.KCONFIG\s*\}\}', '${{ inputs.kubeconfig }}'),
-                ]
-                
-                for pattern, replacement in fixes:
-                    content = re.sub(pattern, replacement, content)
-                
-                with action_file.open('w') as f:
-                    f.write(content)
+
+def render_workflow(gha: Dict[str, Any]) -> str:
+    """Workflow YAML text for a converted pipeline"""
+    from output_writer import dump_yaml
+    return dump_yaml(gha, allow_unicode=True)
 
 
 def interactive_mode():
@@ -66,15 +57,313 @@ def interactive_mode():
     return [source], Path(output), cleanup
 
 
+# Command line options taking a value: key -> (flags, type, default)
+VALUE_OPTIONS = {
+    "jobs": (("-j", "--jobs"), int, 1),
+    "output": (("-o", "--output"), Path, None),
+    "cache_dir": (("--cache-dir",), Path, None),
+    "cprofile_dir": (("--cprofile",), Path, None),
+    "parser": (("--parser",), str, None),
+    "jsonl": (("--jsonl",), str, None),
+}
+# Command line options that may be given several times: key -> flags
+LIST_OPTIONS = {
+    "include": ("--include",),
+    "exclude": ("--exclude",),
+}
+# Boolean command line switches: key -> flags
+FLAG_OPTIONS = {
+    "no_cache": ("--no-cache",),
+    "profile": ("--profile",),
+    "watch": ("--watch",),
+}
+
+PROFILE_TRACE_NAME = "conversion-trace.json"
+
+# --watch: seconds between polls of the inputs, and how long they must stay
+# unchanged after a change before converting (editors save in bursts)
+WATCH_INTERVAL = 0.5
+WATCH_DEBOUNCE = 0.3
+
+
+class WatchState:
+    """What --watch keeps between re-runs.
+
+    The --jobs worker pool stays up for the whole session, so the workers'
+    in-memory stage analysis caches survive from one run to the next. The
+    last conversion of every file is remembered; files not in changed are
+    reused from it without being read or converted again.
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.results: Dict[Path, Dict[str, Any]] = {}
+        self.changed: Optional[Set[Path]] = None   # None converts every input
+
+    def reusable(self, jenkinsfile: Path) -> Optional[Dict[str, Any]]:
+        """The remembered conversion of an unchanged file, if there is one"""
+        if self.changed is None or jenkinsfile in self.changed:
+            return None
+        return self.results.get(jenkinsfile)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+def workflow_name_for(jenkinsfile: Path) -> str:
+    """Workflow file stem generated for a Jenkinsfile"""
+    workflow_name = jenkinsfile.stem.replace('.', '-').lower()
+    return 'ci' if workflow_name == 'jenkinsfile' else workflow_name
+
+
+def iter_prefetched(items: Iterable[Any], start: Callable[[Any], Any], depth: int) -> Iterator[Tuple[Any, Any]]:
+    """(item, start(item)) pairs in input order, with start called up to depth items ahead.
+
+    Items are pulled from the iterator only as they are needed, so a slow
+    producer (directory discovery) overlaps with the consumer; when start
+    submits work to a pool, the workers keep busy on the next items.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, start(item)))
+        if len(pending) > depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def parse_cli_options(argv: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Split command line flags from positional file/directory arguments"""
+    options: Dict[str, Any] = {key: default for key, (_, _, default) in VALUE_OPTIONS.items()}
+    options.update({key: [] for key in LIST_OPTIONS})
+    options.update({key: False for key in FLAG_OPTIONS})
+    value_flags = {flag: key for key, (flags, _, _) in VALUE_OPTIONS.items() for flag in flags}
+    list_flags = {flag: key for key, flags in LIST_OPTIONS.items() for flag in flags}
+    switch_flags = {flag: key for key, flags in FLAG_OPTIONS.items() for flag in flags}
+    
+    positional = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, has_value, inline_value = arg.partition("=")
+        if name in value_flags:
+            key = value_flags[name]
+            if not has_value:
+                i += 1
+                inline_value = argv[i] if i < len(argv) else ""
+            _, value_type, _ = VALUE_OPTIONS[key]
+            try:
+                options[key] = value_type(inline_value)
+            except ValueError:
+                print(f"Error: {name} expects a {value_type.__name__}, got '{inline_value}'")
+                sys.exit(1)
+        elif name in list_flags:
+            if not has_value:
+                i += 1
+                inline_value = argv[i] if i < len(argv) else ""
+            options[list_flags[name]].append(inline_value)
+        elif arg in switch_flags:
+            options[switch_flags[arg]] = True
+        else:
+            positional.append(arg)
+        i += 1
+    
+    if options["jobs"] <= 0:
+        options["jobs"] = os.cpu_count() or 1
+    return options, positional
+
+
+def convert_file(jenkins_text: str, output_dir: Path, capture_output: bool = False,
+                 trace_label: Optional[str] = None, cprofile_path: Optional[Path] = None,
+                 parser: Optional[str] = None, stage_cache: Optional["StageCache"] = None) -> Dict[str, Any]:
+    """Convert one Jenkinsfile's text; runs in-process or in a --jobs worker process.
+
+    Composite action writes are returned instead of performed so the parent can
+    write them in input order (and cache them). Worker processes also capture
+    converter warnings so they are printed next to the file they belong to.
+    With trace_label, timing spans are recorded into a trace of their own
+    (workers cannot add to the parent's trace); with cprofile_path the
+    conversion also runs under cProfile. parser names the IR backend;
+    stage_cache (see conversion_cache) lets unchanged stages skip conversion.
+    """
+    from converter import convert_pipeline, get_parser, DEFAULT_PARSER
+    from utils import PipelineAnalysis
+    from action_generator import get_extraction_stats
+    from action_store import ActionStore
+    
+    started = time.perf_counter()
+    stats_before = get_extraction_stats()
+    stage_stats_before = stage_cache.stats() if stage_cache else {}
+    log = io.StringIO()
+    deferred_writes: List[Tuple[Path, Dict[str, Any], Optional[str]]] = []
+    action_store = ActionStore()
+    
+    # Parse once into the pipeline IR and analyze once, then convert
+    with contextlib.redirect_stdout(log) if capture_output else contextlib.nullcontext(), \
+            tracing(trace_label, enabled=trace_label is not None) as trace, \
+            profiled(cprofile_path and str(cprofile_path)):
+        pipeline = get_parser(parser or DEFAULT_PARSER)(jenkins_text, stage_cache)
+        analysis = PipelineAnalysis.for_pipeline(pipeline)
+        gha, action_paths = convert_pipeline(pipeline, output_dir, deferred_writes, analysis, action_store, stage_cache)
+    
+    stats_after = get_extraction_stats()
+    stage_stats_after = stage_cache.stats() if stage_cache else {}
+    return {
+        "analysis": analysis,
+        "workflow": gha,
+        "action_paths": action_paths,
+        "log": log.getvalue(),
+        "action_writes": deferred_writes,
+        "actions_shared": action_store.shared,
+        "extraction_stats": {k: stats_after[k] - stats_before[k] for k in stats_after},
+        "stage_cache": {k: stage_stats_after[k] - stage_stats_before[k] for k in stage_stats_after},
+        "seconds": time.perf_counter() - started,
+        "trace": trace.to_dict() if trace else None,
+    }
+
+
+def render_conversion(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Workflow and composite action YAML of a convert_file result, for JSON output"""
+    from action_generator import render_composite_action
+    return {
+        "workflow": render_workflow(result["workflow"]),
+        "actions": {
+            action_file.as_posix(): rendered if rendered is not None else render_composite_action(action_def)
+            for action_file, action_def, rendered in result["action_writes"]
+        },
+        "action_paths": result["action_paths"],
+        "warnings": result["log"],
+        "seconds": result["seconds"],
+    }
+
+
+def parser_option(options: Dict[str, Any]) -> str:
+    """The --parser backend name, exiting on an unknown one"""
+    from converter import PARSER_BACKENDS, DEFAULT_PARSER
+    parser = options["parser"] or DEFAULT_PARSER
+    if parser not in PARSER_BACKENDS:
+        print(f"Error: --parser expects one of {', '.join(PARSER_BACKENDS)}, got '{parser}'")
+        sys.exit(1)
+    return parser
+
+
+# Keys holding the pipeline text in a --jsonl record, in order of preference
+JSONL_TEXT_KEYS = ("jenkinsfile_text", "jenkinsfile")
+
+
+def convert_record(line: str, line_number: int, parser: Optional[str] = None) -> Tuple[bool, str]:
+    """Convert one --jsonl record; returns (converted, JSON result line).
+
+    Runs in-process or in a --jobs worker. Bad records and failed
+    conversions produce an error result instead of raising, so one record
+    cannot stop a batch.
+    """
+    import json
+    from aggregate_report import summarize_pipeline
+    
+    record_id = None
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        record_id = record.get("id")
+        jenkins_text = next((record[key] for key in JSONL_TEXT_KEYS if isinstance(record.get(key), str)), None)
+        if jenkins_text is None:
+            raise ValueError("expected a 'jenkinsfile_text' string")
+        result = convert_file(jenkins_text, Path("."), capture_output=True, parser=parser)
+        analysis = summarize_pipeline(str(record_id), result["analysis"], result["action_paths"], result["seconds"])
+        for key in ("file", "status", "seconds"):
+            del analysis[key]
+        name = workflow_name_for(Path(str(record.get("name") or "Jenkinsfile")))
+        response = {
+            "id": record_id,
+            "ok": True,
+            "workflow_path": f".github/workflows/{name}.yml",
+            **render_conversion(result),
+            "analysis": analysis,
+        }
+    except Exception as e:
+        response = {"id": record_id, "ok": False, "line": line_number, "error": str(e)}
+    return response["ok"], json.dumps(response, ensure_ascii=False)
+
+
+def run_jsonl_batch(source: str, parser: str, jobs: int = 1) -> Tuple[int, int]:
+    """Convert newline-delimited JSON records from a file ('-' for stdin).
+
+    One result line per record is written to stdout in input order;
+    nothing is written to disk. Records are read as they are needed and at
+    most 2x jobs are in flight, so memory stays bounded however long the
+    input is. Returns (converted, failed) counts.
+    """
+    converted = failed = 0
+    executor = None
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    
+    def start(record: Tuple[int, str]):
+        number, line = record
+        if executor:
+            return executor.submit(convert_record, line, number, parser)
+        return convert_record(line, number, parser)
+    
+    with contextlib.nullcontext(sys.stdin) if source == "-" else open(source, encoding="utf-8") as stream:
+        records = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+        try:
+            for _, outcome in iter_prefetched(records, start, 2 * jobs if executor else 0):
+                ok, result_line = outcome.result() if executor else outcome
+                sys.stdout.write(result_line + "\n")
+                if ok:
+                    converted += 1
+                else:
+                    failed += 1
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+    sys.stdout.flush()
+    return converted, failed
+
+
 def main():
+    options, argv = parse_cli_options(sys.argv[1:])
+    
+    # Batch mode: JSON lines in, JSON lines out, no files written
+    if options["jsonl"] is not None:
+        if argv:
+            print(f"Error: --jsonl takes no file arguments, got {' '.join(argv)}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            converted, failed = run_jsonl_batch(options["jsonl"], parser_option(options), options["jobs"])
+        except OSError as e:
+            print(f"❌ File Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📋 {converted} record(s) converted, {failed} failed", file=sys.stderr)
+        sys.exit(1 if failed and not converted else 0)
+    
     # Check for interactive mode
-    if len(sys.argv) == 1 or (len(sys.argv) == 2 and sys.argv[1] in ['-i', '--interactive']):
-        if len(sys.argv) == 1:
+    if len(argv) == 0 or (len(argv) == 1 and argv[0] in ['-i', '--interactive']):
+        if len(argv) == 0:
             print("Enhanced Jenkins to GitHub Actions Converter")
-            print("Usage: python main.py <jenkinsfile1|directory> [jenkinsfile2] ... [output_directory]")
+            print("Usage: python main.py [options] <jenkinsfile1|directory> [jenkinsfile2] ... [output_directory]")
             print("       python main.py -i  (interactive mode)")
+            print("\nOptions:")
+            print("  -j, --jobs N       Convert files in N worker processes (0 = one per CPU)")
+            print("  -o, --output DIR   Output directory (may already exist, e.g. for incremental re-runs)")
+            print("  --cache-dir DIR    Conversion cache location (default: <output>/.conversion-cache)")
+            print("  --no-cache         Convert every file even if it is unchanged since the last run")
+            print(f"  --profile          Print a per-phase timing breakdown and write <output>/{PROFILE_TRACE_NAME}")
+            print("  --cprofile DIR     Also run each conversion under cProfile, writing DIR/<workflow>.pstats")
+            print("  --parser NAME      Pipeline parser backend: regex (default) or grammar")
+            print("  --jsonl FILE       Batch mode: read {\"id\", \"jenkinsfile_text\"} JSON lines from FILE ('-' for")
+            print("                     stdin) and write one JSON result per line to stdout")
+            print("  --include GLOB     File names to convert in directories (repeatable; default:")
+            print("                     *.Jenkinsfile, *jenkinsfile*, Jenkinsfile*)")
+            print("  --exclude GLOB     Skip matching files and directories, by name or relative path (repeatable)")
+            print("  --watch            Convert, then re-convert whenever an input Jenkinsfile changes (Ctrl-C stops)")
             print("\nFeatures:")
-            print("  - Multiple Jenkins file and directory support")
+            print("  - Multiple Jenkins file and recursive directory support")
             print("  - Interactive mode for guided conversion")
             print("  - Comprehensive Jenkins feature support")
             print("  - Automatic variable conversion and cleanup")
@@ -84,33 +373,23 @@ def main():
             if cleanup and output_dir.exists():
                 import shutil
                 shutil.rmtree(output_dir / ".github", ignore_errors=True)
-                for f in output_dir.glob("CONVERSION_REPORT.*"):
+                for f in [*output_dir.glob("CONVERSION_REPORT.*"), *output_dir.glob("CONVERSION_SUMMARY.*")]:
                     f.unlink()
     else:
-        args = sys.argv[1:]
+        args = argv
 
-    # Parse arguments and find Jenkins files
-    jenkinsfiles = []
-    if 'output_dir' not in locals():
+    # Parse arguments; directories are searched while converting
+    inputs = []
+    if options["output"] is not None:
+        output_dir = options["output"]
+    elif 'output_dir' not in locals():
         output_dir = Path(".")
     
-    # Separate directories, files, and output directory
+    # Separate inputs (files and directories) and output directory
     for arg in args:
         path = Path(arg)
-        if path.is_dir():
-            # Find Jenkins files in directory
-            jenkins_patterns = ['*.Jenkinsfile', '*jenkinsfile*', 'Jenkinsfile*']
-            found_files = []
-            for pattern in jenkins_patterns:
-                found_files.extend(path.glob(pattern))
-            
-            if found_files:
-                jenkinsfiles.extend(found_files)
-                print(f"Found {len(found_files)} Jenkins file(s) in {path}")
-            else:
-                print(f"No Jenkins files found in directory: {path}")
-        elif path.exists():
-            jenkinsfiles.append(path)
+        if path.exists():
+            inputs.append(path)
         elif not path.exists() and len(args) > 1 and arg == args[-1]:
             # Last argument that doesn't exist - treat as output directory
             output_dir = path
@@ -118,77 +397,331 @@ def main():
             print(f"Error: File not found: {path}")
             sys.exit(1)
     
-    if not jenkinsfiles:
+    if not inputs:
         print("Error: No Jenkins files found to convert")
         sys.exit(1)
     
+    parser = parser_option(options)
+    if options["watch"]:
+        watch_inputs(inputs, output_dir, options, parser)
+    else:
+        convert_inputs(inputs, output_dir, options, parser)
+
+
+def snapshot_inputs(inputs: List[Path], options: Dict[str, Any]) -> Dict[Path, Tuple[int, int]]:
+    """(mtime, size) of every Jenkinsfile found in inputs"""
+    from discovery import iter_inputs, DEFAULT_INCLUDE
+    snapshot = {}
+    for path in iter_inputs(inputs, options["include"] or DEFAULT_INCLUDE, options["exclude"]):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def watch_inputs(inputs: List[Path], output_dir: Path, options: Dict[str, Any], parser: str,
+                 interval: float = WATCH_INTERVAL, debounce: float = WATCH_DEBOUNCE):
+    """Convert inputs, then convert again whenever a Jenkinsfile is added, edited or removed.
+
+    Inputs are polled every interval seconds; after a change the conversion
+    waits until they have been stable for debounce seconds. Only changed
+    files are converted again (see WatchState), and their unchanged stages
+    reuse the extractor results kept in memory by this process or by the
+    --jobs workers, so a re-run mostly costs the edit.
+    """
+    from action_generator import enable_stage_analysis_cache
+    enable_stage_analysis_cache()
+    state = WatchState()
+    
+    def run():
+        started = time.perf_counter()
+        try:
+            convert_inputs(inputs, output_dir, options, parser, state)
+        except SystemExit:
+            pass  # already reported; keep watching for a fix
+        print(f"⏱️  Converted in {time.perf_counter() - started:.3f}s")
+    
+    snapshot = snapshot_inputs(inputs, options)
+    run()
+    try:
+        while True:
+            print(f"\n👀 Watching {len(snapshot)} Jenkins file(s) for changes (Ctrl-C to stop)...")
+            current = snapshot
+            while current == snapshot:
+                time.sleep(interval)
+                current = snapshot_inputs(inputs, options)
+            # Wait for a burst of saves to settle
+            while True:
+                time.sleep(debounce)
+                settled = snapshot_inputs(inputs, options)
+                if settled == current:
+                    break
+                current = settled
+            changed = sorted(path for path in snapshot.keys() | current.keys() if snapshot.get(path) != current.get(path))
+            snapshot = current
+            print(f"\n🔄 Changed: {', '.join(str(path) for path in changed)}")
+            state.changed = set(changed)
+            run()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        state.close()
+
+
+def convert_inputs(inputs: List[Path], output_dir: Path, options: Dict[str, Any], parser: str,
+                   watch: Optional[WatchState] = None):
+    """Convert every Jenkinsfile in inputs into output_dir and write the reports.
+
+    Under --watch, watch carries the worker pool and the previous run's
+    results, and files it reports unchanged are reused instead of converted.
+    Exits (SystemExit) when no file could be converted.
+    """
+    from converter import DEFAULT_PARSER, CONVERTER_VERSION
+    from utils import PipelineAnalysis
+    from report_generator import write_conversion_report
+    from aggregate_report import AggregateReport
+    from action_generator import write_composite_action, enable_stage_analysis_cache
+    from action_store import ActionStore, remap_action_refs
+    from output_writer import OutputWriter, yaml_backend
+    from conversion_cache import ConversionCache, StageCache, DEFAULT_CACHE_DIRNAME, STAGE_CACHE_DIRNAME
+    from discovery import iter_inputs, DEFAULT_INCLUDE
+    
     output_dir.mkdir(parents=True, exist_ok=True)
-    print(f"Converting {len(jenkinsfiles)} Jenkins file(s) to GitHub Actions...")
+    print("Converting Jenkins files to GitHub Actions...")
     
     workflows_dir = output_dir / ".github" / "workflows"
     workflows_dir.mkdir(parents=True, exist_ok=True)
+    actions_dir = output_dir / ".github" / "actions"
     
     all_action_paths = []
     successful_conversions = 0
+    report_analysis = None
+    report_text = None
+    extraction_stats = {"computed": 0, "reused": 0}
+    stage_cache_stats = {"hits": 0, "misses": 0}
+    aggregate = AggregateReport()
+    
+    # --profile records timing spans for the whole run; --jobs workers return
+    # their own per-file traces, which are merged in at the end
+    profile = options["profile"]
+    run_trace = start_trace("main") if profile else None
+    worker_traces: List[Dict[str, Any]] = []
+    cprofile_dir = options["cprofile_dir"]
+    if cprofile_dir:
+        cprofile_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Incremental conversion: unchanged Jenkinsfiles are served from the cache,
+    # and changed ones only convert the stages that changed; entries are kept
+    # apart per parser backend
+    cache = stage_cache = None
+    if not options["no_cache"]:
+        cache_version = CONVERTER_VERSION if parser == DEFAULT_PARSER else f"{CONVERTER_VERSION}+{parser}"
+        cache_dir = options["cache_dir"] or output_dir / DEFAULT_CACHE_DIRNAME
+        cache = ConversionCache(cache_dir, version=cache_version)
+        stage_cache = StageCache(cache_dir / STAGE_CACHE_DIRNAME, version=cache_version)
+    
+    # Composite actions are named run-wide: identical definitions from any
+    # file are written once, different ones never overwrite each other
+    action_store = ActionStore()
+    actions_shared_in_files = 0
+    # Outputs are rendered in memory and only written when they changed
+    writer = OutputWriter()
+    
+    # Files are converted as discovery finds them. With --jobs, conversions
+    # run in a process pool a bounded number of files ahead; results are
+    # still consumed in discovery order so output and numbering stay
+    # deterministic.
+    jobs = options["jobs"]
+    executor = watch.executor if watch else None
+    workflow_names = set()
+    reused_from_watch = 0
+    seen: Set[Path] = set()
+    
+    def prepare(jenkinsfile: Path):
+        """Name, read and cache-check a discovered file; with --jobs, submit its conversion"""
+        nonlocal executor
+        # Same-named files from different directories get numbered workflows
+        base_name = workflow_name = workflow_name_for(jenkinsfile)
+        number = 1
+        while workflow_name in workflow_names:
+            number += 1
+            workflow_name = f"{base_name}-{number}"
+        workflow_names.add(workflow_name)
+        cprofile_path = cprofile_dir / f"{workflow_name}.pstats" if cprofile_dir else None
+        remembered = watch.reusable(jenkinsfile) if watch else None
+        if remembered is not None:
+            return workflow_name, cprofile_path, remembered["text"], None, remembered, None
+        with span("read_source", file=jenkinsfile.name):
+            try:
+                jenkins_text = jenkinsfile.read_text(encoding="utf-8")
+            except Exception:
+                return workflow_name, cprofile_path, None, None, None, None
+            cache_key = cache.key(jenkins_text) if cache else None
+            cached = cache.get(cache_key) if cache else None
+        future = None
+        if cached is None and jobs > 1:
+            if executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                # A --watch session keeps its pool, so workers cache stage extractor results
+                executor = ProcessPoolExecutor(max_workers=jobs,
+                                               initializer=enable_stage_analysis_cache if watch else None)
+                if watch:
+                    watch.executor = executor
+                print(f"Using {jobs} worker processes")
+            future = executor.submit(convert_file, jenkins_text, output_dir, True,
+                                     str(jenkinsfile) if profile else None, cprofile_path, parser, stage_cache)
+        return workflow_name, cprofile_path, jenkins_text, cache_key, cached, future
+    
+    discovered = iter_inputs(inputs, options["include"] or DEFAULT_INCLUDE, options["exclude"])
+    files_seen = 0
     
     try:
-        for i, jenkinsfile in enumerate(jenkinsfiles):
-            print(f"\n📁 Processing {jenkinsfile.name} ({i+1}/{len(jenkinsfiles)})...")
+        for jenkinsfile, prepared in iter_prefetched(discovered, prepare, 2 * jobs if jobs > 1 else 0):
+            workflow_name, cprofile_path, jenkins_text, cache_key, cached, future = prepared
+            files_seen += 1
+            seen.add(jenkinsfile)
+            print(f"\n📁 Processing {jenkinsfile} (#{files_seen})...")
             
             try:
-                jenkins_text = jenkinsfile.read_text(encoding="utf-8")
-                print("Analyzing pipeline structure and features...")
-                
-                # Perform the conversion
-                gha, action_paths = convert_jenkins_to_gha(jenkins_text, output_dir)
+                if jenkins_text is None:
+                    jenkinsfile.read_text(encoding="utf-8")  # re-raise the read error
+                if cached is not None and "error" in cached:
+                    raise ValueError(cached["error"])  # failed in the previous --watch run
                 
                 # Generate workflow filename
-                workflow_name = jenkinsfile.stem.replace('.', '-').lower()
-                if workflow_name == 'jenkinsfile':
-                    workflow_name = 'ci'
                 workflow_path = workflows_dir / f"{workflow_name}.yml"
                 
-                # Save workflow file
-                print(f"Generating workflow file: {workflow_path.name}")
-                with workflow_path.open("w", encoding="utf-8") as f:
-                    yaml.dump(gha, f, sort_keys=False, width=1000, default_flow_style=False, allow_unicode=True)
+                if cached is not None:
+                    print("Unchanged since last run - using cached conversion")
+                    gha, action_paths = cached["workflow"], cached["action_paths"]
+                    # Outputs are restored if they went missing, were edited, or
+                    # their action directory was renamed by this run's collisions
+                    with span("cache_restore", file=jenkinsfile.name):
+                        renames = {}
+                        actions = {}
+                        for rel_path, action_def in cached["actions"].items():
+                            cached_name = Path(rel_path).parent.name
+                            name, is_new = action_store.put(cached_name, action_def)
+                            renames[cached_name] = name
+                            action_file = actions_dir / name / "action.yml"
+                            if is_new:
+                                write_composite_action(action_file, action_def, writer)
+                            actions[action_file.relative_to(output_dir).as_posix()] = action_def
+                        remap_action_refs(gha, action_paths, renames)
+                        writer.write_text(workflow_path, render_workflow(gha))
+                    print(f"✅ Workflow up to date: {workflow_path}")
+                    if "analysis" in cached:
+                        reused_from_watch += 1
+                        analysis = cached["analysis"]
+                    else:
+                        analysis = PipelineAnalysis(jenkins_text)
+                    seconds = None
+                else:
+                    print("Analyzing pipeline structure and features...")
+                    
+                    # Perform the conversion
+                    if future is not None:
+                        with span("await_worker", file=jenkinsfile.name):
+                            result = future.result()
+                        if result["trace"]:
+                            worker_traces.append(result["trace"])
+                    else:
+                        with span("convert_file", file=jenkinsfile.name):
+                            result = convert_file(jenkins_text, output_dir, cprofile_path=cprofile_path, parser=parser,
+                                                  stage_cache=stage_cache)
+                    gha, action_paths = result["workflow"], result["action_paths"]
+                    if result["log"]:
+                        print(result["log"], end="")
+                    renames = {}
+                    actions = {}
+                    for action_file, action_def, rendered in result["action_writes"]:
+                        name, is_new = action_store.put(action_file.parent.name, action_def)
+                        renames[action_file.parent.name] = name
+                        action_file = actions_dir / name / "action.yml"
+                        if is_new:
+                            write_composite_action(action_file, action_def, writer, rendered)
+                        actions[action_file.relative_to(output_dir).as_posix()] = action_def
+                    remap_action_refs(gha, action_paths, renames)
+                    actions_shared_in_files += result["actions_shared"]
+                    for key, value in result["extraction_stats"].items():
+                        extraction_stats[key] += value
+                    for key, value in result["stage_cache"].items():
+                        stage_cache_stats[key] += value
+                    analysis, seconds = result["analysis"], result["seconds"]
+                    
+                    # Save workflow file
+                    print(f"Generating workflow file: {workflow_path.name}")
+                    with span("render_workflow", file=jenkinsfile.name):
+                        workflow_text = render_workflow(gha)
+                    with span("write_workflow", file=jenkinsfile.name):
+                        writer.write_text(workflow_path, workflow_text)
+                    
+                    print(f"✅ Workflow saved to: {workflow_path}")
+                    
+                    if cache:
+                        with span("cache_store", file=jenkinsfile.name):
+                            cache.put(cache_key, gha, action_paths, actions)
                 
-                print(f"✅ Workflow saved to: {workflow_path}")
+                if watch:
+                    watch.results[jenkinsfile] = {"text": jenkins_text, "workflow": gha, "action_paths": action_paths,
+                                                  "actions": actions, "analysis": analysis}
+                
+                # The per-pipeline report covers the first converted file
+                if report_text is None:
+                    report_text, report_analysis = jenkins_text, analysis
+                aggregate.add(str(jenkinsfile), analysis, action_paths, seconds, cached=cached is not None)
                 all_action_paths.extend(action_paths)
                 successful_conversions += 1
                 
             except Exception as e:
                 print(f"❌ Failed to convert {jenkinsfile.name}: {e}")
+                aggregate.add_failure(str(jenkinsfile), str(e))
+                if watch:
+                    watch.results[jenkinsfile] = {"text": jenkins_text, "error": str(e)}
                 continue
         
+        if watch:
+            watch.results = {path: result for path, result in watch.results.items() if path in seen}
+        elif executor:
+            executor.shutdown()
+        
+        if files_seen == 0:
+            print("Error: No Jenkins files found to convert")
+            sys.exit(1)
         if successful_conversions == 0:
             print("❌ No files were successfully converted")
             sys.exit(1)
         
-        # Clean up generated actions
-        print("\nCleaning up generated actions...")
-        cleanup_generated_actions(output_dir)
-        
         # Generate comprehensive conversion reports
-        print("Generating conversion reports...")
+        print("\nGenerating conversion reports...")
         
         # Generate combined report for all conversions
         html_report_path = output_dir / "CONVERSION_REPORT.html"
         md_report_path = output_dir / "CONVERSION_REPORT.md"
         
-        # Use the first successful conversion for report generation
-        sample_jenkins_text = jenkinsfiles[0].read_text(encoding="utf-8") if jenkinsfiles else ""
+        with span("report_html"):
+            with writer.stream_text(html_report_path) as html_report:
+                write_conversion_report(html_report, all_action_paths, report_text, analysis=report_analysis)
         
-        html_report = generate_conversion_report(all_action_paths, sample_jenkins_text)
-        with html_report_path.open("w", encoding="utf-8") as f:
-            f.write(html_report)
+        with span("report_markdown"):
+            md_report = generate_simple_markdown_report(all_action_paths, report_text, report_analysis)
+            writer.write_text(md_report_path, md_report)
         
-        md_report = generate_simple_markdown_report(all_action_paths, sample_jenkins_text)
-        with md_report_path.open("w", encoding="utf-8") as f:
-            f.write(md_report)
+        # Batch runs also get an org-wide summary of every pipeline
+        summary_paths = []
+        if files_seen > 1:
+            summary_paths = [output_dir / "CONVERSION_SUMMARY.html", output_dir / "CONVERSION_SUMMARY.md"]
+            with span("report_summary"):
+                with writer.stream_text(summary_paths[0]) as summary_html:
+                    aggregate.write_html(summary_html)
+                writer.write_text(summary_paths[1], aggregate.markdown())
         
         print(f"✅ Conversion reports generated:")
         print(f"   - Interactive HTML: {html_report_path}")
+        if summary_paths:
+            print(f"   - Batch summary: {summary_paths[0]}")
         
         # Display summary of generated files
         print("\n📁 Generated files:")
@@ -196,9 +729,10 @@ def main():
             print(f"   - {workflow_file.relative_to(output_dir)} (Workflow)")
         print(f"   - {html_report_path.relative_to(output_dir)} (Report)")
         print(f"   - {md_report_path.relative_to(output_dir)} (Report)")
+        for summary_path in summary_paths:
+            print(f"   - {summary_path.relative_to(output_dir)} (Batch summary)")
         
         # List generated composite actions
-        actions_dir = output_dir / ".github" / "actions"
         action_count = 0
         if actions_dir.exists():
             for action_dir in actions_dir.iterdir():
@@ -210,9 +744,19 @@ def main():
         
         # Display conversion summary
         print(f"\n📊 Conversion Summary:")
-        print(f"   - Jenkins files processed: {successful_conversions}/{len(jenkinsfiles)}")
+        print(f"   - Jenkins files processed: {successful_conversions}/{files_seen}")
         print(f"   - Total stages converted: {len(all_action_paths)}")
         print(f"   - Composite actions created: {action_count}")
+        if cache:
+            print(f"   - Conversion cache: {cache.hits} unchanged file(s) reused, {cache.misses} converted")
+            print(f"   - Stage cache: {stage_cache_stats['hits']} unchanged stage(s) reused, "
+                  f"{stage_cache_stats['misses']} converted")
+        if watch:
+            print(f"   - Watch: {reused_from_watch} unchanged file(s) kept from the previous run")
+        print(f"   - Stage extractor calls: {extraction_stats['computed']} run, {extraction_stats['reused']} saved by reuse")
+        print(f"   - Output files: {writer.summary()}")
+        print(f"   - Composite action writes avoided: {action_store.shared + actions_shared_in_files} "
+              f"(identical actions shared), {action_store.renamed} renamed on name collisions")
         
         # Check for manual conversion requirements
         manual_items = sum(len(a.get("manual_conversion_needed", [])) for a in all_action_paths)
@@ -230,6 +774,22 @@ def main():
         if all_credentials:
             print(f"   - GitHub Secrets to configure: {len(all_credentials)}")
         
+        if run_trace is not None:
+            traces = [finish_trace(run_trace).to_dict()] + worker_traces
+            phases = phase_breakdown(traces)
+            trace_path = output_dir / PROFILE_TRACE_NAME
+            import json
+            with trace_path.open("w", encoding="utf-8") as f:
+                json.dump({"phases": phases, "traces": traces, "yaml_backend": yaml_backend()}, f, indent=1)
+            print(f"\n⏱️  Timing breakdown ({run_trace.duration:.3f}s wall clock):")
+            print_breakdown(phases)
+            print(f"   - YAML backend: {yaml_backend()}")
+            if executor:
+                print("   (await_worker is time spent waiting; worker phases run concurrently)")
+            print(f"   - Timing trace: {trace_path}")
+        if cprofile_dir:
+            print(f"   - cProfile stats: {cprofile_dir}/*.pstats (view with: python -m pstats FILE)")
+        
         print(f"\n🎯 Next Steps:")
         print(f"   1. Review generated workflow files in .github/workflows/")
         print(f"   2. Configure GitHub Secrets as needed")
@@ -273,15 +833,18 @@ def main():
         sys.exit(1)
 
 
-def generate_simple_markdown_report(action_paths: List[Dict[str, Any]], pipeline_text: str) -> str:
+def generate_simple_markdown_report(action_paths: List[Dict[str, Any]], pipeline_text: str,
+                                    analysis: Optional["PipelineAnalysis"] = None) -> str:
     """Generate a simple markdown report for compatibility"""
     
     from datetime import datetime
-    from utils import analyze_pipeline_complexity, validate_conversion_feasibility
     
+    if analysis is None:
+        from utils import PipelineAnalysis
+        analysis = PipelineAnalysis(pipeline_text)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    complexity_analysis = analyze_pipeline_complexity(pipeline_text)
-    feasibility_analysis = validate_conversion_feasibility(pipeline_text)
+    complexity_analysis = analysis.complexity
+    feasibility_analysis = analysis.feasibility
     
     report = [
         "# Jenkins to GitHub Actions Conversion Report",
@@ -3,13 +3,17 @@ import json
 from datetime import datetime, timedelta
 import random
 
+# This script is also fetched and run on its own in CI, so it doesn't import
+# output_writer; LibYAML's loader is used directly when PyYAML has it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class SimpleWorkflowMetricsGenerator:
     def __init__(self, workflow_yaml_path: str = None, workflow_yaml_content: str = None):
         if workflow_yaml_content:
-            self.workflow_data = yaml.safe_load(workflow_yaml_content)
+            self.workflow_data = yaml.load(workflow_yaml_content, Loader=_YAML_LOADER)
         elif workflow_yaml_path:
             with open(workflow_yaml_path, 'r') as file:
-                self.workflow_data = yaml.safe_load(file)
+                self.workflow_data = yaml.load(file, Loader=_YAML_LOADER)
         else:
             raise ValueError("Either workflow_yaml_path or workflow_yaml_content must be provided")
         
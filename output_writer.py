@@ -0,0 +1,196 @@
+"""
+Write-if-changed output layer for generated files
+
+Outputs are rendered to memory and compared with what is already on disk;
+only new or changed files are written, through a temp file renamed into
+place. Unchanged files keep their mtimes (no churn in git-tracked or
+network-mounted output dirs) and readers never see a partial file.
+Timestamped reports, which differ on every run, skip the comparison and are
+streamed straight into a temp file instead of being built in memory.
+
+YAML is emitted and parsed with the LibYAML C bindings when PyYAML was
+built with them, falling back to the pure-Python classes. Documents the two
+emitters would render differently (see _needs_pure_dumper) are always
+dumped with the pure-Python dumper, so the text never depends on the
+backend (tests/test_yaml_parity.py, benchmark.py --yaml-check). yaml itself
+is imported on first use, keeping it out of CLI startup.
+"""
+
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, TextIO, Tuple
+
+
+NEW, UPDATED, UNCHANGED = "new", "updated", "unchanged"
+
+# Temp files are created 0600; give outputs the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+# Line width passed to the dumper; long values stay on one line
+YAML_WIDTH = 1000
+# libyaml escapes characters outside the BMP even with allow_unicode and
+# treats CR and NEL as line breaks where the pure-Python emitter does not
+_LIBYAML_DIVERGENT = re.compile("[\r\x85\U00010000-\U0010ffff]")
+# Strings the emitters may double-quote (special characters, or a space
+# next to a line break); the two fold such scalars at different points once
+# they reach YAML_WIDTH
+_MAY_DOUBLE_QUOTE = re.compile("[^\x20-\x7e\n]| \n|\n ")
+# Characters that may be escaped, taking up to 6 columns (\uXXXX)
+_ESCAPABLE = re.compile("[^\x20-\x7e]")
+# Widest double-quoted text that cannot reach YAML_WIDTH after a key and
+# nesting indent
+FOLD_SAFE_COLUMNS = YAML_WIDTH - 300
+# Both emitters turn keys of about 128 into "? key" complex keys, but libyaml
+# counts UTF-8 bytes and the pure-Python emitter characters plus quoting
+SIMPLE_KEY_SAFE_BYTES = 100
+
+
+@lru_cache(maxsize=None)
+def yaml_classes() -> Tuple[str, type, type]:
+    """(backend name, Dumper, Loader) of the fastest available YAML backend"""
+    import yaml
+    try:
+        from yaml import CSafeDumper, CSafeLoader
+        return "libyaml", CSafeDumper, CSafeLoader
+    except ImportError:
+        return "pure-python", yaml.SafeDumper, yaml.SafeLoader
+
+
+def yaml_backend() -> str:
+    """'libyaml' or 'pure-python'"""
+    return yaml_classes()[0]
+
+
+def _may_fold(text: str) -> bool:
+    """Whether text could be emitted as a double-quoted scalar wider than the line"""
+    if len(text) * 6 <= FOLD_SAFE_COLUMNS:
+        return False
+    return (len(text) + 5 * len(_ESCAPABLE.findall(text)) > FOLD_SAFE_COLUMNS
+            and _MAY_DOUBLE_QUOTE.search(text) is not None)
+
+
+def _needs_pure_dumper(data: Any) -> bool:
+    """Whether libyaml could emit data differently from the pure-Python dumper"""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if _LIBYAML_DIVERGENT.search(item) or _may_fold(item):
+                return True
+        elif isinstance(item, dict):
+            for key in item:
+                if isinstance(key, str) and len(key.encode("utf-8")) > SIMPLE_KEY_SAFE_BYTES:
+                    return True
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def dump_yaml(data: Any, allow_unicode: bool = False, dumper: Optional[type] = None) -> str:
+    """Block-style YAML text with keys in insertion order.
+
+    Without an explicit dumper the output is identical whichever backend is
+    installed: documents libyaml would render differently use the
+    pure-Python dumper.
+    """
+    import yaml
+    if dumper is None:
+        backend, dumper, _ = yaml_classes()
+        if backend == "libyaml" and _needs_pure_dumper(data):
+            dumper = yaml.SafeDumper
+    return yaml.dump(data, Dumper=dumper, sort_keys=False, width=YAML_WIDTH,
+                     default_flow_style=False, allow_unicode=allow_unicode)
+
+
+def load_yaml(stream: Any) -> Any:
+    """Parse YAML text or a file object with the fastest available loader"""
+    import yaml
+    return yaml.load(stream, Loader=yaml_classes()[2])
+
+
+@contextlib.contextmanager
+def atomic_open(path: Path, mode: str = "wb", **kwargs) -> Iterator[Any]:
+    """Open a temp file next to path; it replaces path when the block exits cleanly"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.chmod(tmp_name, FILE_MODE)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Replace path with data via a temp file in the same directory"""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def _existing_digest(path: Path, size: int) -> Optional[bytes]:
+    """Digest of the file at path, or None if it is missing or not size bytes long"""
+    try:
+        if path.stat().st_size != size:
+            return None
+        with path.open("rb") as f:
+            return hashlib.sha256(f.read()).digest()
+    except OSError:
+        return None
+
+
+class OutputWriter:
+    """Writes generated files only when their content changed.
+
+    The size is compared first and the content hash only on a size match,
+    so most changed files are detected without reading them.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {NEW: 0, UPDATED: 0, UNCHANGED: 0}
+
+    def write_bytes(self, path: Path, data: bytes) -> str:
+        """Write data to path if it differs; returns NEW, UPDATED or UNCHANGED"""
+        path = Path(path)
+        if not path.exists():
+            status = NEW
+        elif _existing_digest(path, len(data)) == hashlib.sha256(data).digest():
+            status = UNCHANGED
+        else:
+            status = UPDATED
+        if status != UNCHANGED:
+            atomic_write_bytes(path, data)
+        self.counts[status] += 1
+        return status
+
+    def write_text(self, path: Path, text: str) -> str:
+        return self.write_bytes(path, text.encode("utf-8"))
+
+    @contextlib.contextmanager
+    def stream_text(self, path: Path) -> Iterator[TextIO]:
+        """Write path from an open text file without comparing it first.
+
+        For outputs that embed a timestamp and so never match the previous
+        run; they are not held in memory just to find that out.
+        """
+        path = Path(path)
+        status = UPDATED if path.exists() else NEW
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            yield f
+        self.counts[status] += 1
+
+    def summary(self) -> str:
+        return ", ".join(f"{self.counts[status]} {status}" for status in (NEW, UPDATED, UNCHANGED))
@@ -0,0 +1,154 @@
+
+"""
+Single-pass keyword prefilter for tables of regular expressions
+
+Each pattern is reduced to a set of literal keywords, at least one of which
+appears in every match (derived from the parsed regex, so the pattern tables
+stay the only source of truth). The text is lowercased once and checked for
+all keywords; only patterns whose keywords were seen are then confirmed with
+their own regex, and pure-literal patterns need no confirmation at all.
+"""
+
+import re
+import string
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Hashable, FrozenSet, Pattern
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+
+
+def _best(current: Optional[List[str]], candidate: Optional[List[str]]) -> Optional[List[str]]:
+    """Prefer keyword sets whose shortest keyword is longest (most selective)"""
+    if not candidate:
+        return current
+    if current is None:
+        return candidate
+    score = (min(map(len, candidate)), -len(candidate))
+    return candidate if score > (min(map(len, current)), -len(current)) else current
+
+
+def _required_literals(items) -> Optional[List[str]]:
+    """Literal strings one of which occurs in every match of a parsed pattern"""
+    best = None
+    run: List[str] = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is sre_parse.AT:
+            # Zero-width assertions (\b, ^, $) keep neighbouring literals adjacent
+            continue
+        if run:
+            best = _best(best, ["".join(run)])
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            best = _best(best, _required_literals(av[-1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                best = _best(best, [keyword for branch in branches for keyword in branch])
+        elif op in _REPEATS and av[0] >= 1:
+            best = _best(best, _required_literals(av[2]))
+    if run:
+        best = _best(best, ["".join(run)])
+    return best
+
+
+def keywords_for(pattern: Pattern) -> Optional[List[str]]:
+    """Keywords (lowercase) one of which every match of pattern contains, or None"""
+    literals = _required_literals(sre_parse.parse(pattern.pattern, pattern.flags))
+    return sorted({keyword.lower() for keyword in literals}) if literals else None
+
+
+@lru_cache(maxsize=None)
+def _ascii_fold(ch: str) -> str:
+    """ASCII letter a non-ASCII character matches under re.IGNORECASE, else NUL.
+
+    str.lower() disagrees with re's case folding for a few characters (e.g.
+    U+017F LONG S matches 's', U+0130 lowercases to two characters), so
+    non-ASCII text is mapped with this before the keyword checks.
+    """
+    for letter in string.ascii_lowercase:
+        if re.fullmatch(re.escape(ch), letter, re.IGNORECASE):
+            return letter
+    return "\0"
+
+
+def _ascii_lower(text: str) -> str:
+    """Lowercased ASCII view of text for case-insensitive ASCII keyword search"""
+    if not text.isascii():
+        text = text.translate({ord(ch): _ascii_fold(ch) for ch in set(text) if ord(ch) > 127})
+    return text.lower()
+
+
+def _is_literal(pattern: Pattern) -> bool:
+    """True if pattern is a plain case-insensitive string (keyword hit == match)"""
+    if not pattern.flags & re.IGNORECASE:
+        return False
+    return all(op is sre_parse.LITERAL for op, _ in sre_parse.parse(pattern.pattern, pattern.flags))
+
+
+class PatternScanner:
+    """Find which of many named patterns match a text using one keyword pass"""
+
+    def __init__(self, patterns: Dict[Hashable, Pattern]):
+        self.patterns = patterns
+        self.exact = {key for key, pattern in patterns.items() if _is_literal(pattern)}
+        self.always = []                                   # patterns without a usable keyword
+        self.by_keyword: Dict[str, List[Hashable]] = {}
+        for key, pattern in patterns.items():
+            keywords = keywords_for(pattern)
+            if keywords is None:
+                self.always.append(key)
+                continue
+            for keyword in keywords:
+                self.by_keyword.setdefault(keyword, []).append(key)
+
+        self.keywords = sorted(self.by_keyword, key=lambda k: (-len(k), k))
+        # Non-ASCII keywords cannot use the ASCII fast path; scan for them
+        # with a case-insensitive lookahead at every offset instead
+        slow = [keyword for keyword in self.keywords if not keyword.isascii()]
+        self.slow_regex = re.compile(
+            "(?=(" + "|".join(re.escape(keyword) for keyword in slow) + "))", re.IGNORECASE
+        ) if slow else None
+
+    def keywords_present(self, text: str) -> FrozenSet[str]:
+        """All keywords occurring in text (case-insensitive)"""
+        # Substring checks on one lowercased copy run at C speed, unlike a
+        # case-insensitive alternation which re retries at every offset
+        lowered = _ascii_lower(text)
+        present = {keyword for keyword in self.keywords if keyword.isascii() and keyword in lowered}
+        if self.slow_regex is not None:
+            present.update(m.group(1).lower() for m in self.slow_regex.finditer(text))
+        return frozenset(present)
+
+    def candidates(self, text: str) -> FrozenSet[Hashable]:
+        """Keys of patterns that may match text (a superset of the real matches)"""
+        keys = set(self.always)
+        for keyword in self.keywords_present(text):
+            keys.update(self.by_keyword[keyword])
+        return frozenset(keys)
+
+    def matches(self, text: str) -> FrozenSet[Hashable]:
+        """Keys of patterns that match text, confirming non-literal candidates"""
+        return frozenset(
+            key for key in self.candidates(text)
+            if key in self.exact or self.patterns[key].search(text)
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        """Keyword derivation summary, for debugging the prefilter"""
+        return {
+            "patterns": len(self.patterns),
+            "keywords": len(self.keywords),
+            "literal_patterns": len(self.exact),
+            "unfiltered_patterns": [str(key) for key in self.always],
+        }
@@ -0,0 +1,421 @@
+
+"""
+Precompiled regular expressions used by the extractors, analyzers and generators
+
+Every pattern is compiled once at import time and registered under a dotted
+name in REGISTRY. Hot paths call methods on the compiled objects directly
+instead of passing strings to re.search/re.finditer, which would go through
+re's small internal cache (far smaller than the number of patterns here).
+
+Run this module directly for a per-pattern micro-benchmark:
+
+    python patterns.py [jenkinsfile ...] [--repeat N] [--top N]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Pattern, Tuple
+
+
+REGISTRY: Dict[str, Pattern] = {}
+
+
+def _re(name: str, pattern: str, flags: int = 0) -> Pattern:
+    """Compile pattern and register it under name"""
+    if name in REGISTRY:
+        raise ValueError(f"Duplicate pattern name: {name}")
+    compiled = re.compile(pattern, flags)
+    REGISTRY[name] = compiled
+    return compiled
+
+
+def _table(prefix: str, table: Dict[str, str], flags: int = 0) -> Dict[str, Pattern]:
+    """Compile a {key: pattern} table, keeping its order"""
+    return {key: _re(f"{prefix}.{key}", pattern, flags) for key, pattern in table.items()}
+
+
+# ---------------------------------------------------------------------------
+# Block headers (used with find_block / BlockTree.find, matched against the
+# identifier directly before '{')
+# ---------------------------------------------------------------------------
+
+PIPELINE_BLOCK = _re("block.pipeline", r"\bpipeline\b")
+AGENT_BLOCK = _re("block.agent", r"\bagent\b")
+NODE_BLOCK = _re("block.node", r"\bnode\b")
+DOCKER_BLOCK = _re("block.docker", r"\bdocker\b")
+PARAMETERS_BLOCK = _re("block.parameters", r"\bparameters\b")
+ENVIRONMENT_BLOCK = _re("block.environment", r"\benvironment\b")
+STAGES_BLOCK = _re("block.stages", r"\bstages\b")
+STEPS_BLOCK = _re("block.steps", r"\bsteps\b")
+TOOLS_BLOCK = _re("block.tools", r"\btools\b")
+WHEN_BLOCK = _re("block.when", r"\bwhen\b")
+POST_BLOCK = _re("block.post", r"\bpost\b")
+PARALLEL_BLOCK = _re("block.parallel", r"\bparallel\b")
+
+# post { <condition> { ... } } in the order they are collected
+POST_CONDITION_BLOCKS = {
+    kind: _re(f"block.post.{kind}", rf"\b{kind}\b")
+    for kind in ("always", "success", "failure", "cleanup", "unstable", "aborted")
+}
+
+
+# ---------------------------------------------------------------------------
+# Steps and commands
+# ---------------------------------------------------------------------------
+
+SH_QUOTED = _re("steps.sh_quoted", r"sh\s+['\"]([^'\"]+)['\"]")
+SH_TRIPLE_QUOTED = _re("steps.sh_triple_quoted", r"sh\s+([\"']{3})([\s\S]*?)\1")
+SH_SCRIPT_CALL = _re("steps.sh_script_call", r"sh\s*\(\s*script\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*returnStdout\s*:\s*true)?\s*\)")
+SH_SONAR = _re("steps.sh_sonar", r"sh\s+['\"]([^'\"]*sonar[^'\"]*)['\"]")
+ECHO_QUOTED = _re("steps.echo_quoted", r"\becho\s+['\"]([^'\"]+)['\"]")
+SCRIPT_BLOCK = _re("steps.script_block", r"script\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}", re.DOTALL)
+
+# tools { maven '...' jdk '...' }
+TOOL_VERSIONS = _table("tools", {
+    "maven": r"maven\s+['\"]([^'\"]+)['\"]",
+    "jdk": r"jdk\s+['\"]([^'\"]+)['\"]",
+    "nodejs": r"nodejs\s+['\"]([^'\"]+)['\"]",
+    "git": r"git\s+['\"]([^'\"]+)['\"]",
+})
+
+GIT_STEP_PATTERNS = [
+    # git branch: "...", url: "...", credentialsId: "..."
+    _re("git.step", r"git\s+(?:branch\s*:\s*['\"]([^'\"]*)['\"](?:\s*,)?)?\s*(?:url\s*:\s*['\"]([^'\"]+)['\"](?:\s*,)?)?\s*(?:credentialsId\s*:\s*['\"]([^'\"]*)['\"])?"),
+    # checkout scm
+    _re("git.checkout_scm", r"checkout\s+scm"),
+    # git commands in sh blocks
+    _re("git.clone", r"git\s+clone\s+([^\s]+)(?:\s+([^\s]+))?"),
+]
+
+SONAR_ENV_BLOCK = _re("sonar.with_env", r"withSonarQubeEnv\s*\(\s*(?:['\"]([^'\"]*)['\"]|([^)]+))?\s*\)\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}", re.DOTALL)
+
+INPUT_STEP = _re("input.step", r"input\s*\(\s*(?:message\s*:\s*['\"]([^'\"]+)['\"])?(?:\s*,\s*ok\s*:\s*['\"]([^'\"]*)['\"])?(?:\s*,\s*parameters\s*:\s*\[([^\]]*)\])?\s*\)", re.DOTALL)
+INPUT_PARAM_PATTERNS = [
+    _re("input.param.string", r"string\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]"),
+    _re("input.param.choice", r"choice\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]"),
+    _re("input.param.boolean", r"booleanParam\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"]"),
+]
+
+DOCKER_BUILD_PATTERNS = [
+    _re("docker.build", r"docker\s+build\s+(?:--pull\s+)?(?:--progress=\w+\s+)?(?:-f\s+([^\s]+)\s+)?(?:-t\s+([^\s]+)\s+)?([^\s]*)"),
+    _re("docker.build_tag", r"docker\s+build\s+[^|]*-t\s+([^\s]+)"),
+]
+DOCKER_PUSH_PATTERNS = [
+    _re("docker.push", r"docker\s+push\s+([^\s]+)"),
+    _re("docker.image_push", r"docker\s+image\s+push\s+([^\s]+)"),
+]
+DOCKER_LOGIN = _re("docker.login", r"docker\s+login")
+
+KUBECTL_COMMAND = _re("k8s.kubectl", r"kubectl\s+([^\n\"']+)")
+HELM_COMMAND = _re("k8s.helm", r"helm\s+([^\n\"']+)")
+
+
+# ---------------------------------------------------------------------------
+# Parameters, agents, environment and when conditions
+# ---------------------------------------------------------------------------
+
+STRING_PARAM = _re("params.string", r"string\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*defaultValue\s*:\s*['\"]([^'\"]*)['\"])?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?")
+BOOLEAN_PARAM = _re("params.boolean", r"booleanParam\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*defaultValue\s*:\s*(true|false))?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?")
+CHOICE_PARAM = _re("params.choice", r"choice\s*\(\s*name\s*:\s*['\"]([^'\"]+)['\"](?:,\s*choices\s*:\s*\[([^\]]+)\])?(?:,\s*description\s*:\s*['\"]([^'\"]*)['\"])?")
+
+AGENT_ANY = _re("agent.any", r"\bany\b")
+AGENT_LABEL = _re("agent.label", r"label\s+['\"]([^'\"]+)['\"]")
+DOCKER_IMAGE = _re("agent.docker.image", r"image\s+['\"]([^'\"]+)['\"]")
+DOCKER_ARGS = _re("agent.docker.args", r"args\s+['\"]([^'\"]+)['\"]")
+DOCKER_REUSE_NODE = _re("agent.docker.reuse_node", r"reuseNode\s+(true|false)")
+
+ENV_ASSIGNMENT = _re("env.assignment", r"([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.+)")
+
+WHEN_BRANCH = _re("when.branch", r"branch\s+['\"]([^'\"]+)['\"]")
+WHEN_EXPRESSION = _re("when.expression", r"expression\s*\{\s*return\s+([^}]+)\s*\}")
+WHEN_ENVIRONMENT = _re("when.environment", r"environment\s+name\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*value\s*:\s*['\"]([^'\"]+)['\"])?")
+WHEN_ANY_OF = _re("when.any_of", r"anyOf\s*\{")
+WHEN_ALL_OF = _re("when.all_of", r"allOf\s*\{")
+WHEN_CHANGE_REQUEST = _re("when.change_request", r"changeRequest")
+WHEN_BUILDING_TAG = _re("when.building_tag", r"buildingTag")
+
+
+# ---------------------------------------------------------------------------
+# post { ... } actions
+# ---------------------------------------------------------------------------
+
+ARCHIVE_PATTERNS = [
+    _re("post.archive_call", r"archiveArtifacts\s*\(\s*artifacts\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*onlyIfSuccessful\s*:\s*(true|false))?(?:\s*,\s*allowEmptyArchive\s*:\s*(true|false))?\s*\)"),
+    _re("post.archive", r"archiveArtifacts\s+['\"]([^'\"]+)['\"]"),
+]
+JUNIT_PATTERNS = [
+    _re("post.junit_call", r"junit\s*\(\s*(?:allowEmptyResults\s*:\s*(true|false)\s*,\s*)?testResults\s*:\s*['\"]([^'\"]+)['\"]"),
+    _re("post.junit", r"junit\s+['\"]([^'\"]+)['\"]"),
+]
+PUBLISH_COVERAGE = _re("post.publish_coverage", r"publishCoverage\s+adapters\s*:\s*\[([^\]]+)\]")
+JACOCO_ADAPTER = _re("post.jacoco_adapter", r"jacocoAdapter\s*\(\s*['\"]([^'\"]+)['\"]\s*\)")
+PUBLISH_HTML = _re("post.publish_html", r"publishHTML\s*\([^)]+\)")
+MAIL = _re("post.mail", r"mail\s+to\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*subject\s*:\s*['\"]([^'\"]*)['\"])?(?:\s*,\s*body\s*:\s*['\"]([^'\"]*)['\"])?")
+EMAILEXT = _re("post.emailext", r"emailext\s*\([^)]+\)")
+SLACK_SEND = _re("post.slack_send", r"slackSend\s*\([^)]+\)")
+DELETE_DIR = _re("post.delete_dir", r"deleteDir\s*\(\s*\)")
+CLEAN_WS = _re("post.clean_ws", r"cleanWs\s*\(\s*\)")
+
+
+# ---------------------------------------------------------------------------
+# Credentials
+# ---------------------------------------------------------------------------
+
+CREDENTIALS_CALL = _re("creds.credentials_call", r'credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', re.IGNORECASE)
+CREDENTIALS_ID = _re("creds.credentials_id", r'credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+USERNAME_PASSWORD_ID = _re("creds.username_password", r'usernamePassword\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+STRING_CREDENTIAL_ID = _re("creds.string", r'string\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+FILE_CREDENTIAL_ID = _re("creds.file", r'file\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+SSH_KEY_ID = _re("creds.ssh_user_private_key", r'sshUserPrivateKey\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+WITH_CREDENTIALS_ID = _re("creds.with_credentials", r'withCredentials\s*\[[^\]]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+SSHAGENT_ID = _re("creds.sshagent", r'sshagent\s*\(\s*\[[\'"]([^\'"]+)[\'"]\]\s*\)', re.IGNORECASE)
+DOCKER_CREDENTIALS_ID = _re("creds.docker_credentials", r'dockerCredentials\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+ENV_CREDENTIALS = _re("creds.env_assignment", r'=\s*credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', re.IGNORECASE)
+KUBECONFIG_CREDENTIALS = _re("creds.kubeconfig", r'KUBECONFIG[^=]*=\s*credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', re.IGNORECASE)
+
+# Credential IDs referenced by a single stage
+STAGE_CREDENTIAL_PATTERNS = [
+    CREDENTIALS_ID, CREDENTIALS_CALL, USERNAME_PASSWORD_ID, STRING_CREDENTIAL_ID,
+    FILE_CREDENTIAL_ID, SSH_KEY_ID, WITH_CREDENTIALS_ID, SSHAGENT_ID, DOCKER_CREDENTIALS_ID,
+    ENV_CREDENTIALS, KUBECONFIG_CREDENTIALS,
+]
+# Credential IDs referenced anywhere in a Jenkinsfile
+PIPELINE_CREDENTIAL_PATTERNS = [
+    CREDENTIALS_CALL, CREDENTIALS_ID, USERNAME_PASSWORD_ID, STRING_CREDENTIAL_ID,
+    FILE_CREDENTIAL_ID, SSH_KEY_ID, WITH_CREDENTIALS_ID,
+]
+
+# withCredentials([...]) { ... } blocks and their bindings
+WITH_CREDENTIALS_BLOCK = _re("creds.with_credentials_block", r"withCredentials\s*\[\s*([^\]]+)\s*\]\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}", re.DOTALL)
+FILE_BINDING = _re("creds.binding.file", r"file\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*variable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)")
+USERNAME_PASSWORD_BINDING = _re("creds.binding.username_password", r"usernamePassword\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*usernameVariable\s*:\s*['\"]([^'\"]+)['\"])?(?:\s*,\s*passwordVariable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)")
+STRING_BINDING = _re("creds.binding.string", r"string\s*\(\s*credentialsId\s*:\s*['\"]([^'\"]+)['\"](?:\s*,\s*variable\s*:\s*['\"]([^'\"]+)['\"])?\s*\)")
+
+
+# ---------------------------------------------------------------------------
+# Script blocks and plugin steps
+# ---------------------------------------------------------------------------
+
+GROOVY_CLOSURE_CALL = _re("script.groovy_closure", r"\.each\s*\{|\.collect\s*\{|\.findAll\s*\{")
+JENKINS_API_USE = _re("script.jenkins_api", r"currentBuild\.|env\.|params\.")
+CONDITIONAL = _re("script.conditional", r"if\s*\(|switch\s*\(")
+LOOP = _re("script.loop", r"for\s*\(|while\s*\(")
+
+# Common Jenkins plugins that need special handling
+PLUGIN_STEP_PATTERNS = _table("plugin", {
+    "publishHTML": r"publishHTML\s*\([^)]+\)",
+    "publishTestResults": r"publishTestResults\s*\([^)]+\)",
+    "step": r"step\s*\[\s*\$class\s*:\s*['\"]([^'\"]+)['\"]",
+    "build": r"build\s+job\s*:\s*['\"]([^'\"]+)['\"]",
+    "emailext": r"emailext\s*\([^)]+\)",
+    "slackSend": r"slackSend\s*\([^)]+\)",
+    "milestone": r"milestone\s*\([^)]+\)",
+    "timeout": r"timeout\s*\([^)]+\)\s*\{",
+    "retry": r"retry\s*\([^)]+\)\s*\{",
+    "lock": r"lock\s*\([^)]+\)\s*\{",
+    "ws": r"ws\s*\([^)]+\)\s*\{",
+    "node": r"node\s*\([^)]+\)\s*\{",
+    "waitForQualityGate": r"waitForQualityGate\s*\(\s*\)",
+    "readProperties": r"readProperties\s+file\s*:\s*['\"]([^'\"]+)['\"]",
+}, re.DOTALL)
+
+
+# ---------------------------------------------------------------------------
+# Whole-pipeline analysis (utils)
+# ---------------------------------------------------------------------------
+
+NON_NEWLINE = _re("text.non_newline", r'[^\r\n]')
+NON_NAME_CHARS = _re("text.non_name_chars", r'[^a-zA-Z0-9\-_]')
+HYPHEN_RUN = _re("text.hyphen_run", r'-+')
+# Blanks left where strip_comments blanked a comment: at line ends and
+# between code on the same line
+TRAILING_BLANKS = _re("text.trailing_blanks", r'[ \t]+$', re.MULTILINE)
+INNER_BLANK_RUN = _re("text.inner_blank_run", r'(?<=\S)[ \t]{2,}(?=\S)')
+
+# Complex pipeline features that need manual conversion
+UNSUPPORTED_FEATURE_PATTERNS = _table("unsupported", {
+    'Build triggers': r'triggers\s*\{[^}]+\}',
+    'Options block': r'options\s*\{[^}]+\}',
+    'Libraries': r'@Library\s*\([^)]+\)',
+    'Shared libraries': r'library\s+[\'"][^\'"]+[\'"]',
+    'Matrix builds': r'matrix\s*\{[^}]+\}',
+    'When expressions (complex)': r'when\s*\{\s*expression\s*\{[^}]+\}\s*\}',
+    'Pipeline functions': r'pipeline\s*\.\s*\w+\s*\(',
+    'Build parameters in steps': r'build\s+job\s*:',
+    'Parallel nested stages': r'parallel\s*\{[^}]*stage[^}]*stage[^}]*\}',
+    'Custom functions': r'def\s+\w+\s*\([^)]*\)\s*\{',
+    'Script blocks (complex)': r'script\s*\{[^}]{100,}\}',  # Large script blocks
+    'Node allocation': r'node\s*\([^)]+\)\s*\{',
+    'Milestone steps': r'milestone\s*\([^)]+\)',
+    'Lock resources': r'lock\s*\([^)]+\)',
+    'Timeout (complex)': r'timeout\s*\([^)]+\)\s*\{[^}]+\}',
+    'Retry blocks': r'retry\s*\([^)]+\)\s*\{',
+    'Archive on failure only': r'archiveArtifacts.*onlyIfSuccessful\s*:\s*false',
+    'Custom workspace': r'ws\s*\([^)]+\)',
+    'Jenkins CLI calls': r'jenkins\s+[\'"][^\'"]+[\'"]',
+    'Plugin-specific steps': r'(publishHTML|publishTestResults|step\s*\[\s*\$class)',
+}, re.DOTALL | re.IGNORECASE)
+
+# analyze_pipeline_complexity counters
+COMPLEXITY_PATTERNS = _table("complexity", {
+    'total_stages': r'stage\s*\([^)]+\)',
+    'has_parallel': r'parallel\s*\{',
+    'has_matrix': r'matrix\s*\{',
+    'has_conditional_stages': r'when\s*\{',
+    'has_post_actions': r'post\s*\{',
+    'script_blocks': r'script\s*\{',
+    'credential_usage': r'credentials?\s*\(',
+})
+
+# (pattern, message) pairs for validate_conversion_feasibility
+FEASIBILITY_BLOCKERS = [
+    (_re("feasibility.blocker.noncps", r'@NonCPS', re.IGNORECASE), 'Non-CPS functions require complete rewrite'),
+    (_re("feasibility.blocker.global_vars", r'@Library.*vars/', re.IGNORECASE), 'Global variable libraries need manual conversion'),
+    (_re("feasibility.blocker.properties", r'properties\s*\([^)]*pipeline', re.IGNORECASE), 'Pipeline properties need workflow-level configuration'),
+    (_re("feasibility.blocker.current_build", r'currentBuild\.\w+\s*=', re.IGNORECASE), 'Build property modifications not directly supported'),
+]
+FEASIBILITY_WARNINGS = [
+    (_re("feasibility.warning.build_job", r'build\s+job\s*:', re.IGNORECASE), 'Triggering other Jenkins jobs requires workflow redesign'),
+    (_re("feasibility.warning.milestone", r'milestone\s*\(', re.IGNORECASE), 'Milestone steps need GitHub deployment protection rules'),
+    (_re("feasibility.warning.input_parameters", r'input\s*\([^)]*parameters', re.IGNORECASE), 'Complex input parameters may need simplification'),
+    (_re("feasibility.warning.timeout_hours", r'timeout\s*\([^)]*HOURS', re.IGNORECASE), 'Long timeouts may exceed GitHub Actions limits'),
+    (_re("feasibility.warning.publish_html", r'publishHTML', re.IGNORECASE), 'HTML publishing requires GitHub Pages or artifact handling'),
+]
+
+# extract_pipeline_metadata flags
+METADATA_PATTERNS = _table("metadata", {
+    'has_parameters': r'parameters\s*\{',
+    'has_global_env': r'environment\s*\{',
+    'has_global_agent': r'agent\s+',
+    'has_tools': r'tools\s*\{',
+    'has_options': r'options\s*\{',
+    'has_triggers': r'triggers\s*\{',
+    'has_libraries': r'@Library',
+    'total_post_blocks': r'post\s*\{',
+})
+
+# Programming languages/technologies: any pattern in the list marks the language
+LANGUAGE_PATTERNS = {
+    lang: [_re(f"language.{lang}.{i}", pattern, re.IGNORECASE) for i, pattern in enumerate(lang_patterns)]
+    for lang, lang_patterns in {
+        'Java': [r'mvn\s+', r'\.jar\b', r'pom\.xml', r'jdk\s+'],
+        'Python': [r'pip\s+', r'python\s+', r'\.py\b', r'requirements\.txt'],
+        'Node.js': [r'npm\s+', r'yarn\s+', r'package\.json', r'node\s+'],
+        'Go': [r'go\s+build', r'go\s+test', r'go\.mod'],
+        'Docker': [r'docker\s+', r'Dockerfile', r'docker-compose'],
+        'Kubernetes': [r'kubectl\s+', r'helm\s+', r'kubeconfig'],
+        'Terraform': [r'terraform\s+', r'\.tf\b'],
+        'Ansible': [r'ansible\s+', r'playbook'],
+        'Shell': [r'sh\s+[\'"]', r'bash\s+', r'#!/bin/'],
+    }.items()
+}
+
+# Tools and technologies
+TOOL_PATTERNS = _table("tool", {
+    'SonarQube': r'sonar:|withSonarQubeEnv',
+    'Docker': r'docker\s+',
+    'Kubernetes': r'kubectl|helm\s+',
+    'Maven': r'mvn\s+',
+    'Gradle': r'gradle\s+|gradlew',
+    'npm': r'npm\s+',
+    'yarn': r'yarn\s+',
+    'pip': r'pip\s+',
+    'Git': r'git\s+',
+    'SSH': r'ssh\s+|sshagent',
+    'AWS CLI': r'aws\s+',
+    'Azure CLI': r'az\s+',
+    'Google Cloud': r'gcloud\s+',
+    'Terraform': r'terraform\s+',
+    'Ansible': r'ansible',
+    'Cosign': r'cosign\s+',
+    'Trivy': r'trivy\s+',
+    'OWASP': r'dependency-check',
+}, re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Generators (action_generator, converter, main)
+# ---------------------------------------------------------------------------
+
+PARAMS_REF = _re("vars.params_ref", r'\$\{params\.([A-Za-z_][A-Za-z0-9_]*)\}')
+PARAMS_REF_ANY = _re("vars.params_ref_any", r"\$\{params\.([^}]+)\}")
+ENV_REF = _re("vars.env_ref", r'\$\{env\.([A-Za-z_][A-Za-z0-9_]*)\}')
+CREDENTIALS_HELPER = _re("vars.credentials_helper", r"credentials\s*\(\s*['\"]([^'\"]+)['\"]\s*\)")
+LINE_CONTINUATION = _re("cmd.line_continuation", r'\\\s*\n\s*')
+WHITESPACE_RUN = _re("cmd.whitespace_run", r'\s+')
+EQUALS_TRUE = _re("expr.equals_true", r'==\s*true')
+EQUALS_FALSE = _re("expr.equals_false", r'==\s*false')
+
+
+# ---------------------------------------------------------------------------
+# Micro-benchmark
+# ---------------------------------------------------------------------------
+
+def _pathological_inputs() -> Dict[str, str]:
+    """Inputs that make nested-brace and bracket patterns backtrack"""
+    return {
+        "unclosed-script": "script {" + " { x }" * 400 + " {" * 50,
+        "unclosed-withCredentials": "withCredentials [" + " string(credentialsId: 'x')," * 200 + " { {" * 50,
+        "long-parens": "timeout(" + "a" * 5000,
+    }
+
+
+def benchmark_patterns(texts: Dict[str, str], repeat: int = 20) -> List[Dict[str, Any]]:
+    """Time finditer() of every registered pattern over each text.
+
+    Returns one row per pattern with its mean cost per call (microseconds,
+    averaged over texts) and the text it was slowest on, slowest first.
+    """
+    rows = []
+    for name, pattern in REGISTRY.items():
+        per_text: List[Tuple[float, str]] = []
+        for text_name, text in texts.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for _ in pattern.finditer(text):
+                    pass
+            per_text.append(((time.perf_counter() - start) / repeat * 1e6, text_name))
+        worst_us, worst_text = max(per_text)
+        rows.append({
+            "name": name,
+            "mean_us": sum(us for us, _ in per_text) / len(per_text),
+            "worst_us": worst_us,
+            "worst_text": worst_text,
+        })
+    rows.sort(key=lambda row: row["worst_us"], reverse=True)
+    return rows
+
+
+def main(argv: List[str]) -> int:
+    repeat, top = 20, 25
+    files: List[Path] = []
+    i = 0
+    while i < len(argv):
+        if argv[i] in ("--repeat", "--top") and i + 1 < len(argv):
+            if argv[i] == "--repeat":
+                repeat = int(argv[i + 1])
+            else:
+                top = int(argv[i + 1])
+            i += 2
+            continue
+        files.append(Path(argv[i]))
+        i += 1
+
+    if not files:
+        here = Path(__file__).parent
+        files = sorted((here / "test-jenkinsfiles").glob("*.Jenkinsfile")) + [here / "Jenkinsfile"]
+    texts = {path.name: path.read_text(encoding="utf-8") for path in files if path.is_file()}
+    texts.update(_pathological_inputs())
+
+    rows = benchmark_patterns(texts, repeat)
+    print(f"{len(REGISTRY)} patterns x {len(texts)} inputs, {repeat} repetitions\n")
+    print(f"{'pattern':<40} {'mean us':>10} {'worst us':>10}  worst input")
+    for row in rows[:top]:
+        print(f"{row['name']:<40} {row['mean_us']:>10.1f} {row['worst_us']:>10.1f}  {row['worst_text']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
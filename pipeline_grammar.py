@@ -0,0 +1,419 @@
+
+"""
+Grammar-based parser backend for the pipeline IR
+
+Builds the same Pipeline as pipeline_ir.parse_pipeline, but from the
+groovy_parser syntax tree instead of regexes over block text: nested
+withCredentials and script blocks, named arguments in any order and
+conditions inside not { ... } are read structurally, and steps keep their
+document order. Flat keyword scans that need no structure (credential IDs,
+plugin steps) reuse the regex extractors on the stage source.
+"""
+
+from functools import partial
+from typing import List, Dict, Any, Optional, Iterable, Iterator, TYPE_CHECKING
+
+from utils import strip_comments, multiline_to_commands, extract_all_credentials
+from groovy_lexer import SourceView
+from groovy_parser import (
+    parse_groovy, iter_calls, string_value, GroovySyntaxError,
+    Node, Atom, Str, ListExpr, Closure, Call
+)
+from instrumentation import span, traced
+from jenkins_extractors import describe_script_block, extract_credentials_usage, extract_plugin_steps
+from pipeline_ir import Pipeline, Stage, Step, Agent, Credential, PostCondition, parse_stage_cached
+from patterns import POST_CONDITION_BLOCKS
+
+if TYPE_CHECKING:
+    from conversion_cache import StageCache
+
+
+# post { <condition> { ... } } kinds, in the order the regex backend collects them
+POST_CONDITIONS = tuple(POST_CONDITION_BLOCKS)
+
+
+def _child(block: Optional[Closure], name: str) -> Optional[Call]:
+    """First call named name made directly in block"""
+    if block is None:
+        return None
+    return next((call for call in block.calls() if call.name == name), None)
+
+
+def _stage_calls(block: Optional[Closure]) -> List[Call]:
+    """stage('name') { ... } calls made directly in block"""
+    if block is None:
+        return []
+    return [call for call in block.calls()
+            if call.name == "stage" and call.closure is not None and string_value(call.arg(0)) is not None]
+
+
+def _outermost(nodes: Iterable[Node], name: str) -> Iterator[Call]:
+    """Calls named name with a closure, skipping those nested inside another one"""
+    stack = list(nodes)[::-1]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Call) and node.name == name and node.closure is not None:
+            yield node
+            continue
+        stack.extend(reversed(node.children()))
+
+
+def _text(text: str, node: Node) -> str:
+    return text[node.start:node.end]
+
+
+def _value(text: str, node: Node) -> str:
+    """String literal value, or the source text of any other expression"""
+    return node.value if isinstance(node, Str) else _text(text, node).strip()
+
+
+def _bool(node: Optional[Node]) -> Optional[bool]:
+    if isinstance(node, Atom) and node.value in ("true", "false"):
+        return node.value == "true"
+    return None
+
+
+def _named_string(call: Call, key: str) -> Optional[str]:
+    return string_value(call.named.get(key))
+
+
+def _commands(nodes: Iterable[Node]) -> List[str]:
+    """sh and echo commands below nodes, in document order"""
+    cmds: List[str] = []
+    for call in iter_calls(nodes):
+        if call.name == "sh":
+            script = call.arg(0) if call.args else call.named.get("script")
+            if not isinstance(script, Str):
+                continue
+            if script.triple:
+                cmds.extend(multiline_to_commands(script.value))
+            elif script.value.strip():
+                cmds.append(script.value.strip())
+        elif call.name == "echo":
+            message = string_value(call.arg(0))
+            if message and message.strip():
+                cmds.append(f"echo {message.strip()}")
+    return cmds
+
+
+def _agent(call: Optional[Call]) -> Optional[Agent]:
+    """agent any | none | { label ... } | { node { label ... } } | { docker ... }"""
+    if call is None:
+        return None
+    if call.closure is None:
+        kind = call.arg(0)
+        return Agent("any") if isinstance(kind, Atom) and kind.value == "any" else None
+
+    for inner in call.closure.calls():
+        if inner.name == "label":
+            label = string_value(inner.arg(0))
+            if label:
+                return Agent("label", label=label.strip())
+        elif inner.name == "node":
+            label = _named_string(inner, "label") or string_value(inner.arg(0))
+            node_label = _child(inner.closure, "label")
+            if node_label is not None:
+                label = string_value(node_label.arg(0))
+            if label:
+                return Agent("label", label=label.strip())
+        elif inner.name == "docker":
+            settings = {sub.name: sub.arg(0) for sub in inner.closure.calls()} if inner.closure else inner.named
+            image = string_value(settings.get("image")) or string_value(inner.arg(0))
+            if image:
+                args = string_value(settings.get("args"))
+                return Agent("docker", image=image.strip(),
+                             args=args.strip() if args else None,
+                             reuse_node=_bool(settings.get("reuseNode")))
+    return None
+
+
+def _environment(text: str, call: Optional[Call]) -> Dict[str, str]:
+    env: Dict[str, str] = {}
+    if call is None or call.closure is None:
+        return env
+    for assign in call.closure.assignments():
+        if isinstance(assign.target, Atom) and "." not in assign.target.value:
+            env[assign.target.value] = _value(text, assign.value)
+    return env
+
+
+def _parameters(call: Optional[Call]) -> Dict[str, Any]:
+    """parameters { ... } with named arguments in any order"""
+    params: Dict[str, Any] = {}
+    if call is None or call.closure is None:
+        return params
+    for param in call.closure.calls():
+        name = _named_string(param, "name")
+        if not name:
+            continue
+        description = _named_string(param, "description") or ""
+        if param.name in ("string", "text"):
+            params[name] = {
+                "type": "string",
+                "default": _named_string(param, "defaultValue") or "",
+                "description": description
+            }
+        elif param.name == "booleanParam":
+            params[name] = {
+                "type": "boolean",
+                "default": _bool(param.named.get("defaultValue")) or False,
+                "description": description
+            }
+        elif param.name == "choice":
+            choices = param.named.get("choices")
+            if isinstance(choices, ListExpr):
+                options = [item.value for item in choices.items if isinstance(item, Str)]
+            elif isinstance(choices, Str):
+                options = [line.strip() for line in choices.value.split("\\n" if "\\n" in choices.value else "\n")
+                           if line.strip()]
+            else:
+                options = []
+            params[name] = {
+                "type": "choice",
+                "options": options,
+                "default": options[0] if options else "",
+                "description": description
+            }
+    return params
+
+
+def _collect_when(text: str, block: Closure, conditions: Dict[str, Any]):
+    for node in block.body:
+        if isinstance(node, Call):
+            name = node.name
+        elif isinstance(node, Atom):
+            name = node.value
+        else:
+            continue
+
+        if name == "branch" and isinstance(node, Call):
+            branch = string_value(node.arg(0)) or _named_string(node, "pattern")
+            if branch:
+                conditions.setdefault("branch", branch)
+        elif name == "expression" and isinstance(node, Call) and node.closure is not None:
+            expr = _text(text, node.closure).strip()
+            if expr.startswith("return ") or expr.startswith("return\n"):
+                expr = expr[len("return"):].strip()
+            if expr:
+                conditions.setdefault("expression", expr)
+        elif name == "environment" and isinstance(node, Call):
+            env_name = _named_string(node, "name")
+            if env_name:
+                conditions.setdefault("environment", {"name": env_name, "value": _named_string(node, "value") or ""})
+        elif name in ("anyOf", "allOf") and isinstance(node, Call) and node.closure is not None:
+            conditions[name] = True
+            conditions["complex"] = True
+            _collect_when(text, node.closure, conditions)
+        elif name == "not" and isinstance(node, Call) and node.closure is not None:
+            negated: Dict[str, Any] = {}
+            _collect_when(text, node.closure, negated)
+            if negated:
+                conditions.setdefault("not", negated)
+        elif name in ("changeRequest", "buildingTag"):
+            conditions[name] = True
+
+
+def _when(text: str, call: Optional[Call]) -> Dict[str, Any]:
+    conditions: Dict[str, Any] = {}
+    if call is not None and call.closure is not None:
+        _collect_when(text, call.closure, conditions)
+    return conditions
+
+
+def _post_actions(text: str, block: Closure) -> Dict[str, Any]:
+    """Actions of one post condition, in the shape the regex extractor returns"""
+    calls = list(iter_calls(block.body))
+
+    def first(name: str) -> Optional[Call]:
+        return next((call for call in calls if call.name == name), None)
+
+    data: Dict[str, Any] = {}
+    archive = first("archiveArtifacts")
+    if archive is not None:
+        artifacts = string_value(archive.arg(0)) or _named_string(archive, "artifacts")
+        if artifacts:
+            data["archive"] = artifacts.strip()
+            for key in ("onlyIfSuccessful", "allowEmptyArchive"):
+                flag = _bool(archive.named.get(key))
+                if flag is not None:
+                    data[key] = flag
+
+    junit = first("junit")
+    if junit is not None:
+        results = string_value(junit.arg(0)) or _named_string(junit, "testResults")
+        if results:
+            data["junit"] = {
+                "allowEmptyResults": _bool(junit.named.get("allowEmptyResults")) or False,
+                "testResults": results
+            }
+
+    coverage = first("publishCoverage")
+    if coverage is not None:
+        adapter = next((call for call in iter_calls(coverage.children()) if call.name == "jacocoAdapter"), None)
+        path = string_value(adapter.arg(0)) if adapter is not None else None
+        if path:
+            data["coverage"] = {"type": "jacoco", "path": path}
+
+    html = first("publishHTML")
+    if html is not None:
+        data["publishHTML"] = _text(text, html)
+
+    mail = first("mail")
+    emailext = first("emailext")
+    if mail is not None and _named_string(mail, "to"):
+        data["mail"] = {
+            "to": _named_string(mail, "to"),
+            "subject": _named_string(mail, "subject") or "",
+            "body": _named_string(mail, "body") or ""
+        }
+    elif emailext is not None:
+        data["emailext"] = _text(text, emailext)
+
+    slack = first("slackSend")
+    if slack is not None:
+        data["slack"] = _text(text, slack)
+
+    if first("deleteDir") is not None:
+        data["deleteDir"] = True
+    if first("cleanWs") is not None:
+        data["cleanWs"] = True
+
+    cmds = _commands(block.body)
+    if cmds:
+        data["commands"] = cmds
+
+    script = next(_outermost(block.body, "script"), None)
+    if script is not None:
+        content = _text(text, script.closure).strip()
+        if content:
+            data["script_block"] = content
+    return data
+
+
+def _post(text: str, call: Optional[Call]) -> List[PostCondition]:
+    if call is None or call.closure is None:
+        return []
+    blocks = {}
+    for condition in call.closure.calls():
+        if condition.closure is not None:
+            blocks.setdefault(condition.name, condition.closure)
+    post = []
+    for kind in POST_CONDITIONS:
+        if kind in blocks:
+            actions = _post_actions(text, blocks[kind])
+            if actions:
+                post.append(PostCondition(kind, actions))
+    return post
+
+
+def _binding(call: Call) -> Optional[Dict[str, Any]]:
+    """One withCredentials binding in the shape of extract_withCredentials_blocks"""
+    cred_id = _named_string(call, "credentialsId")
+    if not cred_id:
+        return None
+    if call.name == "usernamePassword":
+        return {
+            "type": "usernamePassword",
+            "credentialsId": cred_id,
+            "usernameVariable": _named_string(call, "usernameVariable") or f"{cred_id.upper()}_USR",
+            "passwordVariable": _named_string(call, "passwordVariable") or f"{cred_id.upper()}_PSW"
+        }
+    if call.name == "string":
+        return {"type": "string", "credentialsId": cred_id,
+                "variable": _named_string(call, "variable") or cred_id.upper()}
+    if call.name in ("file", "kubeconfigFile", "sshUserPrivateKey"):
+        variable = _named_string(call, "keyFileVariable" if call.name == "sshUserPrivateKey" else "variable")
+        return {"type": "file", "credentialsId": cred_id, "variable": variable or cred_id.upper()}
+    return None
+
+
+def _credential_blocks(text: str, block: Closure) -> List[Dict[str, Any]]:
+    """Outermost withCredentials blocks; bindings of nested ones are merged in"""
+    cred_blocks = []
+    for outer in _outermost(block.body, "withCredentials"):
+        credentials = []
+        for call in iter_calls([outer]):
+            if call.name != "withCredentials":
+                continue
+            bindings = call.arg(0)
+            for item in bindings.items if isinstance(bindings, ListExpr) else [bindings]:
+                binding = _binding(item) if isinstance(item, Call) else None
+                if binding is not None:
+                    credentials.append(binding)
+        if credentials:
+            cred_blocks.append({"credentials": credentials, "content": _text(text, outer.closure).strip()})
+    return cred_blocks
+
+
+def _stage(text: str, call: Call, is_parallel_child: bool = False) -> Stage:
+    name = string_value(call.arg(0))
+    with span("stage_extraction", stage=name):
+        block = call.closure
+        stage = Stage(name, SourceView(text, block.start, block.end), is_parallel_child)
+        try:
+            if not is_parallel_child:
+                parallel = _child(block, "parallel")
+                if parallel is not None:
+                    stage.parallel = [_stage(text, sub, True) for sub in _stage_calls(parallel.closure)]
+                    if stage.parallel:
+                        return stage
+
+            steps = _child(block, "steps")
+            stage.agent = _agent(_child(block, "agent"))
+            stage.env = _environment(text, _child(block, "environment"))
+            stage.when = _when(text, _child(block, "when"))
+            stage.post = _post(text, _child(block, "post"))
+            stage.plugin_steps = extract_plugin_steps(stage.source)
+            stage.script_blocks = [describe_script_block(_text(text, script.closure).strip())
+                                   for script in _outermost(block.body, "script")]
+            stage.cred_blocks = _credential_blocks(text, block)
+            zone = steps.closure if steps is not None and steps.closure is not None else block
+            stage.steps = [Step("echo" if cmd.startswith("echo ") else "sh", cmd)
+                           for cmd in _commands(zone.body)]
+            stage.credentials = [Credential(c) for c in extract_credentials_usage(stage.source)]
+        except Exception as e:
+            stage.error = str(e)
+        return stage
+
+
+@traced("parse_pipeline")
+def parse_pipeline_grammar(jenkins_text: str, stage_cache: Optional["StageCache"] = None) -> Pipeline:
+    """Parse a Jenkins declarative pipeline into the IR using the Groovy grammar;
+    stages found in stage_cache are restored instead of extracted again"""
+    with span("strip_comments"):
+        text = strip_comments(jenkins_text)
+
+    with span("parse_groovy"):
+        try:
+            nodes = parse_groovy(text)
+        except GroovySyntaxError as e:
+            raise ValueError(f"Error parsing Jenkins pipeline structure: {e}")
+
+    root = next((node for node in nodes
+                 if isinstance(node, Call) and node.name == "pipeline" and node.closure is not None), None)
+    if root is None:
+        raise ValueError("Not a declarative Jenkins pipeline (no 'pipeline { ... }' found).")
+    block = root.closure
+    pipeline = Pipeline(jenkins_text, SourceView(text, block.start, block.end))
+
+    with span("pipeline_sections"):
+        pipeline.agent = _agent(_child(block, "agent"))
+        pipeline.parameters = _parameters(_child(block, "parameters"))
+        pipeline.environment = _environment(text, _child(block, "environment"))
+
+    with span("split_stages"):
+        stages = _child(block, "stages")
+        if stages is None or stages.closure is None:
+            raise ValueError("Error parsing Jenkins pipeline structure: No 'stages { ... }' found.")
+        stage_calls = _stage_calls(stages.closure)
+
+    with span("pipeline_sections"):
+        pipeline.post = _post(text, _child(block, "post"))
+
+    pipeline.stages = [parse_stage_cached(string_value(call.arg(0)),
+                                          SourceView(text, call.closure.start, call.closure.end),
+                                          partial(_stage, text, call), pipeline, stage_cache)
+                       for call in stage_calls]
+    with span("pipeline_credentials"):
+        pipeline.credentials = [Credential(c) for c in extract_all_credentials(jenkins_text)]
+    return pipeline
@@ -0,0 +1,340 @@
+
+"""
+Typed intermediate representation (IR) of a Jenkins declarative pipeline
+
+The parser produces a Pipeline once per Jenkinsfile; the converter, the
+composite action generator and the report generator all consume it instead
+of re-extracting stage bodies from the raw text.
+"""
+
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable, TYPE_CHECKING
+
+from utils import strip_comments, extract_all_credentials
+from groovy_lexer import SourceView, Source
+from instrumentation import span, traced
+from patterns import PIPELINE_BLOCK, ENVIRONMENT_BLOCK, STAGES_BLOCK
+from jenkins_extractors import (
+    extract_parameters, extract_global_agent, extract_env_kv,
+    split_stages, extract_stage_environment, extract_steps_commands,
+    extract_stage_post, extract_pipeline_post, extract_parallel,
+    extract_stage_agent, extract_when_conditions, extract_plugin_steps,
+    extract_script_blocks, extract_credentials_usage
+)
+
+if TYPE_CHECKING:
+    from conversion_cache import StageCache
+
+
+class Agent:
+    """Jenkins agent declaration (any, label or docker)"""
+
+    __slots__ = ("type", "label", "image", "args", "reuse_node")
+
+    def __init__(self, type: str, label: Optional[str] = None, image: Optional[str] = None,
+                 args: Optional[str] = None, reuse_node: Optional[bool] = None):
+        self.type = type
+        self.label = label
+        self.image = image
+        self.args = args
+        self.reuse_node = reuse_node
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["Agent"]:
+        if not data:
+            return None
+        return cls(data["type"], data.get("label"), data.get("image"),
+                   data.get("args"), data.get("reuseNode"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"type": self.type}
+        if self.label is not None:
+            out["label"] = self.label
+        if self.image is not None:
+            out["image"] = self.image
+        if self.args is not None:
+            out["args"] = self.args
+        if self.reuse_node is not None:
+            out["reuseNode"] = self.reuse_node
+        return out
+
+
+class PostCondition:
+    """One post { <kind> { ... } } section with its extracted actions"""
+
+    __slots__ = ("kind", "actions")
+
+    def __init__(self, kind: str, actions: Dict[str, Any]):
+        self.kind = kind
+        self.actions = actions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "actions": self.actions}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PostCondition":
+        return cls(data["kind"], data["actions"])
+
+
+class Credential:
+    """Reference to a Jenkins credential ID"""
+
+    __slots__ = ("id",)
+
+    def __init__(self, id: str):
+        self.id = id
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Credential) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"Credential({self.id!r})"
+
+
+class Step:
+    """A shell or echo command executed by a stage"""
+
+    __slots__ = ("kind", "command")
+
+    def __init__(self, kind: str, command: str):
+        self.kind = kind
+        self.command = command
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "command": self.command}
+
+
+class Stage:
+    """A pipeline stage (or a parallel child stage)"""
+
+    __slots__ = ("name", "body", "source", "env", "agent", "when", "post", "steps",
+                 "credentials", "plugin_steps", "script_blocks", "cred_blocks", "parallel",
+                 "is_parallel_child", "error", "cache_key")
+
+    def __init__(self, name: str, body: Source, is_parallel_child: bool = False):
+        self.name = name
+        self.source = SourceView.of(body)   # view into the comment-stripped pipeline text
+        self.body = str(self.source)
+        self.env: Dict[str, str] = {}
+        self.agent: Optional[Agent] = None
+        self.when: Dict[str, Any] = {}
+        self.post: Optional[List[PostCondition]] = None
+        self.steps: List[Step] = []
+        self.credentials: List[Credential] = []
+        self.plugin_steps: Optional[List[Dict[str, Any]]] = None
+        self.script_blocks: Optional[List[Dict[str, Any]]] = None
+        self.cred_blocks: Optional[List[Dict[str, Any]]] = None   # withCredentials blocks, when the parser extracts them
+        self.parallel: List["Stage"] = []
+        self.is_parallel_child = is_parallel_child
+        self.error: Optional[str] = None
+        self.cache_key: Optional[str] = None   # StageCache key of the raw stage text, when parsed with one
+
+    def post_dict(self) -> Dict[str, Any]:
+        """Post conditions in the {kind: actions} shape used by the generators"""
+        return {cond.kind: cond.actions for cond in self.post or []}
+
+    def agent_dict(self) -> Dict[str, Any]:
+        return self.agent.to_dict() if self.agent else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "body": self.body,
+            "env": self.env,
+            "agent": self.agent_dict(),
+            "when": self.when,
+            "post": [cond.to_dict() for cond in self.post or []],
+            "steps": [step.to_dict() for step in self.steps],
+            "credentials": [cred.id for cred in self.credentials],
+            "plugin_steps": self.plugin_steps or [],
+            "script_blocks": self.script_blocks or [],
+            "cred_blocks": self.cred_blocks or [],
+            "parallel": [sub.to_dict() for sub in self.parallel],
+            "is_parallel_child": self.is_parallel_child,
+            "error": self.error,
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Lossless JSON form of the extracted stage, for the stage cache"""
+        return {
+            "name": self.name,
+            "body": self.body,
+            "env": self.env,
+            "agent": self.agent_dict(),
+            "when": self.when,
+            "post": None if self.post is None else [cond.to_dict() for cond in self.post],
+            "steps": [step.to_dict() for step in self.steps],
+            "credentials": [cred.id for cred in self.credentials],
+            "plugin_steps": self.plugin_steps,
+            "script_blocks": self.script_blocks,
+            "cred_blocks": self.cred_blocks,
+            "parallel": [sub.to_state() for sub in self.parallel],
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], body: Optional[Source] = None,
+                   is_parallel_child: bool = False) -> "Stage":
+        """Rebuild a stage saved by to_state; body defaults to the saved text"""
+        stage = cls(state["name"], state["body"] if body is None else body, is_parallel_child)
+        stage.env = state["env"]
+        stage.agent = Agent.from_dict(state["agent"])
+        stage.when = state["when"]
+        if state["post"] is not None:
+            stage.post = [PostCondition.from_dict(cond) for cond in state["post"]]
+        stage.steps = [Step(step["kind"], step["command"]) for step in state["steps"]]
+        stage.credentials = [Credential(c) for c in state["credentials"]]
+        stage.plugin_steps = state["plugin_steps"]
+        stage.script_blocks = state["script_blocks"]
+        stage.cred_blocks = state["cred_blocks"]
+        stage.parallel = [cls.from_state(sub, is_parallel_child=True) for sub in state["parallel"]]
+        stage.error = state["error"]
+        return stage
+
+
+class Pipeline:
+    """A parsed Jenkins declarative pipeline"""
+
+    __slots__ = ("text", "body", "agent", "parameters", "environment",
+                 "stages", "post", "credentials")
+
+    def __init__(self, text: str, body: SourceView):
+        self.text = text          # original Jenkinsfile text
+        self.body = body          # view on the comment-stripped content of pipeline { ... }
+        self.agent: Optional[Agent] = None
+        self.parameters: Dict[str, Any] = {}
+        self.environment: Dict[str, str] = {}
+        self.stages: List[Stage] = []
+        self.post: List[PostCondition] = []
+        self.credentials: List[Credential] = []
+
+    def iter_stages(self):
+        """Leaf stages in execution order (parallel children replace their parent)"""
+        for stage in self.stages:
+            if stage.parallel:
+                yield from stage.parallel
+            else:
+                yield stage
+
+    def post_dict(self) -> Dict[str, Any]:
+        return {cond.kind: cond.actions for cond in self.post}
+
+    def credential_ids(self) -> set:
+        return {cred.id for cred in self.credentials}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent": self.agent.to_dict() if self.agent else {},
+            "parameters": self.parameters,
+            "environment": self.environment,
+            "stages": [stage.to_dict() for stage in self.stages],
+            "post": [cond.to_dict() for cond in self.post],
+            "credentials": [cred.id for cred in self.credentials],
+        }
+
+
+def _post_conditions(post_info: Dict[str, Any]) -> List[PostCondition]:
+    return [PostCondition(kind, actions) for kind, actions in post_info.items()]
+
+
+def parse_stage(name: str, body: Source, is_parallel_child: bool = False) -> Stage:
+    """Run the per-stage extractors once and capture the results in a Stage"""
+    with span("stage_extraction", stage=name):
+        return _parse_stage(name, body, is_parallel_child)
+
+
+def _parse_stage(name: str, body: Source, is_parallel_child: bool) -> Stage:
+    stage = Stage(name, body, is_parallel_child)
+    body = stage.source
+    try:
+        if not is_parallel_child:
+            stage.parallel = [parse_stage(sub["name"], sub["content"], True)
+                              for sub in extract_parallel(body)]
+            if stage.parallel:
+                return stage
+
+        stage.agent = Agent.from_dict(extract_stage_agent(body))
+        stage.env = extract_stage_environment(body)
+        stage.when = extract_when_conditions(body)
+        stage.post = _post_conditions(extract_stage_post(body))
+        stage.plugin_steps = extract_plugin_steps(body)
+        stage.script_blocks = extract_script_blocks(body)
+        stage.steps = [Step("echo" if cmd.startswith("echo ") else "sh", cmd)
+                       for cmd in extract_steps_commands(body)]
+        stage.credentials = [Credential(c) for c in extract_credentials_usage(body)]
+    except Exception as e:
+        stage.error = str(e)
+    return stage
+
+
+def parse_stage_cached(name: str, body: Source, parse: Callable[[], Stage], pipeline: Pipeline,
+                       stage_cache: Optional["StageCache"]) -> Stage:
+    """parse() the stage, or restore it from stage_cache when the same stage
+    text was parsed before under the same pipeline environment and agent.
+
+    The key is built from those inputs alone, so an unchanged stage skips
+    every extractor. Parallel children get keys of their own for the
+    per-stage action cache.
+    """
+    if stage_cache is None:
+        return parse()
+    environment, agent = pipeline.environment, pipeline.agent.to_dict() if pipeline.agent else {}
+    key = stage_cache.key(name, str(body), environment, agent)
+    state = stage_cache.get_stage(key)
+    if state is not None:
+        stage = Stage.from_state(state, body)
+    else:
+        stage = parse()
+        stage_cache.put_stage(key, stage.to_state())
+    stage.cache_key = key
+    for sub in stage.parallel:
+        sub.cache_key = stage_cache.key(sub.name, sub.body, environment, agent, is_parallel_child=True)
+    return stage
+
+
+@traced("parse_pipeline")
+def parse_pipeline(jenkins_text: str, stage_cache: Optional["StageCache"] = None) -> Pipeline:
+    """Parse a Jenkins declarative pipeline into the IR; stages found in
+    stage_cache are restored instead of extracted again"""
+    with span("strip_comments"):
+        text = strip_comments(jenkins_text)
+
+    # pipeline { ... }; everything below works on views into this one text
+    body = SourceView(text).block(PIPELINE_BLOCK)
+    if body is None:
+        raise ValueError("Not a declarative Jenkins pipeline (no 'pipeline { ... }' found).")
+    pipeline = Pipeline(jenkins_text, body)
+
+    try:
+        with span("pipeline_sections"):
+            pipeline.agent = Agent.from_dict(extract_global_agent(body))
+            pipeline.parameters = extract_parameters(body)
+
+            # Global environment
+            env_body = body.block(ENVIRONMENT_BLOCK)
+            pipeline.environment = extract_env_kv(env_body) if env_body is not None else {}
+
+        # Stages
+        with span("split_stages"):
+            stages_body = body.block(STAGES_BLOCK)
+            if stages_body is None:
+                raise ValueError("No 'stages { ... }' found.")
+            stages_list = split_stages(stages_body)
+
+        # Pipeline-level post
+        with span("pipeline_sections"):
+            pipeline.post = _post_conditions(extract_pipeline_post(body))
+
+    except Exception as e:
+        raise ValueError(f"Error parsing Jenkins pipeline structure: {e}")
+
+    pipeline.stages = [parse_stage_cached(stage["name"], stage["content"],
+                                          partial(parse_stage, stage["name"], stage["content"]),
+                                          pipeline, stage_cache)
+                       for stage in stages_list]
+    with span("pipeline_credentials"):
+        pipeline.credentials = [Credential(c) for c in extract_all_credentials(jenkins_text)]
+    return pipeline
@@ -3,116 +3,52 @@
 Interactive HTML conversion report generation with clickable elements
 """
 
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Iterator, TextIO
 from datetime import datetime
-from utils import (
-    extract_unsupported_features, analyze_pipeline_complexity, 
-    validate_conversion_feasibility, detect_languages, detect_tools,
-    extract_all_credentials
-)
+from utils import PipelineAnalysis
+from pipeline_ir import Pipeline
 
 
-def generate_conversion_report(action_paths: List[Dict[str, Any]], pipeline_text: str) -> str:
-    """Generate an interactive HTML conversion report"""
+def iter_conversion_report(action_paths: List[Dict[str, Any]], pipeline_text: str,
+                           pipeline: Optional[Pipeline] = None,
+                           analysis: Optional[PipelineAnalysis] = None) -> Iterator[str]:
+    """Yield the interactive HTML conversion report section by section
+
+    Pass the file's PipelineAnalysis to reuse the analyses already computed
+    during conversion; otherwise one is built here (seeded from the pipeline
+    IR when given).
+    """
     
     # Generate report timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     # Analyze the pipeline
-    complexity_analysis = analyze_pipeline_complexity(pipeline_text)
-    feasibility_analysis = validate_conversion_feasibility(pipeline_text)
-    unsupported_features = extract_unsupported_features(pipeline_text)
-    languages = detect_languages(pipeline_text)
-    tools = detect_tools(pipeline_text)
-    all_credentials = extract_all_credentials(pipeline_text)
+    if analysis is None:
+        analysis = PipelineAnalysis.for_pipeline(pipeline) if pipeline is not None else PipelineAnalysis(pipeline_text)
     
-    # Generate HTML report
-    html_content = generate_interactive_html_report(
-        action_paths, pipeline_text, timestamp, complexity_analysis,
-        feasibility_analysis, unsupported_features, languages, tools, all_credentials
+    yield from iter_interactive_html_report(
+        action_paths, pipeline_text, timestamp, analysis.complexity,
+        analysis.feasibility, analysis.unsupported_features, analysis.languages,
+        analysis.tools, analysis.credentials
     )
-    
-    return html_content
 
 
-def generate_interactive_html_report(
-    action_paths: List[Dict[str, Any]], 
-    pipeline_text: str, 
-    timestamp: str,
-    complexity_analysis: Dict[str, Any],
-    feasibility_analysis: Dict[str, Any],
-    unsupported_features: List[Dict[str, str]],
-    languages: List[str],
-    tools: List[str],
-    all_credentials: set
-) -> str:
-    """Generate complete interactive HTML report"""
-    
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Jenkins to GitHub Actions Conversion Report</title>
-    <style>
-        {get_css_styles()}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header class="header">
-            <h1>🚀 Jenkins to GitHub Actions Conversion Dashboard</h1>
-            <div class="header-info">
-                <span><strong>Generated:</strong> {timestamp}</span>
-                <span><strong>Pipeline Complexity:</strong> {complexity_analysis['complexity_level']} ({complexity_analysis['complexity_score']} points)</span>
-                <span><strong>Conversion Feasibility:</strong> {feasibility_analysis['confidence']}</span>
-            </div>
-        </header>
-
-        <div class="status-section">
-            <h2>📊 Conversion Status Overview</h2>
-            <div class="badges">
-                {generate_status_badges_html(action_paths, feasibility_analysis, complexity_analysis)}
-            </div>
-        </div>
-
-        <div class="stats-section">
-            <h2>📈 Quick Statistics</h2>
-            <div class="stats-grid">
-                {generate_interactive_stats_grid(action_paths, pipeline_text, complexity_analysis)}
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>🛠️ Technology Stack Detected</h2>
-            {generate_technology_stack_html(languages, tools)}
-        </div>
-
-        {generate_secrets_section_html(all_credentials, action_paths)}
-
-        <div class="section">
-            <h2>📋 Stage Conversion Details</h2>
-            {generate_interactive_stages_html(action_paths)}
-        </div>
+def write_conversion_report(out: TextIO, action_paths: List[Dict[str, Any]], pipeline_text: str,
+                            pipeline: Optional[Pipeline] = None,
+                            analysis: Optional[PipelineAnalysis] = None) -> None:
+    """Stream the interactive HTML conversion report to an open text file
 
-        {generate_manual_conversion_section_html(action_paths, unsupported_features)}
-
-        {generate_next_steps_html(action_paths, all_credentials, feasibility_analysis)}
+    Chunks are written as they are rendered, so memory use stays flat no
+    matter how many stages the pipeline has.
+    """
+    out.writelines(iter_conversion_report(action_paths, pipeline_text, pipeline, analysis))
 
-        <div class="section">
-            <h2>📁 Generated Files Structure</h2>
-            {generate_file_structure_html(action_paths)}
-        </div>
-    </div>
 
-    <script>
-        {get_javascript_code()}
-    </script>
-</body>
-</html>"""
-    
-    return html
+def generate_conversion_report(action_paths: List[Dict[str, Any]], pipeline_text: str,
+                               pipeline: Optional[Pipeline] = None,
+                               analysis: Optional[PipelineAnalysis] = None) -> str:
+    """Generate the interactive HTML conversion report as one string"""
+    return "".join(iter_conversion_report(action_paths, pipeline_text, pipeline, analysis))
 
 
 def get_css_styles() -> str:
@@ -944,8 +880,14 @@ def generate_status_badges_html(action_paths: List[Dict[str, Any]], feasibility:
     """
 
 
-def generate_interactive_stats_grid(action_paths: List[Dict[str, Any]], pipeline_text: str, complexity: Dict[str, Any]) -> str:
-    """Generate interactive statistics grid with clickable elements"""
+def _escape_single_quotes(chunks: Iterable[str]) -> Iterator[str]:
+    """Escape chunks for embedding in a single-quoted data attribute"""
+    for chunk in chunks:
+        yield chunk.replace("'", "\\'")
+
+
+def iter_interactive_stats_grid(action_paths: List[Dict[str, Any]], pipeline_text: str, complexity: Dict[str, Any]) -> Iterator[str]:
+    """Yield the interactive statistics grid with clickable elements"""
     total_stages = len(action_paths)
     docker_stages = [a for a in action_paths if a.get("has_docker")]
     k8s_stages = [a for a in action_paths if a.get("has_kubectl")]
@@ -954,47 +896,52 @@ def generate_interactive_stats_grid(action_paths: List[Dict[str, Any]], pipeline
     post_action_stages = [a for a in action_paths if a.get("has_post_actions")]
     manual_stages = [a for a in action_paths if a.get("manual_conversion_needed")]
     
-    # Generate detailed content for each stat
-    stages_detail = generate_stages_detail_html(action_paths)
-    docker_detail = generate_feature_detail_html("Docker Operations", docker_stages)
-    k8s_detail = generate_feature_detail_html("Kubernetes Operations", k8s_stages)
-    sonar_detail = generate_feature_detail_html("SonarQube Integration", sonar_stages)
-    approval_detail = generate_feature_detail_html("Approval Gates", approval_stages)
-    post_detail = generate_feature_detail_html("Post-Action Stages", post_action_stages)
-    manual_detail = generate_manual_detail_html(manual_stages)
-    
-    return f"""
-        <div class="stat-card clickable" data-type="Total Stages Converted" data-content='{stages_detail}'>
+    yield """
+        <div class="stat-card clickable" data-type="Total Stages Converted" data-content='"""
+    yield from _escape_single_quotes(iter_stages_detail_html(action_paths))
+    yield f"""'>
             <div class="stat-value">{total_stages}</div>
             <div class="stat-label">Total Stages</div>
             <div class="stat-description">Click to see all converted stages</div>
         </div>
-        <div class="stat-card clickable" data-type="Docker Operations" data-content='{docker_detail}'>
+        <div class="stat-card clickable" data-type="Docker Operations" data-content='"""
+    yield from _escape_single_quotes(iter_feature_detail_html("Docker Operations", docker_stages))
+    yield f"""'>
             <div class="stat-value">{len(docker_stages)}</div>
             <div class="stat-label">Docker Stages</div>
             <div class="stat-description">Stages with Docker build/push operations</div>
         </div>
-        <div class="stat-card clickable" data-type="Kubernetes Operations" data-content='{k8s_detail}'>
+        <div class="stat-card clickable" data-type="Kubernetes Operations" data-content='"""
+    yield from _escape_single_quotes(iter_feature_detail_html("Kubernetes Operations", k8s_stages))
+    yield f"""'>
             <div class="stat-value">{len(k8s_stages)}</div>
             <div class="stat-label">Kubernetes Stages</div>
             <div class="stat-description">Stages with kubectl/helm commands</div>
         </div>
-        <div class="stat-card clickable" data-type="SonarQube Integration" data-content='{sonar_detail}'>
+        <div class="stat-card clickable" data-type="SonarQube Integration" data-content='"""
+    yield from _escape_single_quotes(iter_feature_detail_html("SonarQube Integration", sonar_stages))
+    yield f"""'>
             <div class="stat-value">{len(sonar_stages)}</div>
             <div class="stat-label">SonarQube Stages</div>
             <div class="stat-description">Stages with code quality scanning</div>
         </div>
-        <div class="stat-card clickable" data-type="Approval Gates" data-content='{approval_detail}'>
+        <div class="stat-card clickable" data-type="Approval Gates" data-content='"""
+    yield from _escape_single_quotes(iter_feature_detail_html("Approval Gates", approval_stages))
+    yield f"""'>
             <div class="stat-value">{len(approval_stages)}</div>
             <div class="stat-label">Approval Gates</div>
             <div class="stat-description">Stages requiring manual approval</div>
         </div>
-        <div class="stat-card clickable" data-type="Post-Action Handling" data-content='{post_detail}'>
+        <div class="stat-card clickable" data-type="Post-Action Handling" data-content='"""
+    yield from _escape_single_quotes(iter_feature_detail_html("Post-Action Stages", post_action_stages))
+    yield f"""'>
             <div class="stat-value">{len(post_action_stages)}</div>
             <div class="stat-label">Post-Actions</div>
             <div class="stat-description">Stages with post-execution actions</div>
         </div>
-        <div class="stat-card clickable" data-type="Manual Conversion Required" data-content='{manual_detail}'>
+        <div class="stat-card clickable" data-type="Manual Conversion Required" data-content='"""
+    yield from _escape_single_quotes(iter_manual_detail_html(manual_stages))
+    yield f"""'>
             <div class="stat-value">{len(manual_stages)}</div>
             <div class="stat-label">Manual Items</div>
             <div class="stat-description">Stages needing manual attention</div>
@@ -1007,9 +954,9 @@ def generate_interactive_stats_grid(action_paths: List[Dict[str, Any]], pipeline
     """
 
 
-def generate_stages_detail_html(action_paths: List[Dict[str, Any]]) -> str:
-    """Generate detailed HTML for all stages"""
-    stages_html = "<h3>All Converted Stages</h3><div class='stages-list'>"
+def iter_stages_detail_html(action_paths: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield detailed HTML for all stages"""
+    yield "<h3>All Converted Stages</h3><div class='stages-list'>"
     
     for i, action in enumerate(action_paths, 1):
         features = []
@@ -1027,7 +974,7 @@ def generate_stages_detail_html(action_paths: List[Dict[str, Any]]) -> str:
         complexity = action.get("complexity_score", 0)
         complexity_level = "Low" if complexity < 10 else "Medium" if complexity < 25 else "High"
         
-        stages_html += f"""
+        yield f"""
             <div class='stage-summary'>
                 <strong>{i}. {action['name']}</strong>
                 <div style='margin: 5px 0;'>{"".join(features)}</div>
@@ -1038,19 +985,19 @@ def generate_stages_detail_html(action_paths: List[Dict[str, Any]]) -> str:
             </div>
         """
     
-    stages_html += "</div>"
-    return stages_html.replace("'", "\\'")
+    yield "</div>"
 
 
-def generate_feature_detail_html(feature_name: str, stages: List[Dict[str, Any]]) -> str:
-    """Generate detailed HTML for stages with specific features"""
+def iter_feature_detail_html(feature_name: str, stages: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield detailed HTML for stages with specific features"""
     if not stages:
-        return f"<h3>{feature_name}</h3><p>No stages found with this feature.</p>"
+        yield f"<h3>{feature_name}</h3><p>No stages found with this feature.</p>"
+        return
     
-    detail_html = f"<h3>{feature_name}</h3><div class='feature-stages'>"
+    yield f"<h3>{feature_name}</h3><div class='feature-stages'>"
     
     for stage in stages:
-        detail_html += f"""
+        yield f"""
             <div class='feature-stage'>
                 <strong>{stage['name']}</strong>
                 <div style='margin: 5px 0; font-size: 0.9em; color: #666;'>
@@ -1059,35 +1006,34 @@ def generate_feature_detail_html(feature_name: str, stages: List[Dict[str, Any]]
             </div>
         """
     
-    detail_html += "</div>"
-    return detail_html.replace("'", "\\'")
+    yield "</div>"
 
 
-def generate_manual_detail_html(manual_stages: List[Dict[str, Any]]) -> str:
-    """Generate detailed HTML for stages requiring manual conversion"""
+def iter_manual_detail_html(manual_stages: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield detailed HTML for stages requiring manual conversion"""
     if not manual_stages:
-        return "<h3>Manual Conversion Required</h3><p>All stages converted successfully!</p>"
+        yield "<h3>Manual Conversion Required</h3><p>All stages converted successfully!</p>"
+        return
     
-    detail_html = "<h3>Stages Requiring Manual Attention</h3><div class='manual-stages'>"
+    yield "<h3>Stages Requiring Manual Attention</h3><div class='manual-stages'>"
     
     for stage in manual_stages:
         manual_items = stage.get("manual_conversion_needed", [])
-        detail_html += f"""
+        yield f"""
             <div class='manual-stage'>
                 <strong>{stage['name']}</strong>
                 <ul style='margin: 10px 0; padding-left: 20px;'>
         """
         
         for item in manual_items:
-            detail_html += f"<li>{item}</li>"
+            yield f"<li>{item}</li>"
         
-        detail_html += """
+        yield """
                 </ul>
             </div>
         """
     
-    detail_html += "</div>"
-    return detail_html.replace("'", "\\'")
+    yield "</div>"
 
 
 def generate_technology_stack_html(languages: List[str], tools: List[str]) -> str:
@@ -1109,12 +1055,12 @@ def generate_technology_stack_html(languages: List[str], tools: List[str]) -> st
     return html if html else "<p>No specific technologies detected</p>"
 
 
-def generate_secrets_section_html(all_credentials: set, action_paths: List[Dict[str, Any]]) -> str:
-    """Generate HTML for secrets configuration section"""
+def iter_secrets_section_html(all_credentials: set, action_paths: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield HTML for secrets configuration section"""
     if not all_credentials:
-        return ""
+        return
     
-    html = """
+    yield """
         <div class="section">
             <h2>🔐 Required GitHub Secrets Configuration</h2>
             <div class="collapsible">
@@ -1140,7 +1086,7 @@ def generate_secrets_section_html(all_credentials: set, action_paths: List[Dict[
         purpose = get_credential_purpose(cred)
         cred_type = detect_credential_type(cred)
         
-        html += f"""
+        yield f"""
                             <tr>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;"><code>{secret_name}</code></td>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;">{purpose}</td>
@@ -1150,7 +1096,7 @@ def generate_secrets_section_html(all_credentials: set, action_paths: List[Dict[
     
     # Add common secrets
     if any(a.get("has_docker") for a in action_paths):
-        html += """
+        yield """
                             <tr>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;"><code>DOCKER_USERNAME</code></td>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;">Docker registry authentication</td>
@@ -1164,7 +1110,7 @@ def generate_secrets_section_html(all_credentials: set, action_paths: List[Dict[
         """
     
     if any(a.get("has_sonarqube") for a in action_paths):
-        html += """
+        yield """
                             <tr>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;"><code>SONAR_TOKEN</code></td>
                                 <td style="padding: 10px; border: 1px solid #dee2e6;">SonarQube server authentication</td>
@@ -1177,20 +1123,18 @@ def generate_secrets_section_html(all_credentials: set, action_paths: List[Dict[
                             </tr>
         """
     
-    html += """
+    yield """
                         </tbody>
                     </table>
                 </div>
             </div>
         </div>
     """
-    
-    return html
 
 
-def generate_interactive_stages_html(action_paths: List[Dict[str, Any]]) -> str:
-    """Generate interactive HTML for stage details with enhanced navigation"""
-    html = f"""
+def iter_interactive_stages_html(action_paths: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield interactive HTML for stage details with enhanced navigation"""
+    yield f"""
         <div id="stages-section">
             <div style="margin-bottom: 20px; display: flex; gap: 10px; flex-wrap: wrap; align-items: center;">
                 <button onclick="filterStages('all')" class="filter-btn" style="padding: 8px 15px; border: 1px solid #e2e8f0; background: white; border-radius: 6px; cursor: pointer;">All Stages</button>
@@ -1234,7 +1178,7 @@ def generate_interactive_stages_html(action_paths: List[Dict[str, Any]]) -> str:
         if action.get("has_post_actions"): filter_classes.append("post")
         if manual_items: filter_classes.append("manual")
         
-        html += f"""
+        yield f"""
             <div class="stage-card {' '.join(filter_classes)}" data-stage-index="{i}">
                 <div class="stage-header" onclick="toggleCollapsible(this)">
                     <div style="flex: 1;">
@@ -1286,8 +1230,7 @@ def generate_interactive_stages_html(action_paths: List[Dict[str, Any]]) -> str:
             </div>
         """
     
-    html += "</div>"
-    return html
+    yield "</div>"
 
 
 def generate_stage_details_content(action: Dict[str, Any]) -> str:
@@ -1425,20 +1368,20 @@ def generate_enhanced_stage_details_content(action: Dict[str, Any], stage_index:
     return html
 
 
-def generate_manual_conversion_section_html(action_paths: List[Dict[str, Any]], unsupported_features: List[Dict[str, str]]) -> str:
-    """Generate HTML for manual conversion requirements"""
+def iter_manual_conversion_section_html(action_paths: List[Dict[str, Any]], unsupported_features: List[Dict[str, str]]) -> Iterator[str]:
+    """Yield HTML for manual conversion requirements"""
     manual_stages = [a for a in action_paths if a.get("manual_conversion_needed")]
     
     if not manual_stages and not unsupported_features:
-        return ""
+        return
     
-    html = """
+    yield """
         <div class="section">
             <h2>🔧 Manual Conversion Required</h2>
     """
     
     if manual_stages:
-        html += """
+        yield """
             <div class="collapsible">
                 <div class="collapsible-header" onclick="toggleCollapsible(this)">
                     <span>Stage-Level Manual Items</span>
@@ -1448,19 +1391,19 @@ def generate_manual_conversion_section_html(action_paths: List[Dict[str, Any]],
         """
         
         for stage in manual_stages:
-            html += f"""
+            yield f"""
                 <div style="margin-bottom: 20px; padding: 15px; border: 1px solid #e2e8f0; border-radius: 8px;">
                     <h4>{stage['name']}</h4>
                     <ul>
             """
             for item in stage.get("manual_conversion_needed", []):
-                html += f"<li>{item}</li>"
-            html += "</ul></div>"
+                yield f"<li>{item}</li>"
+            yield "</ul></div>"
         
-        html += "</div></div>"
+        yield "</div></div>"
     
     if unsupported_features:
-        html += """
+        yield """
             <div class="collapsible">
                 <div class="collapsible-header" onclick="toggleCollapsible(this)">
                     <span>Pipeline-Level Unsupported Features</span>
@@ -1470,17 +1413,16 @@ def generate_manual_conversion_section_html(action_paths: List[Dict[str, Any]],
         """
         
         for feature in unsupported_features:
-            html += f"""
+            yield f"""
                 <div style="margin-bottom: 15px; padding: 10px; background: #fef5e7; border-left: 4px solid #f59e0b; border-radius: 4px;">
                     <strong>{feature['feature']}</strong><br>
                     <span style="color: #92400e; font-size: 0.9em;">{feature['manual_action']}</span>
                 </div>
             """
         
-        html += "</div></div>"
+        yield "</div></div>"
     
-    html += "</div>"
-    return html
+    yield "</div>"
 
 
 def generate_next_steps_html(action_paths: List[Dict[str, Any]], all_credentials: set, feasibility_analysis: Dict[str, Any]) -> str:
@@ -1553,9 +1495,9 @@ def generate_next_steps_html(action_paths: List[Dict[str, Any]], all_credentials
     return html
 
 
-def generate_file_structure_html(action_paths: List[Dict[str, Any]]) -> str:
-    """Generate HTML for file structure display"""
-    html = """
+def iter_file_structure_html(action_paths: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield HTML for file structure display"""
+    yield """
         <div class="code-block" style="font-family: monospace; white-space: pre;">
 .github/
 ├── workflows/
@@ -1568,15 +1510,13 @@ def generate_file_structure_html(action_paths: List[Dict[str, Any]]) -> str:
         is_last = i == len(action_paths) - 1
         prefix = "└──" if is_last else "├──"
         
-        html += f"""{prefix} {action_name}/
+        yield f"""{prefix} {action_name}/
 {"    " if is_last else "│   "}└── action.yml
 """
     
-    html += """
+    yield """
 CONVERSION_REPORT.html         # This interactive report
     </div>"""
-    
-    return html
 
 
 def detect_credential_type(cred_id: str) -> str:
@@ -1641,7 +1581,7 @@ def add_modals_to_html() -> str:
     """
 
 
-def generate_interactive_html_report(
+def iter_interactive_html_report(
     action_paths: List[Dict[str, Any]], 
     pipeline_text: str, 
     timestamp: str,
@@ -1651,28 +1591,19 @@ def generate_interactive_html_report(
     languages: List[str],
     tools: List[str],
     all_credentials: set
-) -> str:
-    """Generate complete interactive HTML report"""
+) -> Iterator[str]:
+    """Yield the complete interactive HTML report, one section at a time"""
     
-    # Generate all HTML sections
-    status_badges = generate_status_badges_html(action_paths, feasibility_analysis, complexity_analysis)
-    stats_grid = generate_interactive_stats_grid(action_paths, pipeline_text, complexity_analysis)
-    tech_stack = generate_technology_stack_html(languages, tools)
-    secrets_section = generate_secrets_section_html(all_credentials, action_paths)
-    stages_section = generate_interactive_stages_html(action_paths)
-    manual_section = generate_manual_conversion_section_html(action_paths, unsupported_features)
-    next_steps = generate_next_steps_html(action_paths, all_credentials, feasibility_analysis)
-    file_structure = generate_file_structure_html(action_paths)
-    modals = add_modals_to_html()
-    
-    html = f"""<!DOCTYPE html>
+    yield """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Jenkins to GitHub Actions Conversion Report</title>
     <style>
-        {get_css_styles()}
+        """
+    yield get_css_styles()
+    yield f"""
     </style>
 </head>
 <body>
@@ -1689,7 +1620,7 @@ def generate_interactive_html_report(
         <div class="section status-section">
             <h2>📊 Conversion Status Overview</h2>
             <div class="badges">
-                {status_badges}
+                {generate_status_badges_html(action_paths, feasibility_analysis, complexity_analysis)}
             </div>
         </div>
 
@@ -1697,39 +1628,49 @@ def generate_interactive_html_report(
             <h2>📈 Interactive Statistics</h2>
             <p style="color: #666; margin-bottom: 20px;">Click on any statistic below to see detailed information</p>
             <div class="stats-grid">
-                {stats_grid}
+                """
+    yield from iter_interactive_stats_grid(action_paths, pipeline_text, complexity_analysis)
+    yield f"""
             </div>
         </div>
 
         <div class="section">
             <h2>🛠️ Technology Stack Detected</h2>
-            {tech_stack}
+            {generate_technology_stack_html(languages, tools)}
         </div>
 
-        {secrets_section}
+        """
+    yield from iter_secrets_section_html(all_credentials, action_paths)
+    yield """
 
         <div class="section">
             <h2>📋 Stage Conversion Details</h2>
             <p style="color: #666; margin-bottom: 20px;">Click on any stage to expand and see detailed conversion information</p>
-            {stages_section}
+            """
+    yield from iter_interactive_stages_html(action_paths)
+    yield """
         </div>
 
-        {manual_section}
+        """
+    yield from iter_manual_conversion_section_html(action_paths, unsupported_features)
+    yield f"""
 
-        {next_steps}
+        {generate_next_steps_html(action_paths, all_credentials, feasibility_analysis)}
 
         <div class="section">
             <h2>📁 Generated Files Structure</h2>
-            {file_structure}
+            """
+    yield from iter_file_structure_html(action_paths)
+    yield f"""
         </div>
     </div>
 
-    {modals}
+    {add_modals_to_html()}
 
     <script>
-        {get_javascript_code()}
+        """
+    yield get_javascript_code()
+    yield """
     </script>
 </body>
 </html>"""
-    
-    return html
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Long-running conversion server
+
+Keeps warm converter processes in memory so callers don't pay interpreter
+startup, imports and regex compilation per conversion. Speaks JSON over
+HTTP, on a TCP port or a Unix socket:
+
+    python server.py --port 8080 --workers 4
+    python server.py --socket /run/gha-converter.sock
+
+    POST /convert  {"jenkinsfile": "...", "name": "ci", "parser": "regex",
+                    "report": "markdown" | "html" | "none"}
+      -> {"workflow_path": ".github/workflows/ci.yml", "workflow": "<yaml>",
+          "actions": {"<path>": "<yaml>"}, "action_paths": [...],
+          "report": "...", "warnings": "...", "seconds": 0.01}
+    GET /health    -> worker, queue and request counters
+
+Conversions run in a bounded process pool. When every worker is busy and
+the queue is full the server answers 503 instead of queueing without
+limit; a conversion that exceeds the request timeout is answered with 504.
+A running conversion cannot be interrupted, so after a timeout the pool is
+replaced and its processes are terminated; requests that were running in
+the old pool are retried once in the new one.
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from converter import PARSER_BACKENDS, DEFAULT_PARSER, CONVERTER_VERSION
+from main import convert_file, render_conversion, generate_simple_markdown_report, workflow_name_for
+from report_generator import write_conversion_report
+from output_writer import yaml_backend
+
+
+REPORT_FORMATS = ("markdown", "html", "none")
+# Request bodies above this size are rejected with 413
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+
+# Converted once per worker at startup so imports, regex compilation and
+# lazily built tables are warm before the first request
+WARM_UP_PIPELINE = """
+pipeline {
+    agent any
+    stages {
+        stage('Build') {
+            steps { sh 'make' }
+        }
+    }
+}
+"""
+
+
+def _warm_up():
+    convert_file(WARM_UP_PIPELINE, Path("."), capture_output=True)
+
+
+def convert_request(jenkins_text: str, name: str = "ci", parser: str = DEFAULT_PARSER,
+                    report: str = "markdown") -> Dict[str, Any]:
+    """Convert one Jenkinsfile in a pool worker; returns the JSON response body"""
+    result = convert_file(jenkins_text, Path("."), capture_output=True, parser=parser)
+    response = {"workflow_path": f".github/workflows/{name}.yml", **render_conversion(result)}
+    if report == "markdown":
+        response["report"] = generate_simple_markdown_report(result["action_paths"], jenkins_text, result["analysis"])
+    elif report == "html":
+        out = io.StringIO()
+        write_conversion_report(out, result["action_paths"], jenkins_text, analysis=result["analysis"])
+        response["report"] = out.getvalue()
+    return response
+
+
+class RequestError(Exception):
+    """Client error answered with an HTTP status and a JSON message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionService:
+    """Bounded process pool shared by all request threads"""
+
+    def __init__(self, workers: int, queue: int, timeout: float, default_parser: str = DEFAULT_PARSER):
+        self.workers = workers
+        self.timeout = timeout
+        self.default_parser = default_parser
+        self.executor = self._new_pool()
+        # Guards swapping self.executor against submits to the old pool
+        self.pool_lock = threading.Lock()
+        # Admitted requests: running plus waiting for a worker
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.capacity = workers + queue
+        self.lock = threading.Lock()
+        self.stats = {"in_flight": 0, "served": 0, "failed": 0, "rejected": 0, "timed_out": 0, "recycled": 0}
+        self.started = time.time()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+
+    def _count(self, key: str, delta: int = 1):
+        with self.lock:
+            self.stats[key] += delta
+
+    def parse_request(self, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict) or not isinstance(payload.get("jenkinsfile"), str):
+            raise RequestError(400, "expected a JSON object with a 'jenkinsfile' string")
+        parser = payload.get("parser", self.default_parser)
+        if parser not in PARSER_BACKENDS:
+            raise RequestError(400, f"unknown parser '{parser}' (expected one of: {', '.join(PARSER_BACKENDS)})")
+        report = payload.get("report", "markdown")
+        if report not in REPORT_FORMATS:
+            raise RequestError(400, f"unknown report format '{report}' (expected one of: {', '.join(REPORT_FORMATS)})")
+        return {
+            "jenkins_text": payload["jenkinsfile"],
+            "name": workflow_name_for(Path(str(payload.get("name") or "Jenkinsfile"))),
+            "parser": parser,
+            "report": report,
+        }
+
+    def convert(self, payload: Any) -> Dict[str, Any]:
+        request = self.parse_request(payload)
+        if not self.slots.acquire(blocking=False):
+            self._count("rejected")
+            raise RequestError(503, f"server busy ({self.capacity} conversions running or queued)")
+        self._count("in_flight")
+        future = None
+        recycled = False
+        try:
+            for attempt in range(2):
+                with self.pool_lock:
+                    executor = self.executor
+                    future = executor.submit(convert_request, **request)
+                try:
+                    response = future.result(timeout=self.timeout)
+                except FutureTimeout:
+                    self._count("timed_out")
+                    if not future.cancel() and not future.done():
+                        recycled = self._recycle(executor)
+                    raise RequestError(504, f"conversion exceeded {self.timeout:g}s")
+                except (BrokenProcessPool, CancelledError):
+                    # The pool was recycled under this request, or a worker died
+                    self._recycle(executor)
+                    if attempt == 0:
+                        continue
+                    self._count("failed")
+                    raise RequestError(503, "conversion interrupted by a worker restart")
+                except ValueError as e:
+                    self._count("failed")
+                    raise RequestError(422, str(e))
+                except Exception:
+                    # Answered with 500 by the handler
+                    self._count("failed")
+                    raise
+                self._count("served")
+                return response
+        finally:
+            # A timed-out conversion keeps its slot until its worker is free
+            # or has been terminated with the pool
+            if recycled or future is None or future.cancel() or future.done():
+                self._release()
+            else:
+                future.add_done_callback(lambda _: self._release())
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> bool:
+        """Replace executor with a fresh pool and terminate its processes,
+        unless another request already did; returns whether this call did"""
+        with self.pool_lock:
+            if self.executor is not executor:
+                return False
+            self.executor = self._new_pool()
+        self._count("recycled")
+        # shutdown() drops the process table, so take it first
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        return True
+
+    def _release(self):
+        self._count("in_flight", -1)
+        self.slots.release()
+
+    def health(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+        return {
+            "status": "ok",
+            "converter_version": CONVERTER_VERSION,
+            "yaml_backend": yaml_backend(),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "timeout": self.timeout,
+            "uptime": round(time.time() - self.started, 3),
+            **stats,
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """JSON endpoints; the service and limits are attached to the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Any:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise RequestError(411, "Content-Length required")
+        if length > self.server.max_body_bytes:
+            raise RequestError(413, f"request body exceeds {self.server.max_body_bytes} bytes")
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError as e:
+            raise RequestError(400, f"invalid JSON: {e}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {"error": f"no such endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/convert":
+            self._send_json(404, {"error": f"no such endpoint: {self.path}"})
+            return
+        try:
+            self._send_json(200, self.server.service.convert(self._read_json()))
+        except RequestError as e:
+            if e.status in (411, 413):
+                self.close_connection = True
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"conversion failed: {e}"})
+
+    def log_message(self, format: str, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # HTTPServer.server_bind expects a (host, port) address
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service: ConversionService, host: str = "127.0.0.1", port: int = 8080,
+                socket_path: Optional[str] = None, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+                quiet: bool = False) -> socketserver.BaseServer:
+    """HTTP server on host:port, or on a Unix socket when socket_path is given"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, ConversionHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ConversionHandler)
+    server.service = service
+    server.max_body_bytes = max_body_bytes
+    server.quiet = quiet
+    return server
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve Jenkinsfile to GitHub Actions conversions over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="TCP port (default: 8080)")
+    parser.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="converter processes (default: CPUs)")
+    parser.add_argument("--queue", type=int, default=None,
+                        help="requests allowed to wait for a worker before answering 503 (default: 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per conversion before answering 504")
+    parser.add_argument("--parser", choices=list(PARSER_BACKENDS), default=DEFAULT_PARSER,
+                        help="default parser backend for requests that don't name one")
+    parser.add_argument("--max-body", type=int, default=DEFAULT_MAX_BODY_BYTES, help="largest accepted request in bytes")
+    parser.add_argument("--quiet", action="store_true", help="don't log requests")
+    args = parser.parse_args(argv)
+
+    workers = max(1, args.workers)
+    queue = args.queue if args.queue is not None else 4 * workers
+    service = ConversionService(workers, max(0, queue), args.timeout, args.parser)
+    server = make_server(service, args.host, args.port, args.socket, args.max_body, args.quiet)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    # Stop cleanly (removing the socket file) on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🚀 Conversion server listening on {where} ({workers} worker(s), {queue} queued, {args.timeout:g}s timeout)",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down", file=sys.stderr)
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# The converter modules live at the repository root
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SIMPLE_PIPELINE = """pipeline {
+    agent any
+    environment {
+        APP = 'demo'
+    }
+    stages {
+        stage('Build') {
+            steps {
+                sh 'make build'
+            }
+        }
+        stage('Test') {
+            steps {
+                sh 'make test'
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.fixture
+def run_main():
+    """Run main.py with the given arguments; returns the CompletedProcess"""
+    def run(*args, input=None):
+        return subprocess.run([sys.executable, str(ROOT / "main.py"), *map(str, args)],
+                              input=input, capture_output=True, text=True, cwd=ROOT, timeout=120)
+    return run
@@ -0,0 +1,61 @@
+"""Content-addressed composite action names"""
+
+import yaml
+
+from action_store import ActionStore, action_digest, action_ref, remap_action_refs, DIGEST_CHARS
+from conftest import SIMPLE_PIPELINE
+
+BUILD = {"name": "Build", "runs": {"using": "composite", "steps": [{"run": "make", "shell": "bash"}]}}
+OTHER_BUILD = {"name": "Build", "runs": {"using": "composite", "steps": [{"run": "npm run build", "shell": "bash"}]}}
+
+
+def test_digest_ignores_key_and_set_order():
+    reordered = {"runs": {"steps": [{"shell": "bash", "run": "make"}], "using": "composite"}, "name": "Build"}
+    assert action_digest(BUILD) == action_digest(reordered)
+    assert action_digest({"secrets": {"b", "a", "c"}}) == action_digest({"secrets": {"c", "a", "b"}})
+    assert action_digest(BUILD) != action_digest(OTHER_BUILD)
+
+
+def test_same_name_different_definition_gets_hash_suffix():
+    store = ActionStore()
+    assert store.put("build", BUILD) == ("build", True)
+    assert store.put("build", dict(BUILD)) == ("build", False)
+    name, is_new = store.put("build", OTHER_BUILD)
+    assert is_new and name == f"build-{action_digest(OTHER_BUILD)[:DIGEST_CHARS]}"
+    assert store.stats() == {"stored": 2, "shared": 1, "renamed": 1}
+
+    # A suffixed name from another store is merged back under its base name
+    merged = ActionStore()
+    assert merged.put(name, OTHER_BUILD) == ("build", True)
+
+
+def test_remap_action_refs_rewrites_uses_and_paths():
+    workflow = {"jobs": {"build": {"steps": [{"uses": "actions/checkout@v4"}, {"uses": action_ref("build")}]}}}
+    action_paths = [{"name": "Build", "path": action_ref("build")}]
+    remap_action_refs(workflow, action_paths, {"build": "build-1234abcd", "test": "test"})
+    assert workflow["jobs"]["build"]["steps"] == [{"uses": "actions/checkout@v4"}, {"uses": action_ref("build-1234abcd")}]
+    assert action_paths[0]["path"] == action_ref("build-1234abcd")
+
+
+def test_colliding_stages_across_files_keep_separate_actions(tmp_path, run_main):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    (inputs / "a.Jenkinsfile").write_text(SIMPLE_PIPELINE)
+    (inputs / "b.Jenkinsfile").write_text(SIMPLE_PIPELINE.replace("make build", "npm run build"))
+    output = tmp_path / "out"
+    result = run_main("-o", output, inputs)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    actions = output / ".github" / "actions"
+    builds = sorted(path.name for path in actions.iterdir() if path.name.startswith("build"))
+    assert len(builds) == 2 and builds[0] == "build" and builds[1].startswith("build-")
+    # Identical Test stages are shared
+    assert [path.name for path in actions.iterdir() if path.name.startswith("test")] == ["test"]
+
+    for workflow_name, command in (("a", "make build"), ("b", "npm run build")):
+        workflow = yaml.safe_load((output / ".github" / "workflows" / f"{workflow_name}.yml").read_text())
+        uses = [step["uses"] for job in workflow["jobs"].values() for step in job["steps"]
+                if step.get("uses", "").startswith("./.github/actions/build")]
+        assert len(uses) == 1
+        action = (output / uses[0][len("./"):] / "action.yml").read_text()
+        assert command in action
@@ -0,0 +1,61 @@
+"""Conversion cache: unchanged Jenkinsfiles are served from disk on re-runs"""
+
+import converter
+from conversion_cache import ConversionCache
+from conftest import SIMPLE_PIPELINE
+from main import parse_cli_options, convert_inputs
+
+
+def test_entries_round_trip_and_are_versioned(tmp_path):
+    cache = ConversionCache(tmp_path, version="1.0")
+    key = cache.key(SIMPLE_PIPELINE)
+    assert cache.get(key) is None
+    cache.put(key, {"name": "ci"}, [{"name": "build"}], {"build/action.yml": {"name": "Build"}})
+    entry = cache.get(key)
+    assert entry["workflow"] == {"name": "ci"} and entry["actions"] == {"build/action.yml": {"name": "Build"}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A new converter version neither finds nor reuses the old entry
+    upgraded = ConversionCache(tmp_path, version="1.1")
+    assert upgraded.key(SIMPLE_PIPELINE) != key
+    assert upgraded.get(key) is None
+    assert cache.key(SIMPLE_PIPELINE + "\n") != key
+
+
+def _workflow_files(output):
+    return {path.relative_to(output): path.read_text() for path in (output / ".github").rglob("*.yml")}
+
+
+def test_rerun_hits_cache_and_edits_invalidate(tmp_path, run_main):
+    jenkinsfile = tmp_path / "app.Jenkinsfile"
+    jenkinsfile.write_text(SIMPLE_PIPELINE)
+    output = tmp_path / "out"
+
+    first = run_main("-o", output, jenkinsfile)
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert "Conversion cache: 0 unchanged file(s) reused, 1 converted" in first.stdout
+    converted = _workflow_files(output)
+
+    second = run_main("-o", output, jenkinsfile)
+    assert "Conversion cache: 1 unchanged file(s) reused, 0 converted" in second.stdout
+    assert "using cached conversion" in second.stdout
+    assert _workflow_files(output) == converted
+
+    jenkinsfile.write_text(SIMPLE_PIPELINE.replace("make test", "make check"))
+    third = run_main("-o", output, jenkinsfile)
+    assert "Conversion cache: 0 unchanged file(s) reused, 1 converted" in third.stdout
+
+
+def test_converter_version_bump_invalidates(tmp_path, capsys, monkeypatch):
+    jenkinsfile = tmp_path / "app.Jenkinsfile"
+    jenkinsfile.write_text(SIMPLE_PIPELINE)
+    options, _ = parse_cli_options(["-o", str(tmp_path / "out")])
+
+    def run():
+        convert_inputs([jenkinsfile], options["output"], options, "regex")
+        return capsys.readouterr().out
+
+    run()
+    assert "1 unchanged file(s) reused" in run()
+    monkeypatch.setattr(converter, "CONVERTER_VERSION", converter.CONVERTER_VERSION + "-next")
+    assert "0 unchanged file(s) reused, 1 converted" in run()
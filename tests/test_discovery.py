@@ -0,0 +1,56 @@
+"""Recursive Jenkinsfile discovery: globs, excludes and once-only visits"""
+
+import os
+
+import pytest
+
+from conftest import SIMPLE_PIPELINE
+from discovery import iter_inputs, iter_jenkinsfiles
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    for rel in ("Jenkinsfile", "app/build.Jenkinsfile", "app/README.md", "app/sub/Jenkinsfile.release",
+                "node_modules/pkg/Jenkinsfile", "vendor/Jenkinsfile"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SIMPLE_PIPELINE)
+    return root
+
+
+def _rel(paths, root):
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_walk_is_depth_first_and_honours_globs(tree):
+    found = _rel(iter_jenkinsfiles(tree, exclude=["vendor"]), tree)
+    assert found == ["Jenkinsfile", "app/build.Jenkinsfile", "app/sub/Jenkinsfile.release"]
+    assert _rel(iter_jenkinsfiles(tree, include=["*.Jenkinsfile"]), tree) == ["app/build.Jenkinsfile"]
+    assert _rel(iter_jenkinsfiles(tree, exclude=["app/sub/*"]), tree) == [
+        "Jenkinsfile", "app/build.Jenkinsfile", "vendor/Jenkinsfile"]
+
+
+def test_symlinks_and_repeated_inputs_yield_each_file_once(tree, tmp_path):
+    os.symlink(tree / "app", tree / "app-link", target_is_directory=True)
+    os.symlink(tree / "Jenkinsfile", tree / "copy.Jenkinsfile")
+    outside = tmp_path / "outside-link"
+    os.symlink(tree / "app", outside, target_is_directory=True)
+
+    # Symlinked directories inside the walk are not followed, symlinked files
+    # count as their target
+    assert _rel(iter_jenkinsfiles(tree, exclude=["vendor"]), tree) == [
+        "Jenkinsfile", "app/build.Jenkinsfile", "app/sub/Jenkinsfile.release"]
+    # Overlapping inputs: the app directory again through a symlink, and a repeated file
+    found = list(iter_inputs([tree, outside, tree / "Jenkinsfile"], exclude=["vendor"]))
+    assert len(found) == 3 and found == list(iter_jenkinsfiles(tree, exclude=["vendor"]))
+
+
+def test_symlinked_directory_is_converted_once(tree, tmp_path, run_main):
+    link = tmp_path / "repo-link"
+    os.symlink(tree, link, target_is_directory=True)
+    result = run_main("-o", tmp_path / "out", "--exclude", "vendor", tree, link)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Jenkins files processed: 3/3" in result.stdout
@@ -0,0 +1,71 @@
+"""Groovy lexer: string-aware scanning of comments and GStrings"""
+
+from groovy_lexer import GSTRING, COMMENT, tokenize, iter_comments, scan_string, parse_blocks, SourceView
+from utils import strip_comments, find_block
+
+PIPELINE = """pipeline {
+    agent any
+    stages {
+        stage('Build') {
+            steps {
+                sh 'echo "}" // not a comment'
+                sh "curl http://example.com/x"  // fetch
+                /* stage('Fake') { } */
+            }
+        }
+        stage("Deploy") {
+            when { branch 'main' }
+            steps { sh 'deploy' }
+        }
+    }
+}
+"""
+
+
+def test_comment_markers_in_strings_and_urls_survive_strip_comments():
+    stripped = strip_comments(PIPELINE)
+    assert "sh 'echo \"}\" // not a comment'" in stripped
+    assert 'sh "curl http://example.com/x"' in stripped
+    assert "// fetch" not in stripped and "Fake" not in stripped
+    assert len(stripped) == len(PIPELINE)
+
+
+def test_block_tree_ignores_braces_in_strings_and_comments():
+    view = SourceView(strip_comments(PIPELINE))
+    stages = view.block("stages")
+    names = [name for name, _ in stages.stages()]
+    assert names == ["Build", "Deploy"]
+    build = stages.stages()[0][1]
+    assert "sh 'deploy'" not in str(build)
+    assert str(build.block("steps")).strip().startswith("sh 'echo \"}\"")
+    assert str(stages.stages()[1][1].block("when")).strip() == "branch 'main'"
+
+
+def test_find_block_returns_content_offsets():
+    start, end = find_block(PIPELINE, r"when")
+    assert PIPELINE[start:end] == " branch 'main' "
+    assert find_block(PIPELINE, r"post") == (-1, -1)
+    assert parse_blocks(PIPELINE) is parse_blocks(PIPELINE)
+
+
+def test_nested_interpolation_end():
+    text = 'x = "a ${ b ? "c ${ d["}"] }" : \'}\' } e" + f'
+    end = scan_string(text, 4)
+    assert text[end:] == " + f"
+
+
+def test_deeply_nested_gstrings_do_not_exhaust_the_stack():
+    depth = 5000
+    text = 'x = ' + '"${' * depth + 'a' + '}"' * depth + ' // done\n'
+    end = len(text) - len(' // done\n')
+    assert scan_string(text, 4) == end
+    kinds = [(token.kind, token.start, token.end) for token in tokenize(text)]
+    assert kinds == [(GSTRING, 4, end), (COMMENT, end + 1, len(text) - 1)]
+    assert list(iter_comments(text)) == [(end + 1, len(text) - 1)]
+
+
+def test_unterminated_gstring_ends_at_line_break():
+    # The inner "a stops at the newline; the interpolation and outer GString continue
+    text = 'x = "${ "a\n }" // comment\n'
+    assert scan_string(text, 4) == text.index(" //")
+    assert list(iter_comments(text)) == [(text.index("//"), len(text) - 1)]
@@ -0,0 +1,40 @@
+"""--jsonl batch mode: one result line per record, in input order"""
+
+import json
+
+import pytest
+
+from conftest import SIMPLE_PIPELINE
+
+
+def _records():
+    return [
+        '{"id": "broken", "jenkinsfile_text": ',
+        json.dumps({"id": "good", "name": "app", "jenkinsfile_text": SIMPLE_PIPELINE}),
+        "",
+        json.dumps({"id": "not-a-pipeline", "jenkinsfile_text": "echo hi"}),
+        json.dumps({"id": "good-2", "jenkinsfile_text": SIMPLE_PIPELINE.replace("make test", "make check")}),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_errors_do_not_stop_the_batch_and_order_is_kept(run_main, jobs):
+    result = run_main("--jsonl", "-", "--jobs", jobs, input="\n".join(_records()) + "\n")
+    assert result.returncode == 0, result.stderr
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(line["id"], line["ok"]) for line in lines] == [
+        (None, False), ("good", True), ("not-a-pipeline", False), ("good-2", True)]
+
+    broken, good, invalid, _ = lines
+    assert broken["line"] == 1 and broken["error"]
+    assert invalid["line"] == 4 and "declarative" in invalid["error"]
+    assert good["workflow_path"] == ".github/workflows/app.yml"
+    assert "make build" in good["actions"][".github/actions/build/action.yml"]
+    assert "make check" in lines[3]["actions"][".github/actions/test/action.yml"]
+    assert "2 record(s) converted, 2 failed" in result.stderr
+
+
+def test_all_records_failing_exits_non_zero(run_main):
+    result = run_main("--jsonl", "-", input='{"id": 1}\n[1, 2]\n')
+    assert result.returncode == 1
+    assert [json.loads(line)["ok"] for line in result.stdout.splitlines()] == [False, False]
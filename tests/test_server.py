@@ -0,0 +1,91 @@
+"""ConversionService: timeouts must not leave workers stuck on a conversion"""
+
+import threading
+import time
+
+import pytest
+
+import server
+from server import ConversionService, RequestError
+
+
+def _fake_request(jenkins_text, name="ci", parser=None, report=None):
+    """Stands in for convert_request in the pool workers (inherited through fork)"""
+    if jenkins_text == "hang":
+        time.sleep(60)
+    elif jenkins_text.startswith("sleep "):
+        time.sleep(float(jenkins_text.split()[1]))
+    elif jenkins_text == "crash":
+        raise RuntimeError("converter bug")
+    return {"workflow": jenkins_text}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(server, "convert_request", _fake_request)
+    services = []
+
+    def make(workers=1, queue=0, timeout=1.0):
+        services.append(ConversionService(workers, queue, timeout))
+        return services[-1]
+
+    yield make
+    for svc in services:
+        svc.shutdown()
+
+
+def _pool_processes(svc):
+    return list(svc.executor._processes.values())
+
+
+def test_timeout_recycles_pool(service):
+    svc = service(workers=1, timeout=0.5)
+    assert svc.convert({"jenkinsfile": "ready"})["workflow"] == "ready"
+    old_executor, old_processes = svc.executor, _pool_processes(svc)
+
+    with pytest.raises(RequestError) as error:
+        svc.convert({"jenkinsfile": "hang"})
+    assert error.value.status == 504
+
+    assert svc.executor is not old_executor
+    for process in old_processes:
+        process.join(5)
+        assert not process.is_alive()
+    health = svc.health()
+    assert health["timed_out"] == 1 and health["recycled"] == 1 and health["in_flight"] == 0
+
+    # The only worker slot is free again and the new pool serves requests
+    assert svc.convert({"jenkinsfile": "after"})["workflow"] == "after"
+
+
+def test_requests_in_recycled_pool_are_retried(service):
+    svc = service(workers=2, queue=1, timeout=1.0)
+    results = {}
+
+    def convert(text):
+        try:
+            results[text] = svc.convert({"jenkinsfile": text})["workflow"]
+        except RequestError as e:
+            results[text] = e.status
+
+    hang = threading.Thread(target=convert, args=("hang",))
+    hang.start()
+    time.sleep(0.5)
+    # Still running when the hung conversion times out and its pool is terminated
+    slow = threading.Thread(target=convert, args=("sleep 0.8",))
+    slow.start()
+    hang.join(10)
+    slow.join(10)
+
+    assert results == {"hang": 504, "sleep 0.8": "sleep 0.8"}
+    health = svc.health()
+    assert health["recycled"] == 1 and health["served"] == 1 and health["in_flight"] == 0
+
+
+def test_unexpected_errors_are_counted_as_failed(service):
+    svc = service(workers=1)
+    with pytest.raises(RuntimeError):
+        svc.convert({"jenkinsfile": "crash"})
+    health = svc.health()
+    assert health["failed"] == 1 and health["served"] == 0 and health["in_flight"] == 0
+    assert svc.convert({"jenkinsfile": "after"})["workflow"] == "after"
@@ -0,0 +1,33 @@
+"""SourceView windows: extractors see the same stage text without copying it"""
+
+from pathlib import Path
+
+import pytest
+
+from action_generator import StageAnalysis
+from groovy_lexer import SourceView
+from pipeline_ir import parse_pipeline
+
+ROOT = Path(__file__).resolve().parent.parent
+JENKINSFILES = sorted(path for path in (ROOT / "test-jenkinsfiles").glob("*.Jenkinsfile") if "scripted" not in path.name)
+
+
+def test_view_matches_window_only():
+    text = "before { a } middle { b } after"
+    view = SourceView(text, text.index("middle"), text.index("after"))
+    assert str(view) == "middle { b } "
+    assert len(view) == len(str(view))
+    assert str(view.block("middle")) == " b "
+    assert view.block("before") is None
+    assert SourceView.of(view) is view
+
+
+@pytest.mark.parametrize("path", JENKINSFILES, ids=lambda path: path.stem)
+def test_extractors_on_views_match_copied_text(path):
+    pipeline = parse_pipeline(path.read_text(encoding="utf-8"))
+    stages = list(pipeline.iter_stages())
+    assert stages
+    for stage in stages:
+        assert isinstance(stage.source, SourceView) and str(stage.source) == stage.body
+        for name, extractor in StageAnalysis.ANALYZERS.items():
+            assert extractor(stage.source) == extractor(stage.body), (stage.name, name)
@@ -0,0 +1,76 @@
+"""Per-stage cache: unchanged stages of an edited Jenkinsfile are not converted again"""
+
+import pytest
+
+import pipeline_ir
+from conftest import SIMPLE_PIPELINE
+from conversion_cache import StageCache
+from pipeline_ir import parse_pipeline
+
+EDITED = SIMPLE_PIPELINE.replace("make test", "make check")
+
+
+def test_key_covers_stage_text_environment_agent_and_version(tmp_path):
+    cache = StageCache(tmp_path, version="1.0")
+    key = cache.key("Build", "sh 'make'", {"A": "1", "B": "2"}, {"type": "any"})
+    assert key == cache.key("Build", "sh 'make'", {"B": "2", "A": "1"}, {"type": "any"})
+    for changed in (
+        cache.key("Compile", "sh 'make'", {"A": "1", "B": "2"}, {"type": "any"}),
+        cache.key("Build", "sh 'make all'", {"A": "1", "B": "2"}, {"type": "any"}),
+        cache.key("Build", "sh 'make'", {"A": "1", "B": "3"}, {"type": "any"}),
+        cache.key("Build", "sh 'make'", {"A": "1", "B": "2"}, {"type": "label", "label": "linux"}),
+        cache.key("Build", "sh 'make'", {"A": "1", "B": "2"}, {"type": "any"}, is_parallel_child=True),
+        StageCache(tmp_path, version="1.1").key("Build", "sh 'make'", {"A": "1", "B": "2"}, {"type": "any"}),
+    ):
+        assert changed != key
+
+
+@pytest.fixture
+def parsed_stages(monkeypatch):
+    """Names of the stages run through parse_stage (cache misses)"""
+    calls = []
+    parse_stage = pipeline_ir.parse_stage
+
+    def counting(name, body):
+        calls.append(name)
+        return parse_stage(name, body)
+
+    monkeypatch.setattr(pipeline_ir, "parse_stage", counting)
+    return calls
+
+
+def test_unchanged_stages_skip_extraction(tmp_path, parsed_stages):
+    cache = StageCache(tmp_path)
+    cold = parse_pipeline(SIMPLE_PIPELINE, cache)
+    assert parsed_stages == ["Build", "Test"]
+
+    warm = parse_pipeline(SIMPLE_PIPELINE, cache)
+    assert parsed_stages == ["Build", "Test"]
+    assert [stage.to_dict() for stage in warm.stages] == [stage.to_dict() for stage in cold.stages]
+
+    parse_pipeline(EDITED, cache)
+    assert parsed_stages == ["Build", "Test", "Test"]
+
+    # The pipeline environment is part of every stage's key
+    parse_pipeline(EDITED.replace("'demo'", "'other'"), cache)
+    assert parsed_stages == ["Build", "Test", "Test", "Build", "Test"]
+
+
+def _outputs(output):
+    return {path.relative_to(output): path.read_text() for path in (output / ".github").rglob("*.yml")}
+
+
+@pytest.mark.parametrize("parser", ["regex", "grammar"])
+def test_edited_file_reuses_unchanged_stage_actions(tmp_path, run_main, parser):
+    jenkinsfile = tmp_path / "app.Jenkinsfile"
+    jenkinsfile.write_text(SIMPLE_PIPELINE)
+    output = tmp_path / "out"
+    assert run_main("--parser", parser, "-o", output, jenkinsfile).returncode == 0
+
+    jenkinsfile.write_text(EDITED)
+    warm = run_main("--parser", parser, "-o", output, jenkinsfile)
+    assert "Stage cache: 1 unchanged stage(s) reused, 1 converted" in warm.stdout, warm.stdout
+
+    cold = tmp_path / "cold"
+    assert run_main("--parser", parser, "--no-cache", "-o", cold, jenkinsfile).returncode == 0
+    assert _outputs(output) == _outputs(cold)
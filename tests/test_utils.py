@@ -0,0 +1,53 @@
+"""Comment stripping and the snippets written to generated files"""
+
+import pytest
+
+from utils import strip_comments, compact_snippet, LazyAnalysis
+
+
+def test_strip_comments_keeps_offsets():
+    text = "sh 'make'  // build\n/* two\n   lines */ echo 'x'\n"
+    assert strip_comments(text) == "sh 'make'" + " " * 10 + "\n" + " " * 6 + "\n" + " " * 12 + "echo 'x'\n"
+
+
+def test_compact_snippet_drops_comment_blanks():
+    text = ("def target = 'prod' /* inline */ + suffix\n"
+            "    sh \"deploy ${target}\"   // ship it\n"
+            "    // whole-line comment\n"
+            "    echo 'done'")
+    assert compact_snippet(strip_comments(text)) == (
+        "def target = 'prod' + suffix\n"
+        "    sh \"deploy ${target}\"\n"
+        "\n"
+        "    echo 'done'")
+
+
+class _Counting(LazyAnalysis):
+    ANALYZERS = {"length": len}
+    DERIVED = ("double",)
+    STATS = {"computed": 0, "reused": 0}
+    __slots__ = ("text", "calls")
+
+    def __init__(self, text, **precomputed):
+        self.text = text
+        self.calls = []
+        self._results = precomputed
+
+    def _compute(self, name):
+        self.calls.append(name)
+        return 2 * self.length if name == "double" else self.ANALYZERS[name](self.text)
+
+
+def test_lazy_analysis_computes_each_attribute_once():
+    _Counting.STATS.update(computed=0, reused=0)
+    analysis = _Counting("abcd")
+    assert (analysis.double, analysis.double, analysis.length) == (8, 8, 4)
+    assert analysis.calls == ["double", "length"]
+    assert _Counting.STATS == {"computed": 2, "reused": 2}
+    with pytest.raises(AttributeError):
+        analysis.missing
+
+
+def test_lazy_analysis_uses_seeded_results():
+    analysis = _Counting("abcd", length=10)
+    assert analysis.double == 20 and analysis.calls == ["double"]
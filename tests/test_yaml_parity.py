@@ -0,0 +1,70 @@
+"""dump_yaml must produce the same text as the pure-Python SafeDumper"""
+
+import random
+from pathlib import Path
+
+import pytest
+import yaml
+
+from output_writer import dump_yaml, load_yaml, yaml_backend, YAML_WIDTH
+
+
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_FILES = sorted((ROOT / "test-outputs").rglob("*.yml"))
+
+
+def pure_dump(data, allow_unicode):
+    return yaml.dump(data, Dumper=yaml.SafeDumper, sort_keys=False, width=YAML_WIDTH,
+                     default_flow_style=False, allow_unicode=allow_unicode)
+
+
+SCRIPT = "set -e\nif [ -f pom.xml ]; then\n  mvn -B verify \nfi\n"
+
+DOCUMENTS = {
+    "emoji-env": {"env": {"GREETING": "🚀 ship it"}},
+    "emoji-run": {"steps": [{"name": "Done", "run": "echo ✅ done 🎉"}]},
+    "non-bmp-key": {"𝔘nicode": "value"},
+    "latin-1": {"name": "Déploiement", "run": "echo 'naïve café'"},
+    "cjk": {"name": "构建", "run": "echo 日本語"},
+    "cr-and-nel": {"run": "line one\r\nline two\x85three", "a\rb": 1},
+    "line-separators": {"run": "a\u2028b\u2029c\ufeff"},
+    "control-characters": {"run": "printf '\x07\x1b[0m'\tdone"},
+    "long-double-quoted": {"jobs": {"build": {"steps": [{"run": SCRIPT * 40}]}}},
+    "long-escaped": {"run": "é " * 300},
+    "long-emoji-script": {"run": ("echo 🚀\n  deploy \n" * 60)},
+    "long-unicode-key": {"é" * 70: 1, "日" * 40: 2, "K" * 125: 3},
+    "deep-nesting": {"level": [{"level": [{"level": {"run": "ünïcödé \n" * 90}}]}]},
+}
+
+
+@pytest.mark.parametrize("path", OUTPUT_FILES, ids=lambda p: str(p.relative_to(ROOT)))
+@pytest.mark.parametrize("allow_unicode", [False, True])
+def test_test_outputs_match_pure_dumper(path, allow_unicode):
+    data = load_yaml(path.read_text(encoding="utf-8"))
+    assert dump_yaml(data, allow_unicode) == pure_dump(data, allow_unicode)
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+@pytest.mark.parametrize("allow_unicode", [False, True])
+def test_non_ascii_documents_match_pure_dumper(name, allow_unicode):
+    data = DOCUMENTS[name]
+    assert dump_yaml(data, allow_unicode) == pure_dump(data, allow_unicode)
+
+
+def test_emoji_is_not_escaped():
+    assert dump_yaml({"GREETING": "🚀 ship it"}, allow_unicode=True) == "GREETING: 🚀 ship it\n"
+
+
+@pytest.mark.skipif(yaml_backend() != "libyaml", reason="LibYAML bindings not installed")
+def test_random_documents_match_pure_dumper():
+    pieces = [" ", "a", "\n", "\t", ":", "#", "- ", "'", '"', "\\", "{", "é", "日", "🚀", "\u2028", "\ufeff",
+              "\x07", "\x85", "\r", " \n", "\n ", "true", "x" * 10]
+    rng = random.Random(19)
+    for _ in range(1500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randrange(1, 30))) * rng.choice([1, 4, 40])
+        key = "".join(rng.choice(pieces) for _ in range(rng.randrange(1, 30)))
+        data = {key: text}
+        for depth in range(rng.randrange(6)):
+            data = {f"level{depth}": [data] if depth % 2 else data}
+        for allow_unicode in (False, True):
+            assert dump_yaml(data, allow_unicode) == pure_dump(data, allow_unicode), (key, text)
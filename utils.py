@@ -3,50 +3,59 @@
 Enhanced utility functions for Jenkins to GitHub Actions conversion
 """
 
-import re
-from typing import List, Dict, Any, Optional, Set
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, FrozenSet, Hashable, Pattern, Union, Callable, Tuple
+
+from groovy_lexer import parse_blocks, iter_comments
+from instrumentation import span
+from pattern_scanner import PatternScanner
+from patterns import (
+    NON_NEWLINE, NON_NAME_CHARS, HYPHEN_RUN, TRAILING_BLANKS, INNER_BLANK_RUN, UNSUPPORTED_FEATURE_PATTERNS,
+    COMPLEXITY_PATTERNS, FEASIBILITY_BLOCKERS, FEASIBILITY_WARNINGS, METADATA_PATTERNS,
+    LANGUAGE_PATTERNS, TOOL_PATTERNS, PIPELINE_CREDENTIAL_PATTERNS
+)
 
 
 def strip_comments(text: str) -> str:
-    """Remove /* */ and // comments from text"""
-    # Remove /* */ comments
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    # Remove // comments but preserve URLs
-    lines = text.split('\n')
-    result_lines = []
-    for line in lines:
-        # Don't remove // if it's part of a URL
-        if 'http://' in line or 'https://' in line:
-            result_lines.append(line)
-        else:
-            # Remove // comments
-            comment_pos = line.find('//')
-            if comment_pos != -1:
-                line = line[:comment_pos]
-            result_lines.append(line)
-    return '\n'.join(result_lines)
-
-
-def find_block(text: str, pattern: str) -> tuple[int, int]:
-    """Find { ... } block starting with pattern"""
-    match = re.search(pattern + r'\s*\{', text)
-    if not match:
+    """Blank out /* */ and // comments, leaving string literals untouched.
+
+    Comment characters are replaced by spaces and line breaks are kept, so
+    every offset in the result points at the same place in the source.
+    """
+    parts = []
+    last = 0
+    for start, end in iter_comments(text):
+        parts.append(text[last:start])
+        comment = text[start:end]
+        parts.append(NON_NEWLINE.sub(' ', comment) if '\n' in comment or '\r' in comment else ' ' * (end - start))
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def compact_snippet(text: str) -> str:
+    """Source text as it should appear in generated files.
+
+    strip_comments leaves blanks where comments were; trailing blanks are
+    dropped and runs of blanks between code collapse to one space, so a
+    snippet reads as if its comments had been removed. Apply before
+    truncating, so comments don't count towards the length.
+    """
+    return INNER_BLANK_RUN.sub(' ', TRAILING_BLANKS.sub('', text))
+
+
+def find_block(text: str, pattern: Union[str, Pattern]) -> tuple[int, int]:
+    """Find { ... } block whose header identifier matches pattern.
+
+    The text is tokenized once (strings and comments aware) and the resulting
+    block tree is cached, so repeated lookups on the same text are tree lookups.
+    """
+    node = parse_blocks(text).find(pattern)
+    if node is None:
         return -1, -1
-    
-    start = match.end() - 1  # Position of opening {
-    depth = 0
-    i = start
-    
-    while i < len(text):
-        if text[i] == '{':
-            depth += 1
-        elif text[i] == '}':
-            depth -= 1
-            if depth == 0:
-                return start + 1, i  # Content between { }
-        i += 1
-    
-    return -1, -1
+    return node.start, node.end  # Content between { }
 
 
 def multiline_to_commands(text: str) -> List[str]:
@@ -78,9 +87,9 @@ def multiline_to_commands(text: str) -> List[str]:
 def sanitize_name(name: str) -> str:
     """Sanitize stage name for use as action/job name"""
     # Replace special characters with hyphens
-    sanitized = re.sub(r'[^a-zA-Z0-9\-_]', '-', name)
+    sanitized = NON_NAME_CHARS.sub('-', name)
     # Remove multiple consecutive hyphens
-    sanitized = re.sub(r'-+', '-', sanitized)
+    sanitized = HYPHEN_RUN.sub('-', sanitized)
     # Remove leading/trailing hyphens
     sanitized = sanitized.strip('-')
     return sanitized.lower()
@@ -91,41 +100,40 @@ def gha_job_id(stage_name: str) -> str:
     return sanitize_name(stage_name)
 
 
+# Every language, tool, unsupported feature and feasibility pattern, keyed by
+# (table, entry); the tables in patterns.py remain the source of truth.
+FEATURE_SCANNER = PatternScanner({
+    **{("language", lang, i): pattern
+       for lang, lang_patterns in LANGUAGE_PATTERNS.items() for i, pattern in enumerate(lang_patterns)},
+    **{("tool", tool): pattern for tool, pattern in TOOL_PATTERNS.items()},
+    **{("unsupported", feature): pattern for feature, pattern in UNSUPPORTED_FEATURE_PATTERNS.items()},
+    **{("blocker", i): pattern for i, (pattern, _) in enumerate(FEASIBILITY_BLOCKERS)},
+    **{("warning", i): pattern for i, (pattern, _) in enumerate(FEASIBILITY_WARNINGS)},
+})
+
+
+@lru_cache(maxsize=64)
+def scan_pipeline_features(pipeline_text: str) -> FrozenSet[Hashable]:
+    """Keys of all FEATURE_SCANNER patterns matching the text, from one keyword pass"""
+    return FEATURE_SCANNER.matches(pipeline_text)
+
+
 def extract_unsupported_features(pipeline_text: str) -> List[Dict[str, str]]:
     """Detect unsupported Jenkins features that need manual conversion"""
     unsupported = []
+    hits = scan_pipeline_features(pipeline_text)
     
     # Complex pipeline features
-    patterns = {
-        'Build triggers': r'triggers\s*\{[^}]+\}',
-        'Options block': r'options\s*\{[^}]+\}',
-        'Libraries': r'@Library\s*\([^)]+\)',
-        'Shared libraries': r'library\s+[\'"][^\'"]+[\'"]',
-        'Matrix builds': r'matrix\s*\{[^}]+\}',
-        'When expressions (complex)': r'when\s*\{\s*expression\s*\{[^}]+\}\s*\}',
-        'Pipeline functions': r'pipeline\s*\.\s*\w+\s*\(',
-        'Build parameters in steps': r'build\s+job\s*:',
-        'Parallel nested stages': r'parallel\s*\{[^}]*stage[^}]*stage[^}]*\}',
-        'Custom functions': r'def\s+\w+\s*\([^)]*\)\s*\{',
-        'Script blocks (complex)': r'script\s*\{[^}]{100,}\}',  # Large script blocks
-        'Node allocation': r'node\s*\([^)]+\)\s*\{',
-        'Milestone steps': r'milestone\s*\([^)]+\)',
-        'Lock resources': r'lock\s*\([^)]+\)',
-        'Timeout (complex)': r'timeout\s*\([^)]+\)\s*\{[^}]+\}',
-        'Retry blocks': r'retry\s*\([^)]+\)\s*\{',
-        'Archive on failure only': r'archiveArtifacts.*onlyIfSuccessful\s*:\s*false',
-        'Custom workspace': r'ws\s*\([^)]+\)',
-        'Jenkins CLI calls': r'jenkins\s+[\'"][^\'"]+[\'"]',
-        'Plugin-specific steps': r'(publishHTML|publishTestResults|step\s*\[\s*\$class)',
-    }
-    
-    for feature_name, pattern in patterns.items():
-        matches = re.findall(pattern, pipeline_text, re.DOTALL | re.IGNORECASE)
+    for feature_name, pattern in UNSUPPORTED_FEATURE_PATTERNS.items():
+        if ("unsupported", feature_name) not in hits:
+            continue
+        matches = pattern.findall(pipeline_text)
         if matches:
             for match in matches:
+                snippet = compact_snippet(match)
                 unsupported.append({
                     'feature': feature_name,
-                    'code_snippet': match[:200] + '...' if len(match) > 200 else match,
+                    'code_snippet': snippet[:200] + '...' if len(snippet) > 200 else snippet,
                     'manual_action': get_manual_action_for_feature(feature_name)
                 })
     
@@ -162,14 +170,15 @@ def get_manual_action_for_feature(feature_name: str) -> str:
 
 def analyze_pipeline_complexity(pipeline_text: str) -> Dict[str, Any]:
     """Analyze pipeline complexity and provide conversion recommendations"""
+    patterns = COMPLEXITY_PATTERNS
     analysis = {
-        'total_stages': len(re.findall(r'stage\s*\([^)]+\)', pipeline_text)),
-        'has_parallel': bool(re.search(r'parallel\s*\{', pipeline_text)),
-        'has_matrix': bool(re.search(r'matrix\s*\{', pipeline_text)),
-        'has_conditional_stages': len(re.findall(r'when\s*\{', pipeline_text)),
-        'has_post_actions': bool(re.search(r'post\s*\{', pipeline_text)),
-        'script_blocks': len(re.findall(r'script\s*\{', pipeline_text)),
-        'credential_usage': len(re.findall(r'credentials?\s*\(', pipeline_text)),
+        'total_stages': len(patterns['total_stages'].findall(pipeline_text)),
+        'has_parallel': bool(patterns['has_parallel'].search(pipeline_text)),
+        'has_matrix': bool(patterns['has_matrix'].search(pipeline_text)),
+        'has_conditional_stages': len(patterns['has_conditional_stages'].findall(pipeline_text)),
+        'has_post_actions': bool(patterns['has_post_actions'].search(pipeline_text)),
+        'script_blocks': len(patterns['script_blocks'].findall(pipeline_text)),
+        'credential_usage': len(patterns['credential_usage'].findall(pipeline_text)),
         'complexity_score': 0
     }
     
@@ -203,30 +212,17 @@ def validate_conversion_feasibility(pipeline_text: str) -> Dict[str, Any]:
         'manual_steps_required': []
     }
     
-    # Check for absolute blockers
-    blockers = [
-        (r'@NonCPS', 'Non-CPS functions require complete rewrite'),
-        (r'@Library.*vars/', 'Global variable libraries need manual conversion'),
-        (r'properties\s*\([^)]*pipeline', 'Pipeline properties need workflow-level configuration'),
-        (r'currentBuild\.\w+\s*=', 'Build property modifications not directly supported'),
-    ]
+    hits = scan_pipeline_features(pipeline_text)
     
-    for pattern, message in blockers:
-        if re.search(pattern, pipeline_text, re.IGNORECASE):
+    # Check for absolute blockers
+    for i, (_, message) in enumerate(FEASIBILITY_BLOCKERS):
+        if ("blocker", i) in hits:
             feasibility['blockers'].append(message)
             feasibility['can_convert'] = False
     
     # Check for warning conditions
-    warnings = [
-        (r'build\s+job\s*:', 'Triggering other Jenkins jobs requires workflow redesign'),
-        (r'milestone\s*\(', 'Milestone steps need GitHub deployment protection rules'),
-        (r'input\s*\([^)]*parameters', 'Complex input parameters may need simplification'),
-        (r'timeout\s*\([^)]*HOURS', 'Long timeouts may exceed GitHub Actions limits'),
-        (r'publishHTML', 'HTML publishing requires GitHub Pages or artifact handling'),
-    ]
-    
-    for pattern, message in warnings:
-        if re.search(pattern, pipeline_text, re.IGNORECASE):
+    for i, (_, message) in enumerate(FEASIBILITY_WARNINGS):
+        if ("warning", i) in hits:
             feasibility['warnings'].append(message)
     
     # Adjust confidence based on findings
@@ -240,20 +236,22 @@ def validate_conversion_feasibility(pipeline_text: str) -> Dict[str, Any]:
     return feasibility
 
 
-def extract_pipeline_metadata(pipeline_text: str) -> Dict[str, Any]:
+def extract_pipeline_metadata(pipeline_text: str, languages: Optional[List[str]] = None,
+                              tools: Optional[List[str]] = None) -> Dict[str, Any]:
     """Extract metadata about the pipeline for reporting"""
+    patterns = METADATA_PATTERNS
     metadata = {
         'pipeline_type': 'Declarative',
-        'has_parameters': bool(re.search(r'parameters\s*\{', pipeline_text)),
-        'has_global_env': bool(re.search(r'environment\s*\{', pipeline_text)),
-        'has_global_agent': bool(re.search(r'agent\s+', pipeline_text)),
-        'has_tools': bool(re.search(r'tools\s*\{', pipeline_text)),
-        'has_options': bool(re.search(r'options\s*\{', pipeline_text)),
-        'has_triggers': bool(re.search(r'triggers\s*\{', pipeline_text)),
-        'has_libraries': bool(re.search(r'@Library', pipeline_text)),
-        'total_post_blocks': len(re.findall(r'post\s*\{', pipeline_text)),
-        'languages_detected': detect_languages(pipeline_text),
-        'tools_detected': detect_tools(pipeline_text)
+        'has_parameters': bool(patterns['has_parameters'].search(pipeline_text)),
+        'has_global_env': bool(patterns['has_global_env'].search(pipeline_text)),
+        'has_global_agent': bool(patterns['has_global_agent'].search(pipeline_text)),
+        'has_tools': bool(patterns['has_tools'].search(pipeline_text)),
+        'has_options': bool(patterns['has_options'].search(pipeline_text)),
+        'has_triggers': bool(patterns['has_triggers'].search(pipeline_text)),
+        'has_libraries': bool(patterns['has_libraries'].search(pipeline_text)),
+        'total_post_blocks': len(patterns['total_post_blocks'].findall(pipeline_text)),
+        'languages_detected': languages if languages is not None else detect_languages(pipeline_text),
+        'tools_detected': tools if tools is not None else detect_tools(pipeline_text)
     }
     
     return metadata
@@ -262,21 +260,10 @@ def extract_pipeline_metadata(pipeline_text: str) -> Dict[str, Any]:
 def detect_languages(pipeline_text: str) -> List[str]:
     """Detect programming languages/technologies used in pipeline"""
     languages = set()
+    hits = scan_pipeline_features(pipeline_text)
     
-    patterns = {
-        'Java': [r'mvn\s+', r'\.jar\b', r'pom\.xml', r'jdk\s+'],
-        'Python': [r'pip\s+', r'python\s+', r'\.py\b', r'requirements\.txt'],
-        'Node.js': [r'npm\s+', r'yarn\s+', r'package\.json', r'node\s+'],
-        'Go': [r'go\s+build', r'go\s+test', r'go\.mod'],
-        'Docker': [r'docker\s+', r'Dockerfile', r'docker-compose'],
-        'Kubernetes': [r'kubectl\s+', r'helm\s+', r'kubeconfig'],
-        'Terraform': [r'terraform\s+', r'\.tf\b'],
-        'Ansible': [r'ansible\s+', r'playbook'],
-        'Shell': [r'sh\s+[\'"]', r'bash\s+', r'#!/bin/'],
-    }
-    
-    for lang, lang_patterns in patterns.items():
-        if any(re.search(pattern, pipeline_text, re.IGNORECASE) for pattern in lang_patterns):
+    for lang, lang_patterns in LANGUAGE_PATTERNS.items():
+        if any(("language", lang, i) in hits for i in range(len(lang_patterns))):
             languages.add(lang)
     
     return sorted(list(languages))
@@ -285,31 +272,10 @@ def detect_languages(pipeline_text: str) -> List[str]:
 def detect_tools(pipeline_text: str) -> List[str]:
     """Detect tools and technologies used in pipeline"""
     tools = set()
+    hits = scan_pipeline_features(pipeline_text)
     
-    # Tool patterns
-    tool_patterns = {
-        'SonarQube': r'sonar:|withSonarQubeEnv',
-        'Docker': r'docker\s+',
-        'Kubernetes': r'kubectl|helm\s+',
-        'Maven': r'mvn\s+',
-        'Gradle': r'gradle\s+|gradlew',
-        'npm': r'npm\s+',
-        'yarn': r'yarn\s+',
-        'pip': r'pip\s+',
-        'Git': r'git\s+',
-        'SSH': r'ssh\s+|sshagent',
-        'AWS CLI': r'aws\s+',
-        'Azure CLI': r'az\s+',
-        'Google Cloud': r'gcloud\s+',
-        'Terraform': r'terraform\s+',
-        'Ansible': r'ansible',
-        'Cosign': r'cosign\s+',
-        'Trivy': r'trivy\s+',
-        'OWASP': r'dependency-check',
-    }
-    
-    for tool, pattern in tool_patterns.items():
-        if re.search(pattern, pipeline_text, re.IGNORECASE):
+    for tool in TOOL_PATTERNS:
+        if ("tool", tool) in hits:
             tools.add(tool)
     
     return sorted(list(tools))
@@ -320,18 +286,8 @@ def extract_all_credentials(pipeline_text: str) -> Set[str]:
     credentials = set()
     
     # Various credential patterns
-    patterns = [
-        r'credentials\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-        r'credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'usernamePassword\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'string\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'file\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'sshUserPrivateKey\s*\([^)]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-        r'withCredentials\s*\[[^\]]*credentialsId\s*:\s*[\'"]([^\'"]+)[\'"]',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, pipeline_text, re.IGNORECASE)
+    for pattern in PIPELINE_CREDENTIAL_PATTERNS:
+        matches = pattern.findall(pipeline_text)
         credentials.update(matches)
     
     return credentials
@@ -368,14 +324,87 @@ def get_manual_action_for_feature(feature_name: str) -> str:
     return manual_actions.get(feature_name, 'Review Jenkins documentation and implement equivalent logic')
 
 
-def create_conversion_metadata(pipeline_text: str, action_paths: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Create comprehensive metadata about the conversion"""
+class LazyAnalysis:
+    """Analysis results computed on first attribute access and memoized.
+
+    Subclasses map attribute names to analyzer functions in ANALYZERS, list
+    attributes built from other attributes in DERIVED and compute either
+    kind in _compute. Results live in self._results, which may be seeded
+    with values computed elsewhere. When STATS is set, each lookup is
+    counted in it as computed or reused.
+    """
+
+    ANALYZERS: Dict[str, Callable[[Any], Any]] = {}
+    DERIVED: Tuple[str, ...] = ()
+    STATS: Optional[Dict[str, int]] = None
+
+    __slots__ = ("_results",)
+
+    def _compute(self, name: str) -> Any:
+        raise NotImplementedError
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in self.ANALYZERS and name not in self.DERIVED:
+            raise AttributeError(name)
+        results = self._results
+        if name in results:
+            value = results[name]
+            outcome = "reused"
+        else:
+            value = results[name] = self._compute(name)
+            outcome = "computed"
+        if self.STATS is not None:
+            self.STATS[outcome] += 1
+        return value
+
+
+class PipelineAnalysis(LazyAnalysis):
+    """Lazily computed whole-pipeline analyses for one Jenkinsfile.
+
+    Created once per file and shared by the converter, the HTML report and the
+    markdown report, so each analyzer runs at most once per file.
+    create_conversion_metadata serializes it.
+    """
+
+    ANALYZERS = {
+        "complexity": analyze_pipeline_complexity,
+        "feasibility": validate_conversion_feasibility,
+        "unsupported_features": extract_unsupported_features,
+        "languages": detect_languages,
+        "tools": detect_tools,
+        "credentials": extract_all_credentials,
+    }
+    # Derived results that are themselves computed from other analyses
+    DERIVED = ("metadata",)
+
+    __slots__ = ("text",)
+
+    def __init__(self, pipeline_text: str, **precomputed):
+        self.text = pipeline_text
+        self._results: Dict[str, Any] = {k: v for k, v in precomputed.items() if v is not None}
+
+    @classmethod
+    def for_pipeline(cls, pipeline) -> "PipelineAnalysis":
+        """Build an analysis seeded with the credentials already held by the pipeline IR"""
+        return cls(pipeline.text, credentials=pipeline.credential_ids())
+
+    def _compute(self, name: str) -> Any:
+        with span(f"analysis.{name}"):
+            if name == "metadata":
+                return extract_pipeline_metadata(self.text, self.languages, self.tools)
+            return self.ANALYZERS[name](self.text)
+
+
+def create_conversion_metadata(analysis: Union[str, PipelineAnalysis], action_paths: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create comprehensive metadata about the conversion (serializes a PipelineAnalysis)"""
+    if not isinstance(analysis, PipelineAnalysis):
+        analysis = PipelineAnalysis(analysis)
     return {
-        'source_analysis': extract_pipeline_metadata(pipeline_text),
-        'complexity_analysis': analyze_pipeline_complexity(pipeline_text),
-        'feasibility_analysis': validate_conversion_feasibility(pipeline_text),
-        'unsupported_features': extract_unsupported_features(pipeline_text),
-        'all_credentials': list(extract_all_credentials(pipeline_text)),
+        'source_analysis': analysis.metadata,
+        'complexity_analysis': analysis.complexity,
+        'feasibility_analysis': analysis.feasibility,
+        'unsupported_features': analysis.unsupported_features,
+        'all_credentials': list(analysis.credentials),
         'generated_actions': len(action_paths),
         'total_jobs': len([a for a in action_paths if not a.get('is_parallel_child', False)])
     }
\ No newline at end of file